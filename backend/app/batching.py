@@ -0,0 +1,132 @@
+"""
+Micro-Batching
+Groups concurrent requests into batches for a single vectorized call.
+"""
+import asyncio
+import functools
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Set, Tuple
+
+
+class MicroBatcher:
+    """
+    Collects items submitted concurrently on the event loop and runs them
+    through ``batch_fn`` together.
+
+    A batch is dispatched when it reaches ``max_batch_size`` items or when
+    ``max_wait_ms`` has passed since its first item arrived, whichever
+    comes first. Each caller awaits only its own result; if the batch call
+    fails, every caller in that batch receives the exception. ``stats``
+    reports latency and throughput per batch size.
+    """
+
+    def __init__(
+        self,
+        batch_fn: Callable[[List[Any]], Awaitable[List[Any]]],
+        max_batch_size: int = 32,
+        max_wait_ms: float = 5.0
+    ):
+        """
+        Initialize the batcher.
+
+        Args:
+            batch_fn: Async function mapping a list of items to a list of
+                results in the same order
+            max_batch_size: Largest batch to dispatch
+            max_wait_ms: Longest time the first item of a batch waits
+        """
+        self.batch_fn = batch_fn
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000.0
+
+        self._pending: List[Tuple[Any, asyncio.Future]] = []
+        self._timer: Optional[asyncio.TimerHandle] = None
+        # The event loop only keeps weak references to tasks
+        self._tasks: Set[asyncio.Task] = set()
+        # batch size -> [batches, items, total seconds]
+        self._by_size: Dict[int, List[float]] = {}
+
+    async def submit(self, item: Any) -> Any:
+        """
+        Queue one item and wait for its result.
+
+        Args:
+            item: Input for ``batch_fn``
+
+        Returns:
+            The result for this item
+        """
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((item, future))
+
+        if len(self._pending) >= self.max_batch_size:
+            self._flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.max_wait, self._flush)
+        return await future
+
+    def _flush(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        batch, self._pending = self._pending, []
+        if batch:
+            task = asyncio.ensure_future(self._run(batch))
+            self._tasks.add(task)
+            task.add_done_callback(functools.partial(self._finished, batch))
+
+    def _finished(self, batch: List[Tuple[Any, asyncio.Future]], task: asyncio.Task):
+        self._tasks.discard(task)
+        if task.cancelled():
+            for _, future in batch:
+                future.cancel()
+            return
+        error = task.exception()
+        if error is not None:
+            # _run already hands batch_fn errors to the callers; anything
+            # reaching here is a bug in the batcher itself
+            print(f"Micro-batch of {len(batch)} items failed: {error!r}")
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(error)
+
+    async def _run(self, batch: List[Tuple[Any, asyncio.Future]]):
+        start = time.perf_counter()
+        try:
+            results = await self.batch_fn([item for item, _ in batch])
+            if len(results) != len(batch):
+                raise ValueError(f"batch_fn returned {len(results)} results for {len(batch)} items")
+        except Exception as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        finally:
+            stats = self._by_size.setdefault(len(batch), [0, 0, 0.0])
+            stats[0] += 1
+            stats[1] += len(batch)
+            stats[2] += time.perf_counter() - start
+
+        for (_, future), result in zip(batch, results):
+            if not future.done():
+                future.set_result(result)
+
+    def stats(self) -> Dict[str, Any]:
+        """Batch counts, mean latency and throughput per batch size."""
+        by_size = {
+            size: {
+                "batches": int(batches),
+                "mean_ms": 1000 * seconds / batches,
+                "items_per_sec": items / seconds if seconds > 0 else 0.0,
+            }
+            for size, (batches, items, seconds) in sorted(self._by_size.items())
+        }
+        batches = sum(s["batches"] for s in by_size.values())
+        items = sum(int(v[1]) for v in self._by_size.values())
+        return {
+            "batches": batches,
+            "items": items,
+            "mean_batch_size": items / batches if batches else 0.0,
+            "by_size": by_size,
+        }
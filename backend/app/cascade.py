@@ -0,0 +1,101 @@
+"""
+Extraction Cascade
+Classifies a short excerpt first and only extracts the full clip when that
+prediction is not confident enough.
+"""
+import threading
+from typing import Any, Dict, Tuple
+
+import numpy as np
+
+from app.features.extractor import AudioFeatureExtractor, AudioSource
+from app.models.classifier import GenreClassifier
+
+
+class ExtractionCascade:
+    """
+    Early-exit pairing of a short-excerpt extractor with the full one.
+
+    The excerpt skips most of the decode and the beat tracker's work, so
+    confident excerpts cost a fraction of a full extraction. ``accept``
+    decides on one early prediction and keeps the exit counters; the API
+    calls it between its own executor stages, and ``predict`` runs the
+    whole cascade synchronously (scripts, offline evaluation).
+    """
+
+    def __init__(
+        self,
+        early_extractor: AudioFeatureExtractor,
+        full_extractor: AudioFeatureExtractor,
+        classifier: GenreClassifier,
+        threshold: float = 0.8
+    ):
+        """
+        Initialize the cascade.
+
+        Args:
+            early_extractor: Extractor with a short ``duration``
+            full_extractor: Extractor for the full excerpt
+            classifier: Classifier used for both stages
+            threshold: Minimum early confidence to skip the full extraction
+        """
+        self.early_extractor = early_extractor
+        self.full_extractor = full_extractor
+        self.classifier = classifier
+        self.threshold = threshold
+        self._counters = {"requests": 0, "early_exits": 0, "early_failures": 0}
+        self._lock = threading.Lock()
+
+    def accept(self, prediction: Dict[str, Any]) -> bool:
+        """
+        Whether an early prediction is confident enough to return as is.
+
+        Pass None when the early extraction failed; the full extraction
+        then runs as usual.
+        """
+        exit_early = prediction is not None and prediction["confidence"] >= self.threshold
+        with self._lock:
+            self._counters["requests"] += 1
+            if prediction is None:
+                self._counters["early_failures"] += 1
+            elif exit_early:
+                self._counters["early_exits"] += 1
+        return exit_early
+
+    def predict(self, audio: AudioSource) -> Tuple[np.ndarray, Dict[str, Any], bool]:
+        """
+        Run the cascade on one clip.
+
+        Args:
+            audio: Path to the audio file, its raw bytes, or a binary file object
+
+        Returns:
+            Tuple of (features used, prediction, whether it exited early)
+        """
+        if hasattr(audio, "read"):
+            # Both stages may need to read the source
+            audio = audio.read()
+        try:
+            features = self.early_extractor.extract(audio, strict=True)
+            prediction = self.classifier.predict(features)
+        except Exception:
+            prediction = None
+        if self.accept(prediction):
+            return features, prediction, True
+
+        features = self.full_extractor.extract(audio)
+        return features, self.classifier.predict(features), False
+
+    def stats(self) -> Dict[str, Any]:
+        """Early-exit counters and rate."""
+        with self._lock:
+            counters = dict(self._counters)
+        return {
+            "threshold": self.threshold,
+            "early_seconds": self.early_extractor.duration,
+            **counters,
+            "full_extractions": counters["requests"] - counters["early_exits"],
+            "early_exit_rate": (
+                counters["early_exits"] / counters["requests"] if counters["requests"] else 0.0
+            ),
+        }
@@ -0,0 +1,208 @@
+"""
+Inference Executor
+Runs CPU-bound inference stages off the asyncio event loop.
+"""
+import asyncio
+import multiprocessing
+import threading
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional
+
+# Process workers are never forked from the (multithreaded) server process:
+# a fork while another thread holds a model, import or numba lock leaves
+# that lock held forever in the child
+PROCESS_START_METHOD = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+
+
+class ExecutorBusyError(Exception):
+    """Raised when the executor queue is full and a call is rejected."""
+
+
+class StageTimeoutError(Exception):
+    """Raised when a stage does not finish within its timeout."""
+
+    def __init__(self, stage: str, timeout: float):
+        super().__init__(f"Stage '{stage}' timed out after {timeout:.1f}s")
+        self.stage = stage
+        self.timeout = timeout
+
+
+class InferenceExecutor:
+    """
+    Bounded thread or process pool for blocking inference work.
+
+    At most ``max_workers`` calls run at once and up to ``max_queue`` more
+    wait for a worker; anything beyond that is rejected immediately with
+    ``ExecutorBusyError`` so the server can shed load instead of letting
+    latency grow without bound. A call keeps its slot until the underlying
+    work actually finishes, even if the awaiting request already timed out,
+    because pool work cannot be interrupted. Callers that would rather wait
+    than be rejected (bulk jobs) pass ``wait=True`` and are woken when a
+    running call finishes.
+
+    With ``kind="process"`` the callables and arguments must be picklable
+    (module-level functions); each worker process holds its own copy of any
+    global models. Workers start from a fresh interpreter (forkserver, or
+    spawn where that is unavailable) and import their modules themselves,
+    so nothing is inherited from threads running in the server.
+    """
+
+    KINDS = ("thread", "process")
+
+    def __init__(
+        self,
+        kind: str = "thread",
+        max_workers: int = 4,
+        max_queue: int = 16,
+        timeouts: Optional[Dict[str, float]] = None,
+        initializer: Optional[Callable[[], Any]] = None
+    ):
+        """
+        Initialize the executor.
+
+        Args:
+            kind: "thread" or "process"
+            max_workers: Number of pool workers
+            max_queue: Calls allowed to wait for a worker before rejecting
+            timeouts: Per-stage timeout in seconds (stages not listed have none)
+            initializer: Called once in each worker process when it starts
+                (process pools only), e.g. to warm up models
+        """
+        if kind not in self.KINDS:
+            raise ValueError(f"Unknown executor kind '{kind}', expected one of {self.KINDS}")
+
+        self.kind = kind
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self.timeouts = dict(timeouts or {})
+        self.initializer = initializer
+
+        self._pool: Optional[Executor] = None
+        self._pending = 0
+        self._rejected = 0
+        self._timed_out = 0
+        self._waiters: List[asyncio.Future] = []
+        self._lock = threading.Lock()
+        # Guards swapping the pool (recycle) against concurrent submits
+        self._pool_lock = threading.Lock()
+
+    @property
+    def capacity(self) -> int:
+        """Maximum number of running plus queued calls."""
+        return self.max_workers + self.max_queue
+
+    def _get_pool(self) -> Executor:
+        if self._pool is None:
+            if self.kind == "process":
+                self._pool = ProcessPoolExecutor(
+                    max_workers=self.max_workers,
+                    mp_context=multiprocessing.get_context(PROCESS_START_METHOD),
+                    initializer=self.initializer
+                )
+            else:
+                self._pool = ThreadPoolExecutor(
+                    max_workers=self.max_workers, thread_name_prefix="inference"
+                )
+        return self._pool
+
+    def _release(self, _future):
+        # Runs on a pool thread; waiters are woken on their own event loops
+        with self._lock:
+            self._pending -= 1
+            waiters, self._waiters = self._waiters, []
+        for waiter in waiters:
+            try:
+                waiter.get_loop().call_soon_threadsafe(_wake, waiter)
+            except RuntimeError:
+                # The waiter's loop has closed; nobody is waiting any more
+                pass
+
+    async def _acquire(self, wait: bool):
+        while True:
+            with self._lock:
+                if self._pending < self.capacity:
+                    self._pending += 1
+                    return
+                if not wait:
+                    self._rejected += 1
+                    raise ExecutorBusyError(
+                        f"Inference queue is full ({self.capacity} calls in flight)"
+                    )
+                waiter = asyncio.get_running_loop().create_future()
+                self._waiters.append(waiter)
+            # Every waiter is woken on release and they race for the slot
+            await waiter
+
+    async def run(self, stage: str, fn: Callable[..., Any], *args: Any, wait: bool = False) -> Any:
+        """
+        Run ``fn(*args)`` in the pool and await its result.
+
+        Args:
+            stage: Stage name, used to look up the timeout
+            fn: Blocking callable
+            *args: Positional arguments for ``fn``
+            wait: Wait for a free slot instead of rejecting when at capacity
+
+        Returns:
+            The return value of ``fn``
+
+        Raises:
+            ExecutorBusyError: If running and queued calls are at capacity
+                (and ``wait`` is False)
+            StageTimeoutError: If the stage exceeds its timeout
+        """
+        await self._acquire(wait)
+
+        try:
+            with self._pool_lock:
+                future = self._get_pool().submit(fn, *args)
+        except Exception:
+            self._release(None)
+            raise
+        future.add_done_callback(self._release)
+
+        timeout = self.timeouts.get(stage)
+        try:
+            return await asyncio.wait_for(asyncio.wrap_future(future), timeout)
+        except asyncio.TimeoutError:
+            with self._lock:
+                self._timed_out += 1
+            raise StageTimeoutError(stage, timeout)
+
+    def stats(self) -> Dict[str, Any]:
+        """Current queue depth and rejection/timeout counters."""
+        with self._lock:
+            pending = self._pending
+            return {
+                "kind": self.kind,
+                "max_workers": self.max_workers,
+                "capacity": self.capacity,
+                "in_flight": pending,
+                "queued": max(0, pending - self.max_workers),
+                "rejected": self._rejected,
+                "timed_out": self._timed_out,
+            }
+
+    def recycle(self):
+        """
+        Replace the pool with fresh workers, e.g. after the model changed.
+
+        Later calls go to new workers (which run ``initializer`` again);
+        calls already submitted finish on the old pool.
+        """
+        with self._pool_lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=False)
+
+    def shutdown(self, wait: bool = True):
+        """Stop the pool; it is recreated lazily on the next call."""
+        with self._pool_lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=wait)
+
+
+def _wake(waiter: asyncio.Future):
+    if not waiter.done():
+        waiter.set_result(None)
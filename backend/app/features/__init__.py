@@ -1,4 +1,5 @@
 # Audio Feature Extraction Package
+from .cache import FeatureCache
 from .extractor import AudioFeatureExtractor
 
-__all__ = ['AudioFeatureExtractor']
+__all__ = ['AudioFeatureExtractor', 'FeatureCache']
@@ -0,0 +1,199 @@
+"""
+Feature Cache Module
+Content-addressed cache for extracted feature vectors.
+"""
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+import numpy as np
+
+
+class FeatureCache:
+    """
+    Two-tier cache of feature vectors keyed by audio content.
+
+    Keys combine a SHA-256 digest of the raw audio bytes with the extractor
+    parameters, so the same upload maps to the same entry regardless of
+    filename while a change of sample rate, duration or feature version
+    never returns stale vectors.
+
+    Tiers:
+    - In-process LRU of up to ``max_entries`` vectors
+    - Optional on-disk directory of ``.npy`` files, evicted oldest-first
+      once the directory exceeds ``disk_max_bytes``
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 1024,
+        disk_dir: Optional[str] = None,
+        disk_max_bytes: int = 256 * 1024 * 1024
+    ):
+        """
+        Initialize the cache.
+
+        Args:
+            max_entries: Capacity of the in-memory LRU tier
+            disk_dir: Directory for the on-disk tier (disabled when None)
+            disk_max_bytes: Size budget of the on-disk tier
+        """
+        self.max_entries = max_entries
+        self.disk_dir = disk_dir
+        self.disk_max_bytes = disk_max_bytes
+
+        self._memory: "OrderedDict[str, np.ndarray]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._counters = {"memory_hits": 0, "disk_hits": 0, "misses": 0}
+        self._disk_bytes = 0
+
+        if disk_dir:
+            os.makedirs(disk_dir, exist_ok=True)
+            self._disk_bytes = sum(
+                entry.stat().st_size for entry in os.scandir(disk_dir)
+                if entry.name.endswith(".npy")
+            )
+
+    @staticmethod
+    def make_key(content: bytes, **params: Any) -> str:
+        """
+        Build a cache key from audio bytes and extractor parameters.
+
+        Args:
+            content: Raw audio file bytes
+            **params: Extractor parameters that affect the output
+
+        Returns:
+            Hex digest identifying (content, params)
+        """
+        digest = hashlib.sha256(content)
+        for name in sorted(params):
+            digest.update(f"|{name}={params[name]!r}".encode())
+        return digest.hexdigest()
+
+    def get(self, key: str) -> Optional[np.ndarray]:
+        """
+        Look up a feature vector.
+
+        Args:
+            key: Key from ``make_key``
+
+        Returns:
+            A copy of the cached vector, or None on a miss
+        """
+        with self._lock:
+            features = self._memory.get(key)
+            if features is not None:
+                self._memory.move_to_end(key)
+                self._counters["memory_hits"] += 1
+                return features.copy()
+
+        features = self._disk_get(key)
+        with self._lock:
+            if features is None:
+                self._counters["misses"] += 1
+                return None
+            self._counters["disk_hits"] += 1
+            self._memory_put(key, features)
+        return features.copy()
+
+    def put(self, key: str, features: np.ndarray):
+        """
+        Store a feature vector in every enabled tier.
+
+        Args:
+            key: Key from ``make_key``
+            features: Feature vector to cache
+        """
+        features = np.array(features, copy=True)
+        features.setflags(write=False)
+        with self._lock:
+            self._memory_put(key, features)
+        self._disk_put(key, features)
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss counters and current tier sizes."""
+        with self._lock:
+            counters = dict(self._counters)
+            entries = len(self._memory)
+        lookups = sum(counters.values())
+        hits = counters["memory_hits"] + counters["disk_hits"]
+        return {
+            **counters,
+            "hits": hits,
+            "hit_rate": hits / lookups if lookups else 0.0,
+            "memory_entries": entries,
+            "disk_bytes": self._disk_bytes,
+        }
+
+    def clear(self):
+        """Drop the in-memory tier and reset counters (disk is kept)."""
+        with self._lock:
+            self._memory.clear()
+            for name in self._counters:
+                self._counters[name] = 0
+
+    def _memory_put(self, key: str, features: np.ndarray):
+        """Insert into the LRU tier; caller holds the lock."""
+        self._memory[key] = features
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+    def _disk_path(self, key: str) -> str:
+        return os.path.join(self.disk_dir, f"{key}.npy")
+
+    def _disk_get(self, key: str) -> Optional[np.ndarray]:
+        if not self.disk_dir:
+            return None
+        path = self._disk_path(key)
+        try:
+            features = np.load(path, allow_pickle=False)
+            # Refresh mtime so eviction approximates LRU
+            os.utime(path)
+        except (OSError, ValueError):
+            return None
+        features.setflags(write=False)
+        return features
+
+    def _disk_put(self, key: str, features: np.ndarray):
+        if not self.disk_dir:
+            return
+        path = self._disk_path(key)
+        if os.path.exists(path):
+            return
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            with open(tmp_path, "wb") as f:
+                np.save(f, features, allow_pickle=False)
+            os.replace(tmp_path, path)
+            with self._lock:
+                self._disk_bytes += os.path.getsize(path)
+        except OSError as e:
+            print(f"Could not write feature cache entry: {e}")
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+            return
+        if self._disk_bytes > self.disk_max_bytes:
+            self._evict_disk()
+
+    def _evict_disk(self):
+        """Remove least recently used files until under the size budget."""
+        entries = sorted(
+            (entry for entry in os.scandir(self.disk_dir) if entry.name.endswith(".npy")),
+            key=lambda entry: entry.stat().st_mtime
+        )
+        total = sum(entry.stat().st_size for entry in entries)
+        for entry in entries:
+            if total <= self.disk_max_bytes:
+                break
+            try:
+                size = entry.stat().st_size
+                os.unlink(entry.path)
+                total -= size
+            except OSError:
+                continue
+        with self._lock:
+            self._disk_bytes = total
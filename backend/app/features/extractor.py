@@ -2,12 +2,236 @@
 Audio Feature Extraction Module
 Extracts acoustic features from audio files using librosa.
 """
+import io
+import multiprocessing
+import os
+import tempfile
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from contextlib import contextmanager
+from typing import Any, BinaryIO, Dict, Iterable, Iterator, Optional, Tuple, Union
+
 import numpy as np
 
+from ..executor import PROCESS_START_METHOD
+from .cache import FeatureCache
+
+# librosa and its DSP dependencies are imported on first use (see load_librosa)
+librosa = None
+_librosa_missing = False
+
 try:
-    import librosa
+    import soundfile as sf
 except ImportError:
-    librosa = None
+    sf = None
+
+def load_librosa():
+    """
+    Import librosa on first use.
+    
+    Importing librosa (and the scipy/numba modules it pulls in) costs
+    seconds, so it is deferred until audio is actually decoded or analysed
+    instead of happening when this module is imported.
+    
+    Returns:
+        The librosa module, or None if it is not installed
+    """
+    global librosa, _librosa_missing
+    if librosa is None and not _librosa_missing:
+        try:
+            import librosa as module
+            librosa = module
+        except ImportError:
+            _librosa_missing = True
+    return librosa
+
+
+# Anything the extractor can decode: a path, raw file bytes or a binary file object
+AudioSource = Union[str, os.PathLike, bytes, bytearray, memoryview, BinaryIO]
+
+# Bump whenever the feature definitions change so cached vectors are invalidated
+FEATURE_VERSION = 1
+
+# STFT parameters shared by every spectral feature (librosa defaults)
+N_FFT = 2048
+HOP_LENGTH = 512
+
+N_MFCC = 20
+
+# Rows of the frame-level feature matrix: MFCCs, chroma, centroid,
+# bandwidth, rolloff, zero crossing rate, RMS
+N_FRAME_FEATURES = N_MFCC + 12 + 5
+
+# Tempo estimators (``tempo_method``):
+#   tempogram  - librosa's tempo estimate (mean onset autocorrelation tempogram
+#                under a log-normal prior), computed with contiguous fast-size
+#                FFTs; the value beat_track reports, without tracking beats
+#   beat_track - librosa.beat.beat_track, the reference
+#   autocorr   - one autocorrelation of the whole onset envelope under the same
+#                prior; far cheaper but approximate
+TEMPO_METHODS = ("tempogram", "beat_track", "autocorr")
+# Methods whose tempo differs from beat_track's and so needs its own cache entries
+APPROXIMATE_TEMPO_METHODS = ("autocorr",)
+
+# librosa.feature.tempo defaults
+TEMPO_AC_SECONDS = 8.0
+TEMPO_START_BPM = 120.0
+TEMPO_STD_OCTAVES = 1.0
+TEMPO_MAX_BPM = 320.0
+
+
+def _summarize(frame_means: np.ndarray, mfcc_stds: np.ndarray, tempo: float) -> np.ndarray:
+    """Assemble the 58-dim vector: frame means, tempo, MFCC standard deviations."""
+    return np.concatenate([frame_means, [tempo], mfcc_stds]).astype(np.float64)
+
+
+class _RunningStats:
+    """Mergeable per-row mean/variance over frames (Chan et al. parallel update)."""
+    
+    def __init__(self, n_rows: int):
+        self.count = 0
+        self.mean = np.zeros(n_rows)
+        self._m2 = np.zeros(n_rows)
+    
+    def update(self, count: int, mean: np.ndarray, var: np.ndarray):
+        """Merge a batch of ``count`` frames with the given mean and variance."""
+        total = self.count + count
+        delta = mean - self.mean
+        self.mean = self.mean + delta * count / total
+        self._m2 = self._m2 + var * count + delta ** 2 * self.count * count / total
+        self.count = total
+    
+    @property
+    def var(self) -> np.ndarray:
+        return self._m2 / self.count if self.count else self._m2
+
+
+class _StageTimer:
+    """Accumulates wall-clock time per named stage into an optional dict."""
+    
+    def __init__(self, timings: Optional[Dict[str, float]]):
+        self.timings = timings
+    
+    @contextmanager
+    def __call__(self, name: str):
+        if self.timings is None:
+            yield
+            return
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.timings[name] = self.timings.get(name, 0.0) + time.perf_counter() - start
+
+
+def _frame_rms(y: np.ndarray, frame_length: int, hop_length: int) -> np.ndarray:
+    """
+    Centered, zero-padded frame RMS (same framing as ``librosa.feature.rms``).
+    
+    Uses a running sum of squares instead of reducing a strided frame view,
+    which is an order of magnitude faster on long signals.
+    """
+    pad = frame_length // 2
+    y_sq = np.pad(y.astype(np.float64) ** 2, (pad, pad))
+    cumsum = np.concatenate(([0.0], np.cumsum(y_sq)))
+    n_frames = 1 + (len(y_sq) - frame_length) // hop_length
+    starts = np.arange(n_frames) * hop_length
+    power = (cumsum[starts + frame_length] - cumsum[starts]) / frame_length
+    return np.sqrt(np.maximum(power, 0.0))[np.newaxis, :]
+
+
+def _best_tempo(autocorr: np.ndarray, sr: int, hop_length: int) -> float:
+    """BPM of the autocorrelation lag favoured by librosa's log-normal tempo prior."""
+    bpms = librosa.tempo_frequencies(len(autocorr), hop_length=hop_length, sr=sr)
+    logprior = -0.5 * ((np.log2(bpms) - np.log2(TEMPO_START_BPM)) / TEMPO_STD_OCTAVES) ** 2
+    logprior[:int(np.argmax(bpms < TEMPO_MAX_BPM))] = -np.inf
+    return float(bpms[np.argmax(np.log1p(1e6 * autocorr) + logprior)])
+
+
+def _tempogram_tempo(onset_env: np.ndarray, sr: int, hop_length: int) -> float:
+    """
+    ``librosa.feature.tempo`` for one onset envelope, several times faster.
+    
+    librosa autocorrelates every centered window along the non-contiguous
+    axis with an awkward FFT size (2 * window - 1); doing it row-wise with
+    a 5-smooth size gives the same lags far faster.
+    """
+    win_length = librosa.time_to_frames(TEMPO_AC_SECONDS, sr=sr, hop_length=hop_length).item()
+    n = len(onset_env)
+    padded = np.pad(onset_env, win_length // 2, mode="linear_ramp", end_values=[0, 0])
+    windows = np.lib.stride_tricks.sliding_window_view(padded, win_length)[:n]
+    windows = windows * librosa.filters.get_window("hann", win_length, fftbins=True)
+    # scipy ships with librosa; any length >= 2 * window - 1 avoids circular wrap-around
+    import scipy.fft
+    n_fft = scipy.fft.next_fast_len(2 * win_length - 1, real=True)
+    spectrum = scipy.fft.rfft(windows, n=n_fft, axis=1)
+    autocorr = scipy.fft.irfft(spectrum.real ** 2 + spectrum.imag ** 2, n=n_fft, axis=1)[:, :win_length]
+    # Max-normalize each window (librosa.util.normalize with norm=inf)
+    norms = np.abs(autocorr).max(axis=1, keepdims=True)
+    norms[norms < np.finfo(autocorr.dtype).tiny] = 1.0
+    return _best_tempo((autocorr / norms).mean(axis=0), sr, hop_length)
+
+
+def _autocorr_tempo(onset_env: np.ndarray, sr: int, hop_length: int) -> float:
+    """Tempo from a single autocorrelation of the whole (mean-removed) onset envelope."""
+    win_length = librosa.time_to_frames(TEMPO_AC_SECONDS, sr=sr, hop_length=hop_length).item()
+    centered = onset_env - onset_env.mean()
+    n_fft = 1 << (2 * len(centered) - 2).bit_length()
+    spectrum = np.fft.rfft(centered, n=n_fft)
+    autocorr = np.fft.irfft(spectrum.real ** 2 + spectrum.imag ** 2, n=n_fft)[:win_length]
+    autocorr = np.maximum(autocorr / max(autocorr[0], np.finfo(autocorr.dtype).tiny), 0.0)
+    return _best_tempo(autocorr, sr, hop_length)
+
+
+def estimate_tempo(
+    onset_env: np.ndarray,
+    sr: int,
+    method: str = "tempogram",
+    hop_length: int = HOP_LENGTH
+) -> float:
+    """
+    Global tempo of a clip from its onset strength envelope.
+    
+    Args:
+        onset_env: Onset strength envelope (one value per frame)
+        sr: Sample rate of the analysed signal
+        method: One of TEMPO_METHODS
+        hop_length: Hop length of the envelope frames
+        
+    Returns:
+        Tempo in BPM (0 for an envelope without onsets, as beat_track)
+    """
+    load_librosa()
+    if method == "beat_track":
+        tempo, _ = librosa.beat.beat_track(onset_envelope=onset_env, sr=sr, hop_length=hop_length)
+        return float(tempo)
+    if not onset_env.any():
+        return 0.0
+    if method == "tempogram":
+        return _tempogram_tempo(onset_env, sr, hop_length)
+    if method == "autocorr":
+        return _autocorr_tempo(onset_env, sr, hop_length)
+    raise ValueError(f"Unknown tempo method '{method}', expected one of {TEMPO_METHODS}")
+
+
+def _read_bytes(audio: AudioSource) -> bytes:
+    """Return the raw bytes of a path, bytes-like or file-like audio source."""
+    if isinstance(audio, (bytes, bytearray, memoryview)):
+        return bytes(audio)
+    if isinstance(audio, (str, os.PathLike)):
+        with open(audio, "rb") as f:
+            return f.read()
+    return audio.read()
+
+
+def _extract_batch_item(sr: int, duration: float, tempo_method: str, audio_path: str):
+    """Process-pool worker: returns (path, features or None, error or None)."""
+    try:
+        extractor = AudioFeatureExtractor(sr=sr, duration=duration, tempo_method=tempo_method)
+        features = extractor._extract_audio(audio_path)
+        return audio_path, features, None
+    except Exception as e:
+        return audio_path, None, f"{type(e).__name__}: {e}"
 
 
 class AudioFeatureExtractor:
@@ -25,86 +249,445 @@ class AudioFeatureExtractor:
     - Tempo - Beats per minute
     """
     
-    def __init__(self, sr: int = 22050, duration: float = 30.0):
+    def __init__(
+        self,
+        sr: int = 22050,
+        duration: float = 30.0,
+        cache: Optional[FeatureCache] = None,
+        tempo_method: str = "tempogram"
+    ):
         """
         Initialize the feature extractor.
         
         Args:
             sr: Sample rate for audio processing
             duration: Maximum duration to process (seconds)
+            cache: Optional feature cache keyed by audio content
+            tempo_method: Tempo estimator, one of TEMPO_METHODS
         """
+        if tempo_method not in TEMPO_METHODS:
+            raise ValueError(f"Unknown tempo method '{tempo_method}', expected one of {TEMPO_METHODS}")
         self.sr = sr
         self.duration = duration
+        self.cache = cache
+        self.tempo_method = tempo_method
+        # Extractions answered with mock features instead of real ones
+        self.mock_fallbacks = 0
         
-    def extract(self, audio_path: str) -> np.ndarray:
+    def extract(self, audio: AudioSource, strict: bool = False) -> np.ndarray:
         """
         Extract features from an audio file.
         
         Args:
-            audio_path: Path to the audio file
+            audio: Path to the audio file, its raw bytes, or a binary file object
+            strict: Raise on decode/extraction errors instead of returning
+                mock features
             
         Returns:
             Feature vector (58 dimensions)
         """
-        if librosa is None:
+        features, _ = self.extract_with_timings(audio, strict=strict)
+        return features
+    
+    def extract_with_timings(
+        self,
+        audio: AudioSource,
+        strict: bool = False
+    ) -> Tuple[np.ndarray, Dict[str, float]]:
+        """
+        Extract features and report how long each pipeline stage took.
+        
+        Args:
+            audio: Path to the audio file, its raw bytes, or a binary file object
+            strict: Raise on decode/extraction errors instead of returning
+                mock features
+            
+        Returns:
+            Tuple of (feature vector, stage name -> seconds)
+        """
+        timings: Dict[str, float] = {}
+        
+        if load_librosa() is None:
+            if strict:
+                raise RuntimeError("librosa is required for feature extraction")
             # Return mock features if librosa not available
-            return self._get_mock_features()
+            return self._get_mock_features(), timings
+        
+        stage = _StageTimer(timings)
+        cache_key = None
+        if self.cache is not None:
+            with stage("cache_lookup"):
+                # Keep the bytes so a miss decodes from memory, not the source again
+                audio = _read_bytes(audio)
+                cache_key = self.cache_key(audio)
+                cached = self.cache.get(cache_key)
+            if cached is not None:
+                return cached, timings
         
         try:
-            # Load audio file
-            y, sr = librosa.load(audio_path, sr=self.sr, duration=self.duration)
-            
-            # Extract features
-            features = []
-            
-            # 1. MFCCs (20 coefficients)
-            mfccs = librosa.feature.mfcc(y=y, sr=sr, n_mfcc=20)
-            mfccs_mean = np.mean(mfccs, axis=1)
-            features.extend(mfccs_mean)
-            
-            # 2. Chroma features (12 pitch classes)
-            chroma = librosa.feature.chroma_stft(y=y, sr=sr)
-            chroma_mean = np.mean(chroma, axis=1)
-            features.extend(chroma_mean)
-            
-            # 3. Spectral Centroid
-            spectral_centroid = librosa.feature.spectral_centroid(y=y, sr=sr)
-            features.append(np.mean(spectral_centroid))
+            features = self._extract_audio(audio, timings)
+        except Exception as e:
+            if strict:
+                raise
+            print(f"Error extracting features: {e}")
+            return self._get_mock_features(), timings
+        
+        # Only real extractions are cached, never mock fallbacks
+        if cache_key is not None:
+            self.cache.put(cache_key, features)
+        return features, timings
+    
+    def cache_key(self, content: bytes) -> str:
+        """
+        Cache key for raw audio bytes under this extractor's settings.
+        
+        Args:
+            content: Raw audio file bytes
             
-            # 4. Spectral Bandwidth
-            spectral_bandwidth = librosa.feature.spectral_bandwidth(y=y, sr=sr)
-            features.append(np.mean(spectral_bandwidth))
+        Returns:
+            Content-addressed key for ``FeatureCache``
+        """
+        params = {"sr": self.sr, "duration": self.duration, "version": FEATURE_VERSION}
+        if self.tempo_method in APPROXIMATE_TEMPO_METHODS:
+            params["tempo"] = self.tempo_method
+        return FeatureCache.make_key(content, **params)
+    
+    def extract_batch(
+        self,
+        audio_paths: Iterable[str],
+        workers: Optional[int] = None,
+        stats: Optional[Dict[str, Any]] = None
+    ) -> Iterator[Tuple[str, Optional[np.ndarray]]]:
+        """
+        Extract features for many files across a process pool.
+        
+        Results are yielded as soon as each file finishes, so the order
+        does not follow ``audio_paths``. A file that fails to decode yields
+        ``(path, None)`` and does not stop the batch; unlike ``extract`` no
+        mock features are substituted.
+        
+        With a cache configured, each file is hashed first and cached
+        vectors are yielded without decoding; new results are stored, so
+        a rerun over the same files only decodes files that changed.
+        
+        Args:
+            audio_paths: Paths of the audio files to process
+            workers: Number of worker processes (defaults to CPU count,
+                1 runs in-process)
+            stats: Optional dict that receives ``completed``, ``cached``,
+                ``failed``, ``errors`` (path -> message), ``elapsed`` and
+                ``files_per_sec``
             
-            # 5. Spectral Rolloff
-            spectral_rolloff = librosa.feature.spectral_rolloff(y=y, sr=sr)
-            features.append(np.mean(spectral_rolloff))
+        Yields:
+            Tuples of (path, feature vector or None)
+        """
+        if load_librosa() is None:
+            raise RuntimeError("librosa is required for batch feature extraction")
+        
+        stats = stats if stats is not None else {}
+        stats.update({"completed": 0, "cached": 0, "failed": 0, "errors": {}})
+        workers = workers or os.cpu_count() or 1
+        start = time.perf_counter()
+        # Cache key of every file submitted for extraction
+        keys: Dict[str, str] = {}
+        
+        def lookup(path):
+            """Cached vector for ``path`` (or None), remembering its key on a miss."""
+            if self.cache is None:
+                return None
+            try:
+                with open(path, "rb") as f:
+                    key = self.cache_key(f.read())
+            except OSError:
+                return None
+            cached = self.cache.get(key)
+            if cached is None:
+                keys[path] = key
+            else:
+                stats["cached"] += 1
+            return cached
+        
+        def record(path, features, error):
+            if error is None:
+                stats["completed"] += 1
+                key = keys.pop(path, None)
+                if key is not None:
+                    self.cache.put(key, features)
+            else:
+                stats["failed"] += 1
+                stats["errors"][path] = error
+            stats["elapsed"] = time.perf_counter() - start
+            done = stats["completed"] + stats["failed"]
+            stats["files_per_sec"] = done / stats["elapsed"] if stats["elapsed"] > 0 else 0.0
+            return path, features
+        
+        if workers == 1:
+            for path in audio_paths:
+                cached = lookup(path)
+                if cached is not None:
+                    yield record(path, cached, None)
+                else:
+                    yield record(*_extract_batch_item(self.sr, self.duration, self.tempo_method, path))
+            return
+        
+        # Keep a bounded window of futures in flight so arbitrarily long
+        # path iterators do not get materialised up front. Workers are not
+        # forked: this also runs inside the threaded server (ingest), where
+        # a fork can copy a lock some other thread holds.
+        paths = iter(audio_paths)
+        max_in_flight = workers * 4
+        context = multiprocessing.get_context(PROCESS_START_METHOD)
+        with ProcessPoolExecutor(max_workers=workers, mp_context=context) as pool:
+            pending = set()
+            while True:
+                for path in paths:
+                    cached = lookup(path)
+                    if cached is not None:
+                        yield record(path, cached, None)
+                        continue
+                    pending.add(pool.submit(_extract_batch_item, self.sr, self.duration, self.tempo_method, path))
+                    if len(pending) >= max_in_flight:
+                        break
+                if not pending:
+                    break
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    yield record(*future.result())
+    
+    def load_audio(self, audio: AudioSource) -> Tuple[np.ndarray, int]:
+        """
+        Decode audio to a mono signal at ``self.sr``.
+        
+        In-memory sources are decoded directly with soundfile and only the
+        first ``duration`` seconds are read. Formats libsndfile cannot
+        handle fall back to ``librosa.load`` (via a temporary file when the
+        source is not a path, since audioread needs one).
+        
+        Args:
+            audio: Path to the audio file, its raw bytes, or a binary file object
             
-            # 6. Zero Crossing Rate
-            zcr = librosa.feature.zero_crossing_rate(y)
-            features.append(np.mean(zcr))
+        Returns:
+            Tuple of (signal, sample rate)
+        """
+        return self._load(audio, self.duration)
+    
+    def _load(self, audio: AudioSource, duration: Optional[float]) -> Tuple[np.ndarray, int]:
+        """``load_audio`` reading at most ``duration`` seconds (None reads everything)."""
+        load_librosa()
+        source = io.BytesIO(audio) if isinstance(audio, (bytes, bytearray, memoryview)) else audio
+        
+        if sf is not None:
+            try:
+                return self._decode_soundfile(source, duration)
+            except Exception:
+                if hasattr(source, "seek"):
+                    source.seek(0)
+        
+        if isinstance(source, (str, os.PathLike)):
+            return librosa.load(source, sr=self.sr, duration=duration)
+        
+        with tempfile.NamedTemporaryFile(suffix=".audio") as tmp:
+            tmp.write(source.read())
+            tmp.flush()
+            return librosa.load(tmp.name, sr=self.sr, duration=duration)
+    
+    def _decode_soundfile(self, source, duration: Optional[float]) -> Tuple[np.ndarray, int]:
+        """Read at most ``duration`` seconds with soundfile, downmix and resample."""
+        with sf.SoundFile(source) as f:
+            native_sr = f.samplerate
+            frames = int(duration * native_sr) if duration else -1
+            y = f.read(frames=frames, dtype="float32", always_2d=False).T
+        
+        y = librosa.to_mono(y)
+        if native_sr != self.sr:
+            y = librosa.resample(y, orig_sr=native_sr, target_sr=self.sr)
+        return y, self.sr
+    
+    def _extract_audio(self, audio: AudioSource, timings: Optional[Dict[str, float]] = None) -> np.ndarray:
+        """Decode and extract one input, letting decode/DSP errors propagate."""
+        stage = _StageTimer(timings)
+        with stage("load"):
+            y, sr = self.load_audio(audio)
+        return self.extract_from_signal(y, sr, timings=timings)
+    
+    def extract_from_signal(
+        self,
+        y: np.ndarray,
+        sr: int,
+        timings: Optional[Dict[str, float]] = None
+    ) -> np.ndarray:
+        """
+        Extract features from an already decoded signal.
+        
+        The STFT is computed once and every spectral feature is derived
+        from it: the power spectrogram feeds the mel filterbank and chroma,
+        the magnitude spectrogram feeds centroid/bandwidth/rolloff, and the
+        log-mel spectrogram is shared between the MFCCs and the onset
+        envelope used for tempo estimation.
+        
+        Args:
+            y: Mono audio signal
+            sr: Sample rate of ``y``
+            timings: Optional dict that receives per-stage durations (seconds)
             
-            # 7. RMS Energy
-            rms = librosa.feature.rms(y=y)
-            features.append(np.mean(rms))
+        Returns:
+            Feature vector (58 dimensions)
+        """
+        load_librosa()
+        frames, tempo = self._frame_features(y, sr, timings)
+        return _summarize(frames.mean(axis=1), frames[:N_MFCC].std(axis=1), tempo)
+    
+    def iter_stream(
+        self,
+        audio: AudioSource,
+        window_seconds: float = 30.0
+    ) -> Iterator[Tuple[float, float, np.ndarray, np.ndarray]]:
+        """
+        Extract features window by window over the whole file.
+        
+        Audio is decoded in fixed windows and never held in memory as a
+        whole; frame-level statistics are merged into running means and
+        variances, so memory stays constant however long the input is
+        (``self.duration`` is ignored). The whole-track vector uses the
+        frame-weighted mean tempo across windows. With a single window the
+        result matches ``extract``; with several it is close but not
+        identical, since dB clipping (``top_db``) and frame padding are
+        applied per window.
+        
+        Args:
+            audio: Path to the audio file, its raw bytes, or a binary file object
+            window_seconds: Length of each analysis window
             
-            # 8. Tempo
-            tempo, _ = librosa.beat.beat_track(y=y, sr=sr)
-            features.append(float(tempo))
+        Yields:
+            Tuples of (window start s, window end s, window feature vector,
+            whole-track feature vector so far)
+        """
+        stats = _RunningStats(N_FRAME_FEATURES)
+        tempo_sum = 0.0
+        
+        for start, y in self._iter_windows(audio, window_seconds):
+            if len(y) < N_FFT:
+                continue
+            frames, tempo = self._frame_features(y, self.sr)
+            window_mean = frames.mean(axis=1)
+            window_std = frames.std(axis=1)
             
-            # Additional statistics (variance of MFCCs)
-            mfccs_std = np.std(mfccs, axis=1)
-            features.extend(mfccs_std)
+            stats.update(frames.shape[1], window_mean, window_std ** 2)
+            tempo_sum += tempo * frames.shape[1]
             
-            return np.array(features)
+            mean, var = stats.mean, stats.var
+            running = _summarize(mean, np.sqrt(var[:N_MFCC]), tempo_sum / stats.count)
+            window = _summarize(window_mean, window_std[:N_MFCC], tempo)
+            yield start, start + len(y) / self.sr, window, running
+    
+    def extract_stream(self, audio: AudioSource, window_seconds: float = 30.0) -> np.ndarray:
+        """
+        Whole-track feature vector computed with constant memory.
+        
+        Args:
+            audio: Path to the audio file, its raw bytes, or a binary file object
+            window_seconds: Length of each analysis window
             
-        except Exception as e:
-            print(f"Error extracting features: {e}")
-            return self._get_mock_features()
+        Returns:
+            Feature vector (58 dimensions)
+        """
+        running = None
+        for _, _, _, running in self.iter_stream(audio, window_seconds):
+            pass
+        if running is None:
+            raise ValueError("Audio is too short to extract features")
+        return running
+    
+    def _iter_windows(self, audio: AudioSource, window_seconds: float) -> Iterator[Tuple[float, np.ndarray]]:
+        """Yield (start time, mono signal at self.sr) for consecutive windows."""
+        load_librosa()
+        source = io.BytesIO(audio) if isinstance(audio, (bytes, bytearray, memoryview)) else audio
+        
+        try:
+            f = sf.SoundFile(source) if sf is not None else None
+        except Exception:
+            f = None
+            if hasattr(source, "seek"):
+                source.seek(0)
+        
+        if f is None:
+            # Formats libsndfile cannot read are decoded in full and sliced
+            y, sr = self._load(source, None)
+            step = int(window_seconds * sr)
+            for offset in range(0, len(y), step):
+                yield offset / sr, y[offset:offset + step]
+            return
+        
+        with f:
+            native_sr = f.samplerate
+            blocksize = int(window_seconds * native_sr)
+            for index, block in enumerate(f.blocks(blocksize=blocksize, dtype="float32", always_2d=True)):
+                y = librosa.to_mono(block.T)
+                if native_sr != self.sr:
+                    y = librosa.resample(y, orig_sr=native_sr, target_sr=self.sr)
+                yield index * window_seconds, y
+    
+    def _frame_features(
+        self,
+        y: np.ndarray,
+        sr: int,
+        timings: Optional[Dict[str, float]] = None
+    ) -> Tuple[np.ndarray, float]:
+        """
+        Frame-level features of a signal.
+        
+        Returns:
+            Tuple of (N_FRAME_FEATURES x n_frames matrix with rows MFCC(20),
+            chroma(12), centroid, bandwidth, rolloff, ZCR, RMS; tempo in BPM)
+        """
+        stage = _StageTimer(timings)
+        
+        # Shared spectrograms
+        with stage("stft"):
+            S_mag = np.abs(librosa.stft(y, n_fft=N_FFT, hop_length=HOP_LENGTH))
+            S_power = S_mag ** 2
+        
+        with stage("mel"):
+            mel = librosa.feature.melspectrogram(S=S_power, sr=sr)
+            log_mel = librosa.power_to_db(mel)
+        
+        # 1. MFCCs (20 coefficients)
+        with stage("mfcc"):
+            mfccs = librosa.feature.mfcc(S=log_mel, n_mfcc=N_MFCC)
+        
+        # 2. Chroma features (12 pitch classes)
+        with stage("chroma"):
+            chroma = librosa.feature.chroma_stft(S=S_power, sr=sr)
+        
+        # 3-5. Spectral centroid, bandwidth and rolloff
+        with stage("spectral"):
+            centroid = librosa.feature.spectral_centroid(S=S_mag, sr=sr)
+            bandwidth = librosa.feature.spectral_bandwidth(
+                S=S_mag, sr=sr, centroid=centroid
+            )
+            rolloff = librosa.feature.spectral_rolloff(S=S_mag, sr=sr)
+        
+        # 6-7. Zero crossing rate and RMS energy (time domain)
+        with stage("time_domain"):
+            zcr = librosa.feature.zero_crossing_rate(
+                y, frame_length=N_FFT, hop_length=HOP_LENGTH
+            )
+            rms = _frame_rms(y, frame_length=N_FFT, hop_length=HOP_LENGTH)
+        
+        # 8. Tempo from the onset envelope of the shared log-mel spectrogram
+        with stage("tempo"):
+            onset_env = librosa.onset.onset_strength(
+                S=log_mel, sr=sr, aggregate=np.median
+            )
+            tempo = estimate_tempo(onset_env, sr, self.tempo_method)
+        
+        frames = np.vstack([mfccs, chroma, centroid, bandwidth, rolloff, zcr, rms])
+        return frames, tempo
     
     def _get_mock_features(self) -> np.ndarray:
         """Generate mock features for testing without librosa."""
-        np.random.seed(42)
-        return np.random.randn(58)
+        self.mock_fallbacks += 1
+        return np.random.default_rng(42).standard_normal(58)
     
     def get_feature_names(self) -> list:
         """Get names of all extracted features."""
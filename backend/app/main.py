@@ -2,17 +2,34 @@
 Music Genre Classification API
 FastAPI backend for audio genre classification and song recommendations.
 """
-from fastapi import FastAPI, UploadFile, File, Form, HTTPException
+from fastapi import FastAPI, UploadFile, File, Form, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import FileResponse, JSONResponse, PlainTextResponse, StreamingResponse
 from pydantic import BaseModel
 from typing import List, Dict, Optional
+import asyncio
+import io
+import json
 import os
+import secrets
 import tempfile
+import time
+import zipfile
 
+import numpy as np
+
+from app.batching import MicroBatcher
+from app.cascade import ExtractionCascade
+from app.executor import ExecutorBusyError, InferenceExecutor, StageTimeoutError
+from app.features.cache import FeatureCache
 from app.features.extractor import AudioFeatureExtractor
+from app.metrics import MetricsRegistry
 from app.models.classifier import GenreClassifier
+from app.models.embedding import FeatureEmbedding
 from app.models.recommender import SongRecommender
+from app.profiling import ProfileStore, profile_call
+from app.result_cache import ResultCache
+from app.warmup import warm_up
 
 # Initialize FastAPI app
 app = FastAPI(
@@ -31,9 +48,355 @@ app.add_middleware(
 )
 
 # Initialize ML components
-feature_extractor = AudioFeatureExtractor()
-genre_classifier = GenreClassifier()
-song_recommender = SongRecommender()
+feature_cache = FeatureCache(
+    max_entries=int(os.getenv("FEATURE_CACHE_SIZE", "1024")),
+    disk_dir=os.getenv("FEATURE_CACHE_DIR") or None,
+    disk_max_bytes=int(os.getenv("FEATURE_CACHE_MAX_BYTES", str(256 * 1024 * 1024)))
+)
+# TEMPO_METHOD=autocorr trades tempo accuracy for a much cheaper estimate
+TEMPO_METHOD = os.getenv("TEMPO_METHOD", "tempogram")
+feature_extractor = AudioFeatureExtractor(cache=feature_cache, tempo_method=TEMPO_METHOD)
+# Short excerpt used for the early result of /api/predict/stream
+EARLY_PREDICTION_SECONDS = float(os.getenv("EARLY_PREDICTION_SECONDS", "5"))
+early_feature_extractor = AudioFeatureExtractor(
+    duration=EARLY_PREDICTION_SECONDS, cache=feature_cache, tempo_method=TEMPO_METHOD
+)
+# CASCADE_THRESHOLD enables early exit on /api/predict: the excerpt's
+# prediction is returned when its confidence reaches the threshold, and
+# the full clip is only extracted otherwise (unset disables)
+CASCADE_THRESHOLD = os.getenv("CASCADE_THRESHOLD")
+# LAZY_LOAD=1 defers librosa/sklearn imports and model loading to a
+# background warm-up after startup; LAZY_LOAD=0 does it all at import time
+LAZY_LOAD = os.getenv("LAZY_LOAD", "1") != "0"
+genre_classifier = GenreClassifier(os.getenv("MODEL_PATH") or None, lazy=LAZY_LOAD)
+# Seconds between background checks of MODEL_PATH for a replaced file (0 disables)
+MODEL_RELOAD_INTERVAL = float(os.getenv("MODEL_RELOAD_INTERVAL", "2"))
+# RECOMMENDER_EMBEDDING compares songs in a compact space written by
+# train_model.py (models/embedding_pca.npz or embedding_mlp.npz) instead of
+# on raw features; RECOMMENDER_VECTOR_DTYPE=float16/int8 shrinks its rows
+RECOMMENDER_EMBEDDING = os.getenv("RECOMMENDER_EMBEDDING") or None
+song_recommender = SongRecommender(
+    index=os.getenv("RECOMMENDER_INDEX", "exact"),
+    index_params=json.loads(os.getenv("RECOMMENDER_INDEX_PARAMS", "{}")),
+    catalog_path=os.getenv("CATALOG_PATH") or None,
+    embedding=FeatureEmbedding.load(RECOMMENDER_EMBEDDING) if RECOMMENDER_EMBEDDING else None,
+    vector_dtype=os.getenv("RECOMMENDER_VECTOR_DTYPE", "float32")
+)
+
+cascade = ExtractionCascade(
+    early_feature_extractor, feature_extractor, genre_classifier, float(CASCADE_THRESHOLD)
+) if CASCADE_THRESHOLD else None
+
+# Complete /api/predict responses, keyed on input + model/catalog versions
+result_cache = ResultCache(
+    max_entries=int(os.getenv("RESULT_CACHE_SIZE", "4096")),
+    ttl_seconds=float(os.getenv("RESULT_CACHE_TTL", "3600"))
+)
+
+# Readiness for /health/ready, filled in by _warm_up
+startup_state = {"ready": False, "warmup": {}, "error": None}
+
+
+def _warm_up():
+    """Warm the shared models and mark the service ready."""
+    try:
+        startup_state["warmup"] = warm_up(feature_extractor, genre_classifier, song_recommender)
+    except Exception as e:
+        # Fallback paths still serve requests, so report the error but go ready
+        print(f"Warm-up failed: {e}")
+        startup_state["error"] = str(e)
+    startup_state["ready"] = True
+
+
+def _warm_up_worker():
+    """Process-pool initializer: each worker holds its own model copies."""
+    # Loads the current file (workers import this module afresh)
+    genre_classifier.reload_if_changed()
+    warm_up(feature_extractor, genre_classifier)
+
+
+# Blocking inference runs here so the event loop stays responsive
+inference_executor = InferenceExecutor(
+    kind=os.getenv("INFERENCE_EXECUTOR", "thread"),
+    max_workers=int(os.getenv("INFERENCE_WORKERS", str(os.cpu_count() or 1))),
+    max_queue=int(os.getenv("INFERENCE_QUEUE_SIZE", "16")),
+    timeouts={
+        "extract": float(os.getenv("INFERENCE_TIMEOUT_EXTRACT", "60")),
+        "predict": float(os.getenv("INFERENCE_TIMEOUT_PREDICT", "5")),
+        "recommend": float(os.getenv("INFERENCE_TIMEOUT_RECOMMEND", "5")),
+    },
+    initializer=_warm_up_worker if os.getenv("INFERENCE_EXECUTOR") == "process" else None
+)
+
+if not LAZY_LOAD:
+    _warm_up()
+
+
+def _reload_model():
+    """Load a replaced model file (blocking; runs off the event loop)."""
+    # Process-pool workers hold their own copy: move new calls to fresh
+    # workers before the new version becomes part of result cache keys
+    before_swap = inference_executor.recycle if inference_executor.kind == "process" else None
+    if genre_classifier.reload_if_changed(before_swap):
+        print(f"Loaded new model version {genre_classifier.version}")
+
+
+async def _watch_model():
+    """Check for a replaced model file every MODEL_RELOAD_INTERVAL seconds."""
+    loop = asyncio.get_running_loop()
+    while True:
+        await asyncio.sleep(MODEL_RELOAD_INTERVAL)
+        try:
+            await loop.run_in_executor(None, _reload_model)
+        except Exception as e:
+            print(f"Model reload failed: {e}")
+
+
+# Background tasks started with the app, cancelled on shutdown
+background_tasks = []
+
+# Served on /metrics in Prometheus text format
+metrics = MetricsRegistry()
+stage_seconds = metrics.histogram(
+    "genre_api_stage_seconds",
+    "Time spent per request stage; extract, predict and recommend include executor queueing, "
+    "early_* stages are the short excerpt of streaming and cascade requests",
+    ["stage"]
+)
+metrics.collector(
+    "genre_api_mock_fallbacks_total", "counter",
+    "Mock features or predictions served because extraction or the model failed "
+    "(counted in this process only, not in process-pool workers)",
+    lambda: [
+        ({"kind": "features"},
+         feature_extractor.mock_fallbacks + early_feature_extractor.mock_fallbacks),
+        ({"kind": "prediction"}, genre_classifier.mock_fallbacks),
+    ]
+)
+metrics.collector(
+    "genre_api_executor_in_flight", "gauge", "Inference calls running or queued",
+    lambda: [({}, inference_executor.stats()["in_flight"])]
+)
+metrics.collector(
+    "genre_api_executor_queued", "gauge", "Inference calls waiting for a worker",
+    lambda: [({}, inference_executor.stats()["queued"])]
+)
+metrics.collector(
+    "genre_api_executor_rejected_total", "counter", "Inference calls rejected with a full queue",
+    lambda: [({}, inference_executor.stats()["rejected"])]
+)
+metrics.collector(
+    "genre_api_executor_timed_out_total", "counter", "Inference stages that exceeded their timeout",
+    lambda: [({}, inference_executor.stats()["timed_out"])]
+)
+
+
+def _cascade_outcomes():
+    if cascade is None:
+        return []
+    stats = cascade.stats()
+    return [
+        ({"outcome": "early_exit"}, stats["early_exits"]),
+        ({"outcome": "full"}, stats["full_extractions"] - stats["early_failures"]),
+        ({"outcome": "early_failed"}, stats["early_failures"]),
+    ]
+
+
+metrics.collector(
+    "genre_api_cascade_requests_total", "counter",
+    "Cascade decisions: early exits, full extractions after an unsure or failed excerpt",
+    _cascade_outcomes
+)
+
+
+def _cache_counters():
+    features = feature_cache.stats()
+    results = result_cache.stats()
+    return {
+        "features": (features["hits"], features["misses"], features["hit_rate"]),
+        "results": (results["hits"], results["misses"], results["hit_rate"]),
+    }
+
+
+metrics.collector(
+    "genre_api_cache_hits_total", "counter", "Cache lookups that found an entry",
+    lambda: [({"cache": name}, hits) for name, (hits, _, _) in _cache_counters().items()]
+)
+metrics.collector(
+    "genre_api_cache_misses_total", "counter", "Cache lookups that found nothing",
+    lambda: [({"cache": name}, misses) for name, (_, misses, _) in _cache_counters().items()]
+)
+metrics.collector(
+    "genre_api_cache_hit_ratio", "gauge", "Hits over lookups since startup",
+    lambda: [({"cache": name}, rate) for name, (_, _, rate) in _cache_counters().items()]
+)
+
+
+# Stage functions are module-level so they can be pickled for a process pool;
+# extraction returns its per-feature-family timings for /metrics
+def _extract_features(content: bytes):
+    return feature_extractor.extract_with_timings(content)
+
+
+def _extract_early_features(content: bytes):
+    return early_feature_extractor.extract_with_timings(content)
+
+
+def _extract_features_strict(content: bytes):
+    return feature_extractor.extract_with_timings(content, strict=True)
+
+
+def _extract_early_features_strict(content: bytes):
+    return early_feature_extractor.extract_with_timings(content, strict=True)
+
+
+def _predict(features):
+    return genre_classifier.predict(features)
+
+
+def _predict_batch(features_matrix):
+    return genre_classifier.predict_batch(features_matrix)
+
+
+def _predict_for_genre(genre: str):
+    return genre_classifier.predict_for_genre(genre)
+
+
+def _recommend(features, genre: str, top_k: int):
+    return song_recommender.get_recommendations(features=features, genre=genre, top_k=top_k)
+
+
+# Opt-in profiling of single /api/predict uploads: every upload with
+# PROFILE_REQUESTS=1, or requests sending "X-Profile: 1" with a matching
+# X-Admin-Token. Admin endpoints are disabled while ADMIN_TOKEN is unset.
+ADMIN_TOKEN = os.getenv("ADMIN_TOKEN", "")
+PROFILE_REQUESTS = os.getenv("PROFILE_REQUESTS", "0") == "1"
+profile_store = ProfileStore(
+    os.getenv("PROFILE_DIR") or os.path.join(tempfile.gettempdir(), "genre-api-profiles"),
+    max_profiles=int(os.getenv("PROFILE_MAX", "20"))
+)
+# Uncached, so a profile always shows the full extraction path
+profile_extractor = AudioFeatureExtractor(
+    sr=feature_extractor.sr, duration=feature_extractor.duration, tempo_method=TEMPO_METHOD
+)
+
+
+def _is_admin(request: Request) -> bool:
+    token = request.headers.get("x-admin-token", "")
+    return bool(ADMIN_TOKEN) and secrets.compare_digest(token, ADMIN_TOKEN)
+
+
+def _require_admin(request: Request):
+    if not ADMIN_TOKEN:
+        raise HTTPException(status_code=404, detail="Not Found")
+    if not _is_admin(request):
+        raise HTTPException(status_code=403, detail="Invalid admin token")
+
+
+def _profiling_requested(request: Request) -> bool:
+    if PROFILE_REQUESTS:
+        return True
+    # Header lookups only happen when admin access is configured at all
+    return bool(ADMIN_TOKEN) and request.headers.get("x-profile") == "1" and _is_admin(request)
+
+
+def _predict_uncached(content: bytes, top_k: int):
+    features, timings = profile_extractor.extract_with_timings(content)
+    prediction = genre_classifier.predict(features)
+    recommendations = song_recommender.get_recommendations(
+        features=features, genre=prediction["genre"], top_k=top_k
+    )
+    return {"prediction": prediction, "recommendations": recommendations}, timings
+
+
+def _profile_predict(content: bytes, top_k: int):
+    """Extract, predict and recommend in one call under the profiler."""
+    (result, timings), pstats_data, summary = profile_call(_predict_uncached, content, top_k)
+    summary["stages_ms"] = {stage: round(seconds * 1000, 3) for stage, seconds in timings.items()}
+    return result, pstats_data, summary
+
+
+async def _timed(stage: str, fn, *args, wait: bool = False, label: Optional[str] = None):
+    """Run a stage on the inference executor and record its latency (under ``label`` if given)."""
+    label = label or stage
+    start = time.perf_counter()
+    try:
+        result = await inference_executor.run(stage, fn, *args, wait=wait)
+    except StageTimeoutError:
+        stage_seconds.observe(time.perf_counter() - start, label)
+        raise
+    # Rejected calls never ran and are counted by genre_api_executor_rejected_total
+    stage_seconds.observe(time.perf_counter() - start, label)
+    return result
+
+
+async def _extract(fn, content: bytes, wait: bool = False, early: bool = False):
+    """
+    Run an extraction stage and record the extractor's own stage timings.
+
+    Extractions of the short early excerpt are recorded as ``early_<stage>``
+    so they do not mix with full extractions in one histogram.
+    """
+    prefix = "early_" if early else ""
+    features, timings = await _timed("extract", fn, content, wait=wait, label=f"{prefix}extract")
+    for name, seconds in timings.items():
+        stage_seconds.observe(seconds, prefix + name)
+    return features
+
+
+async def _read_upload(upload: UploadFile) -> bytes:
+    start = time.perf_counter()
+    content = await upload.read()
+    stage_seconds.observe(time.perf_counter() - start, "upload_read")
+    return content
+
+
+async def _run_predict_batch(feature_rows):
+    return await inference_executor.run("predict", _predict_batch, np.vstack(feature_rows))
+
+
+# Concurrent uploads are classified together; MICRO_BATCH_WAIT_MS=0 disables
+MICRO_BATCH_WAIT_MS = float(os.getenv("MICRO_BATCH_WAIT_MS", "2"))
+predict_batcher = MicroBatcher(
+    _run_predict_batch,
+    max_batch_size=int(os.getenv("MICRO_BATCH_MAX_SIZE", "32")),
+    max_wait_ms=MICRO_BATCH_WAIT_MS
+)
+
+
+def _result_key(subject, top_k: int) -> str:
+    """Result cache key; changes when a new model is loaded or the catalog changes."""
+    return ResultCache.make_key(
+        subject,
+        model=genre_classifier.version,
+        catalog=song_recommender.catalog_version,
+        top_k=top_k
+    )
+
+
+async def _early_exit(content: bytes):
+    """Cascade first stage: (features, prediction) if the excerpt is confident, else (None, None)."""
+    try:
+        features = await _extract(_extract_early_features_strict, content, early=True)
+        prediction = await _classify(features)
+    except (ExecutorBusyError, StageTimeoutError):
+        raise
+    except Exception:
+        # Undecodable excerpt: let the full extraction decide (and fall back)
+        features = prediction = None
+    if cascade.accept(prediction):
+        return features, prediction
+    return None, None
+
+
+async def _classify(features):
+    if MICRO_BATCH_WAIT_MS <= 0:
+        return await _timed("predict", _predict, features)
+    start = time.perf_counter()
+    try:
+        return await predict_batcher.submit(features)
+    finally:
+        stage_seconds.observe(time.perf_counter() - start, "predict")
 
 
 # Pydantic models for API responses
@@ -86,10 +449,114 @@ SAMPLE_FILES = [
 ]
 
 
+@app.on_event("startup")
+async def start_warm_up():
+    """Warm up in the background so the server accepts connections immediately."""
+    if not startup_state["ready"]:
+        asyncio.get_running_loop().run_in_executor(None, _warm_up)
+
+
+@app.on_event("startup")
+async def start_model_watcher():
+    """Reload the model in the background when its file is replaced."""
+    if MODEL_RELOAD_INTERVAL > 0 and genre_classifier.model_path:
+        background_tasks.append(asyncio.create_task(_watch_model()))
+
+
+@app.on_event("shutdown")
+def shutdown_executor():
+    """Stop background tasks and inference workers on shutdown."""
+    for task in background_tasks:
+        task.cancel()
+    background_tasks.clear()
+    inference_executor.shutdown(wait=False)
+
+
 @app.get("/health")
 async def health_check():
-    """Health check endpoint."""
-    return {"status": "healthy", "message": "API is running"}
+    """Liveness check: the process is up and serving (may still be warming up)."""
+    return {"status": "healthy", "message": "API is running", "ready": startup_state["ready"]}
+
+
+@app.get("/health/ready")
+async def readiness_check():
+    """Readiness check: 503 until models are loaded and warmed up."""
+    body = {
+        "ready": startup_state["ready"],
+        "warmup_ms": {
+            stage: round(seconds * 1000, 1) for stage, seconds in startup_state["warmup"].items()
+        },
+        "error": startup_state["error"],
+    }
+    return JSONResponse(body, status_code=200 if startup_state["ready"] else 503)
+
+
+@app.get("/api/cache/stats")
+async def get_cache_stats():
+    """Feature cache and result cache hit/miss counters."""
+    return {**feature_cache.stats(), "results": result_cache.stats()}
+
+
+@app.get("/api/batching/stats")
+async def get_batching_stats():
+    """Micro-batcher batch counts, latency and throughput per batch size."""
+    if MICRO_BATCH_WAIT_MS <= 0:
+        return {"enabled": False}
+    return {"enabled": True, **predict_batcher.stats()}
+
+
+@app.get("/metrics", response_class=PlainTextResponse)
+async def get_metrics():
+    """Stage latencies, fallbacks, queue depth and cache hit rates for Prometheus."""
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4")
+
+
+@app.get("/admin/profiles")
+async def list_profiles(request: Request):
+    """Captured request profiles, oldest first (requires X-Admin-Token)."""
+    _require_admin(request)
+    profiles = []
+    for profile_id in profile_store.list_ids():
+        summary = profile_store.summary(profile_id)
+        if summary is not None:
+            profiles.append({
+                "id": profile_id,
+                "created": summary["created"],
+                "endpoint": summary["endpoint"],
+                "filename": summary["filename"],
+                "bytes": summary["bytes"],
+                "wall_ms": summary["wall_ms"],
+                "peak_bytes": summary["memory"]["peak_bytes"],
+            })
+    return {"profiles": profiles}
+
+
+@app.get("/admin/profiles/{profile_id}")
+async def get_profile_summary(profile_id: str, request: Request):
+    """Summary of one profile: top functions, memory, stage timings."""
+    _require_admin(request)
+    summary = profile_store.summary(profile_id)
+    if summary is None:
+        raise HTTPException(status_code=404, detail="Profile not found")
+    return summary
+
+
+@app.get("/admin/profiles/{profile_id}/pstats")
+async def download_profile(profile_id: str, request: Request):
+    """Download the raw cProfile data (open with pstats or snakeviz)."""
+    _require_admin(request)
+    path = profile_store.path(profile_id)
+    if path is None:
+        raise HTTPException(status_code=404, detail="Profile not found")
+    return FileResponse(path, media_type="application/octet-stream", filename=f"{profile_id}.prof")
+
+
+@app.get("/api/cascade/stats")
+async def get_cascade_stats():
+    """Early-exit rate of the extraction cascade (CASCADE_THRESHOLD)."""
+    if cascade is None:
+        return {"enabled": False}
+    return {"enabled": True, **cascade.stats()}
 
 
 @app.get("/api/samples", response_model=List[SampleFile])
@@ -100,12 +567,16 @@ async def get_sample_files():
 
 @app.post("/api/predict", response_model=RecommendationResponse)
 async def predict_genre(
+    request: Request,
     audio_file: Optional[UploadFile] = File(None),
     sample_id: Optional[str] = Form(None)
 ):
     """
     Predict the genre of an uploaded audio file or selected sample.
     Returns genre prediction with confidence and similar song recommendations.
+    
+    Profiled uploads (see ``_profiling_requested``) skip the caches and
+    micro-batching, and return the stored profile's ID in ``X-Profile-Id``.
     """
     if audio_file is None and sample_id is None:
         raise HTTPException(
@@ -123,29 +594,40 @@ async def predict_genre(
                     detail="Invalid file type. Please upload an audio file."
                 )
             
-            # Save to temporary file
-            with tempfile.NamedTemporaryFile(delete=False, suffix=".wav") as tmp:
-                content = await audio_file.read()
-                tmp.write(content)
-                tmp_path = tmp.name
+            # Decode straight from the upload bytes (no temp file round-trip)
+            content = await _read_upload(audio_file)
             
-            try:
-                # Extract features
-                features = feature_extractor.extract(tmp_path)
-                
-                # Get prediction
-                prediction = genre_classifier.predict(features)
-                
-                # Get recommendations
-                recommendations = song_recommender.get_recommendations(
-                    features=features,
-                    genre=prediction["genre"],
-                    top_k=3
-                )
-                
-            finally:
-                # Cleanup temp file
-                os.unlink(tmp_path)
+            if _profiling_requested(request):
+                result, pstats_data, summary = await _timed("profile", _profile_predict, content, 3)
+                profile_id = profile_store.save(pstats_data, {
+                    "endpoint": "/api/predict",
+                    "filename": audio_file.filename,
+                    "bytes": len(content),
+                    **summary
+                })
+                return JSONResponse(result, headers={"X-Profile-Id": profile_id})
+            
+            # Extract features (from a short excerpt first in cascade mode)
+            prediction = None
+            if cascade is not None:
+                features, prediction = await _early_exit(content)
+            if prediction is None:
+                features = await _extract(_extract_features, content)
+            
+            # Identical features give an identical response
+            cache_key = _result_key(features, 3)
+            cached = result_cache.get(cache_key)
+            if cached is not None:
+                return cached
+            
+            # Get prediction
+            if prediction is None:
+                prediction = await _classify(features)
+            
+            # Get recommendations
+            recommendations = await _timed(
+                "recommend", _recommend, features, prediction["genre"], 3
+            )
         
         # Handle sample file selection
         else:
@@ -156,24 +638,291 @@ async def predict_genre(
                     detail="Sample file not found"
                 )
             
+            # Demo answers are cheap to generate, so they are not cached
+            cache_key = None
+            
             # For demo: return mock prediction based on sample genre
-            prediction = genre_classifier.predict_for_genre(sample["genre"])
-            recommendations = song_recommender.get_recommendations(
-                genre=sample["genre"],
-                top_k=3
+            prediction = await _timed(
+                "predict", _predict_for_genre, sample["genre"]
+            )
+            recommendations = await _timed(
+                "recommend", _recommend, None, sample["genre"], 3
             )
         
-        return {
+        result = {
             "prediction": prediction,
             "recommendations": recommendations
         }
+        if cache_key is not None:
+            result_cache.put(cache_key, result)
+        return result
     
     except HTTPException:
         raise
+    except ExecutorBusyError as e:
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "1"})
+    except StageTimeoutError as e:
+        raise HTTPException(status_code=504, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
+def _format_event(event: Dict, sse: bool) -> str:
+    """Serialize one streaming event as an NDJSON line or an SSE message."""
+    data = json.dumps(event)
+    if sse:
+        return f"event: {event['type']}\ndata: {data}\n\n"
+    return data + "\n"
+
+
+@app.post("/api/predict/stream")
+async def predict_genre_stream(
+    request: Request,
+    audio_file: Optional[UploadFile] = File(None),
+    sample_id: Optional[str] = Form(None)
+):
+    """
+    Streaming variant of /api/predict.
+    
+    Emits newline-delimited JSON events (or Server-Sent Events when the
+    client sends ``Accept: text/event-stream``) as results become ready:
+    an early prediction from the first few seconds of audio, the final
+    prediction from the full excerpt, the recommendations, and a closing
+    ``done`` event with time-to-first-result and total time.
+    """
+    if audio_file is None and sample_id is None:
+        raise HTTPException(
+            status_code=400, 
+            detail="Please provide an audio file or select a sample"
+        )
+    
+    sample = None
+    if audio_file:
+        if not audio_file.content_type.startswith('audio/'):
+            raise HTTPException(
+                status_code=400,
+                detail="Invalid file type. Please upload an audio file."
+            )
+        content = await _read_upload(audio_file)
+    else:
+        sample = next((s for s in SAMPLE_FILES if s["id"] == sample_id), None)
+        if not sample:
+            raise HTTPException(
+                status_code=404,
+                detail="Sample file not found"
+            )
+    
+    sse = "text/event-stream" in request.headers.get("accept", "")
+    start = time.perf_counter()
+    
+    async def events():
+        first_result_ms = None
+        
+        def emit(event):
+            nonlocal first_result_ms
+            event["elapsed_ms"] = round((time.perf_counter() - start) * 1000, 1)
+            if first_result_ms is None and event["type"] != "error":
+                first_result_ms = event["elapsed_ms"]
+            return _format_event(event, sse)
+        
+        try:
+            if sample is not None:
+                prediction = await _timed(
+                    "predict", _predict_for_genre, sample["genre"]
+                )
+                yield emit({"type": "prediction", "stage": "final", "prediction": prediction})
+                recommendations = await _timed(
+                    "recommend", _recommend, None, sample["genre"], 3
+                )
+            else:
+                early_features = await _extract(_extract_early_features, content, early=True)
+                early_prediction = await _classify(early_features)
+                yield emit({
+                    "type": "prediction",
+                    "stage": "early",
+                    "seconds": EARLY_PREDICTION_SECONDS,
+                    "prediction": early_prediction
+                })
+                
+                features = await _extract(_extract_features, content)
+                prediction = await _classify(features)
+                yield emit({
+                    "type": "prediction",
+                    "stage": "final",
+                    "seconds": feature_extractor.duration,
+                    "prediction": prediction
+                })
+                recommendations = await _timed(
+                    "recommend", _recommend, features, prediction["genre"], 3
+                )
+            
+            yield emit({"type": "recommendations", "recommendations": recommendations})
+            yield emit({
+                "type": "done",
+                "time_to_first_result_ms": first_result_ms,
+                "total_ms": round((time.perf_counter() - start) * 1000, 1)
+            })
+        except ExecutorBusyError as e:
+            yield emit({"type": "error", "status": 503, "detail": str(e)})
+        except StageTimeoutError as e:
+            yield emit({"type": "error", "status": 504, "detail": str(e)})
+        except Exception as e:
+            yield emit({"type": "error", "status": 500, "detail": str(e)})
+    
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream" if sse else "application/x-ndjson",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+# Limits for /api/predict/batch
+BATCH_MAX_FILES = int(os.getenv("BATCH_MAX_FILES", "500"))
+BATCH_MAX_BYTES = int(os.getenv("BATCH_MAX_BYTES", str(512 * 1024 * 1024)))
+BATCH_MAX_TOP_K = int(os.getenv("BATCH_MAX_TOP_K", "20"))
+# Extractions one batch request keeps in the executor; below its admission
+# limit so single /api/predict calls are never shut out
+BATCH_MAX_IN_FLIGHT = int(os.getenv(
+    "BATCH_MAX_IN_FLIGHT",
+    str(max(1, min(inference_executor.max_workers, inference_executor.capacity // 2)))
+))
+# Finished extractions are classified together in chunks of this size
+BATCH_CLASSIFY_SIZE = int(os.getenv("BATCH_CLASSIFY_SIZE", "64"))
+ARCHIVE_AUDIO_EXTENSIONS = ('.wav', '.mp3', '.flac', '.ogg', '.m4a', '.aiff', '.au')
+
+
+def _read_archive(content: bytes) -> List[tuple]:
+    """List (name, bytes) of audio members in a zip, enforcing batch limits."""
+    try:
+        archive = zipfile.ZipFile(io.BytesIO(content))
+    except zipfile.BadZipFile:
+        raise HTTPException(status_code=400, detail="Archive is not a valid zip file")
+    
+    members = [
+        info for info in archive.infolist()
+        if not info.is_dir() and info.filename.lower().endswith(ARCHIVE_AUDIO_EXTENSIONS)
+    ]
+    if len(members) > BATCH_MAX_FILES:
+        raise HTTPException(status_code=413, detail=f"Too many files (max {BATCH_MAX_FILES})")
+    # Check declared sizes before decompressing anything
+    if sum(info.file_size for info in members) > BATCH_MAX_BYTES:
+        raise HTTPException(status_code=413, detail=f"Batch too large (max {BATCH_MAX_BYTES} bytes)")
+    return [(info.filename, archive.read(info)) for info in members]
+
+
+@app.post("/api/predict/batch")
+async def predict_genre_batch(
+    audio_files: List[UploadFile] = File([]),
+    archive: Optional[UploadFile] = File(None),
+    top_k: int = Form(3, ge=1, le=BATCH_MAX_TOP_K)
+):
+    """
+    Predict genres for many files in one request.
+    
+    Accepts several ``audio_files`` and/or one zip ``archive``. Extraction
+    fans out across the inference workers; finished files are classified
+    together in batched calls. Results stream back as newline-delimited
+    JSON, one line per file (``result`` or ``error``) in completion order,
+    followed by a ``done`` summary line.
+    """
+    files = []
+    total_bytes = 0
+    for upload in audio_files or []:
+        if len(files) >= BATCH_MAX_FILES:
+            raise HTTPException(status_code=413, detail=f"Too many files (max {BATCH_MAX_FILES})")
+        content = await _read_upload(upload)
+        total_bytes += len(content)
+        if total_bytes > BATCH_MAX_BYTES:
+            raise HTTPException(status_code=413, detail=f"Batch too large (max {BATCH_MAX_BYTES} bytes)")
+        is_audio = (upload.content_type or "").startswith('audio/')
+        files.append((upload.filename, content if is_audio else None))
+    
+    if archive is not None:
+        content = await _read_upload(archive)
+        if total_bytes + len(content) > BATCH_MAX_BYTES:
+            raise HTTPException(status_code=413, detail=f"Batch too large (max {BATCH_MAX_BYTES} bytes)")
+        members = _read_archive(content)
+        if len(files) + len(members) > BATCH_MAX_FILES:
+            raise HTTPException(status_code=413, detail=f"Too many files (max {BATCH_MAX_FILES})")
+        files.extend(members)
+    
+    if not files:
+        raise HTTPException(status_code=400, detail="Please provide audio files or a zip archive")
+    
+    start = time.perf_counter()
+    # Bound this request's share of the executor so other requests still get slots
+    slots = asyncio.Semaphore(BATCH_MAX_IN_FLIGHT)
+    
+    async def extract(index, name, content):
+        if content is None:
+            return index, name, None, "Invalid file type. Please upload an audio file."
+        async with slots:
+            try:
+                # Wait for a free slot rather than failing the file
+                features = await _extract(_extract_features_strict, content, wait=True)
+                return index, name, features, None
+            except Exception as e:
+                return index, name, None, f"Could not extract features: {str(e) or type(e).__name__}"
+    
+    async def results():
+        succeeded = failed = 0
+        ready = []
+        
+        async def classify(chunk):
+            predictions = await _timed(
+                "predict", _predict_batch, np.vstack([features for _, _, features in chunk])
+            )
+            lines = []
+            for (index, name, features), prediction in zip(chunk, predictions):
+                recommendations = await _timed(
+                    "recommend", _recommend, features, prediction["genre"], top_k
+                )
+                lines.append(json.dumps({
+                    "type": "result",
+                    "index": index,
+                    "filename": name,
+                    "prediction": prediction,
+                    "recommendations": recommendations
+                }) + "\n")
+            return lines
+        
+        tasks = [asyncio.ensure_future(extract(i, name, content)) for i, (name, content) in enumerate(files)]
+        try:
+            for done in asyncio.as_completed(tasks):
+                index, name, features, error = await done
+                if error is not None:
+                    failed += 1
+                    yield json.dumps({"type": "error", "index": index, "filename": name, "detail": error}) + "\n"
+                    continue
+                ready.append((index, name, features))
+                if len(ready) >= BATCH_CLASSIFY_SIZE:
+                    for line in await classify(ready):
+                        yield line
+                    succeeded += len(ready)
+                    ready = []
+            if ready:
+                for line in await classify(ready):
+                    yield line
+                succeeded += len(ready)
+        except Exception as e:
+            yield json.dumps({"type": "error", "detail": str(e)}) + "\n"
+        finally:
+            for task in tasks:
+                task.cancel()
+        
+        elapsed = time.perf_counter() - start
+        yield json.dumps({
+            "type": "done",
+            "files": len(files),
+            "succeeded": succeeded,
+            "failed": failed,
+            "total_ms": round(elapsed * 1000, 1),
+            "files_per_sec": round(len(files) / elapsed, 2) if elapsed > 0 else None
+        }) + "\n"
+    
+    return StreamingResponse(results(), media_type="application/x-ndjson")
+
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(app, host="0.0.0.0", port=8000)
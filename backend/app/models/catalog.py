@@ -0,0 +1,411 @@
+"""
+Song Catalog Store
+Columnar song metadata and feature matrix that can be memory-mapped from disk.
+"""
+import hashlib
+import json
+import os
+import numpy as np
+from typing import List, Dict, Any, Optional, Tuple
+
+from .embedding import FeatureEmbedding
+from .index import normalize_rows, quantize_rows
+
+
+class SongCatalog:
+    """
+    Song metadata plus a normalized feature matrix.
+
+    Rows are grouped by genre so each genre is a contiguous row range.
+    The matrix holds raw feature vectors, or their projection into a
+    ``FeatureEmbedding`` space (``space`` names which), stored as float32
+    or compactly as float16/int8 (see ``quantize_rows``).
+    String columns are stored Arrow-style as one UTF-8 byte buffer plus an
+    int64 offsets array; genre is dictionary-encoded.
+
+    On disk a catalog is a directory of ``.npy`` files and a
+    ``manifest.json``. ``SongCatalog.open`` maps every array with
+    ``np.load(mmap_mode='r')``, so opening is O(1) in catalog size and all
+    processes that open the same directory share the page cache instead of
+    holding private copies. A trained similarity index (e.g. IVF centroids
+    and inverted lists) can be saved alongside and is mapped the same way
+    (``saved_index``), so opening never retrains it. IDs are looked up by
+    binary search in a saved, sorted copy of the id column, so finding a
+    song does not decode the whole column either.
+    """
+
+    STRING_COLUMNS = ("id", "title", "artist", "duration")
+    FORMAT_VERSION = 1
+
+    def __init__(
+        self,
+        features: np.ndarray,
+        columns: Dict[str, Tuple[np.ndarray, np.ndarray]],
+        genre_codes: np.ndarray,
+        genres: List[str],
+        version: str,
+        scales: Optional[np.ndarray] = None,
+        space: str = "raw",
+        saved_index: Optional[Dict[str, Any]] = None,
+        id_index: Optional[Tuple[np.ndarray, np.ndarray]] = None
+    ):
+        """
+        Wrap already-built catalog arrays (use from_records or open instead).
+
+        Args:
+            features: Normalized feature matrix, grouped by genre
+            columns: String column name -> (offsets, utf-8 bytes)
+            genre_codes: Genre index per row
+            genres: Genre names in row order
+            version: Content hash identifying this catalog snapshot
+            scales: Per-row scales of an int8 feature matrix
+            space: "raw" or the ``FeatureEmbedding.space`` of the rows
+            saved_index: ``state()`` of an index built over these rows
+            id_index: (sorted fixed-width ids, their rows), built on first
+                use if not given
+        """
+        self.features = features
+        self.scales = scales
+        self.space = space
+        self.saved_index = saved_index
+        self.genres = list(genres)
+        self.version = version
+        self._columns = columns
+        self._genre_codes = genre_codes
+        self._id_index = id_index
+
+        # Rows are grouped by genre, so each genre is one (start, stop) range
+        counts = np.bincount(genre_codes, minlength=len(self.genres))
+        bounds = np.concatenate(([0], np.cumsum(counts)))
+        self.genre_offsets = {
+            genre: (int(bounds[i]), int(bounds[i + 1]))
+            for i, genre in enumerate(self.genres)
+        }
+
+    def __len__(self) -> int:
+        return self.features.shape[0]
+
+    @property
+    def dim(self) -> int:
+        return self.features.shape[1]
+
+    @property
+    def dtype(self) -> str:
+        return self.features.dtype.name
+
+    @classmethod
+    def from_records(
+        cls,
+        songs: List[Dict[str, Any]],
+        features: np.ndarray,
+        embedding: Optional[FeatureEmbedding] = None,
+        dtype: str = "float32"
+    ) -> "SongCatalog":
+        """
+        Build an in-memory catalog.
+
+        Args:
+            songs: Song metadata records (id, title, artist, genre, duration)
+            features: Raw feature vectors aligned with ``songs``
+            embedding: ``FeatureEmbedding`` to store the rows in, or None
+                for raw features
+            dtype: Storage type of the rows (one of ``VECTOR_DTYPES``)
+
+        Returns:
+            Catalog with rows grouped by genre in order of first appearance
+        """
+        genres: List[str] = []
+        genre_index: Dict[str, int] = {}
+        for song in songs:
+            if song["genre"] not in genre_index:
+                genre_index[song["genre"]] = len(genres)
+                genres.append(song["genre"])
+
+        codes = np.array([genre_index[song["genre"]] for song in songs], dtype=np.int32)
+        order = np.argsort(codes, kind="stable")
+        ordered = [songs[i] for i in order]
+
+        columns = {
+            name: _encode_strings([str(song.get(name, "")) for song in ordered])
+            for name in cls.STRING_COLUMNS
+        }
+        matrix = np.asarray(features, dtype=np.float32)[order]
+        if embedding is not None:
+            matrix = embedding.transform(matrix).reshape(len(order), embedding.dim)
+        matrix, scales = quantize_rows(normalize_rows(matrix), dtype)
+        space = embedding.space if embedding is not None else "raw"
+        genre_codes = codes[order].astype(_code_dtype(len(genres)))
+        version = _content_version(matrix, columns, genre_codes, genres, scales, space)
+        return cls(matrix, columns, genre_codes, genres, version, scales, space)
+
+    @classmethod
+    def open(cls, path: str, mmap: bool = True) -> "SongCatalog":
+        """
+        Open a catalog directory written by ``save``.
+
+        Args:
+            path: Catalog directory
+            mmap: Map arrays read-only instead of reading them into memory
+
+        Returns:
+            The catalog
+        """
+        with open(os.path.join(path, "manifest.json")) as f:
+            manifest = json.load(f)
+        if manifest.get("format_version") != cls.FORMAT_VERSION:
+            raise ValueError(f"Unsupported catalog format: {manifest.get('format_version')}")
+
+        mode = "r" if mmap else None
+
+        def load(name):
+            return np.load(os.path.join(path, f"{name}.npy"), mmap_mode=mode, allow_pickle=False)
+
+        columns = {
+            name: (load(f"{name}.offsets"), load(f"{name}.data"))
+            for name in manifest["columns"]
+        }
+        saved_index = manifest.get("index")
+        if saved_index is not None:
+            saved_index = {
+                "kind": saved_index["kind"],
+                "params": saved_index["params"],
+                "arrays": {name: load(f"index.{name}") for name in saved_index["arrays"]},
+            }
+        id_index = (load("id.sorted"), load("id.sorted_rows")) if manifest.get("id_index") else None
+        return cls(
+            load("features"), columns, load("genre_codes"), manifest["genres"], manifest["version"],
+            load("scales") if manifest.get("scaled") else None,
+            manifest.get("space", "raw"),
+            saved_index,
+            id_index
+        )
+
+    def save(self, path: str, index=None):
+        """
+        Write the catalog to a directory.
+
+        Each file is written under a temporary name and renamed into place,
+        so processes that already mapped the previous files keep reading a
+        consistent (old) copy rather than a half-written one.
+
+        Args:
+            path: Target directory (created if missing)
+            index: Similarity index built over this catalog's rows; its
+                trained arrays are saved too if it has any (see ``IVFIndex.state``)
+        """
+        os.makedirs(path, exist_ok=True)
+        arrays = {"features": self.features, "genre_codes": self._genre_codes}
+        if self.scales is not None:
+            arrays["scales"] = self.scales
+        for name, (offsets, data) in self._columns.items():
+            arrays[f"{name}.offsets"] = offsets
+            arrays[f"{name}.data"] = data
+        arrays["id.sorted"], arrays["id.sorted_rows"] = self._ids()
+        state = index.state() if hasattr(index, "state") else None
+        if state is not None:
+            for name, array in state["arrays"].items():
+                arrays[f"index.{name}"] = array
+
+        for name, array in arrays.items():
+            _atomic_save(os.path.join(path, f"{name}.npy"), np.ascontiguousarray(array))
+
+        manifest = {
+            "format_version": self.FORMAT_VERSION,
+            "version": self.version,
+            "n_songs": len(self),
+            "dim": self.dim,
+            "space": self.space,
+            "dtype": self.dtype,
+            "scaled": self.scales is not None,
+            "genres": self.genres,
+            "columns": list(self._columns),
+            "id_index": True,
+        }
+        if state is not None:
+            manifest["index"] = {
+                "kind": state["kind"],
+                "params": state["params"],
+                "arrays": list(state["arrays"]),
+            }
+        tmp_path = os.path.join(path, "manifest.json.tmp")
+        with open(tmp_path, "w") as f:
+            json.dump(manifest, f, indent=2)
+        os.replace(tmp_path, os.path.join(path, "manifest.json"))
+
+    @classmethod
+    def merge(cls, parts: List[Tuple["SongCatalog", Optional[np.ndarray]]]) -> "SongCatalog":
+        """
+        Concatenate catalogs into one, optionally dropping rows.
+
+        Rows stay grouped by genre; within a genre, rows keep their order
+        across ``parts``. Columns are gathered with vectorized byte copies,
+        so nothing is decoded to Python strings. All parts must share one
+        retrieval space and storage type.
+
+        Args:
+            parts: (catalog, keep mask or None for all rows) pairs
+
+        Returns:
+            New in-memory catalog
+        """
+        layouts = {(catalog.space, catalog.dtype) for catalog, _ in parts}
+        if len(layouts) > 1:
+            raise ValueError(f"Cannot merge catalogs stored in different spaces or types: {sorted(layouts)}")
+        space, dtype = layouts.pop() if layouts else ("raw", "float32")
+
+        genres: List[str] = []
+        for catalog, _ in parts:
+            genres.extend(g for g in catalog.genres if g not in genres)
+
+        # (part index, row indices) pieces in final row order
+        pieces, genre_codes = [], []
+        for code, genre in enumerate(genres):
+            for part, (catalog, keep) in enumerate(parts):
+                if genre not in catalog.genre_offsets:
+                    continue
+                start, stop = catalog.genre_offsets[genre]
+                rows = np.arange(start, stop)
+                if keep is not None:
+                    rows = rows[keep[start:stop]]
+                if len(rows):
+                    pieces.append((part, rows))
+                    genre_codes.append(np.full(len(rows), code))
+
+        dim = parts[0][0].dim if parts else 0
+        scaled = dtype == "int8"
+        if pieces:
+            features = np.concatenate([parts[p][0].features[rows] for p, rows in pieces])
+            scales = np.concatenate([parts[p][0].scales[rows] for p, rows in pieces]) if scaled else None
+            genre_codes = np.concatenate(genre_codes)
+        else:
+            features = np.zeros((0, dim), dtype=dtype)
+            scales = np.zeros(0, dtype=np.float32) if scaled else None
+            genre_codes = np.zeros(0, dtype=np.int64)
+        features = np.ascontiguousarray(features, dtype=dtype)
+
+        columns = {}
+        for name in cls.STRING_COLUMNS:
+            offsets_list, data_list = [], []
+            for p, rows in pieces:
+                offsets, data = parts[p][0]._columns[name]
+                piece_offsets, piece_data = _take_strings(offsets, data, rows)
+                offsets_list.append(piece_offsets)
+                data_list.append(piece_data)
+            columns[name] = _concat_strings(offsets_list, data_list)
+
+        genre_codes = genre_codes.astype(_code_dtype(len(genres)))
+        version = _content_version(features, columns, genre_codes, genres, scales, space)
+        return cls(features, columns, genre_codes, genres, version, scales, space)
+
+    def _ids(self) -> Tuple[np.ndarray, np.ndarray]:
+        """(sorted fixed-width ids, row of each), built on first use and then cached."""
+        if self._id_index is None:
+            self._id_index = _sort_strings(*self._columns["id"])
+        return self._id_index
+
+    def row_of(self, song_id: str) -> Optional[int]:
+        """
+        Row index of a song ID, or None if absent.
+
+        Binary search in the sorted id column, which a saved catalog maps
+        from disk, so a lookup touches O(log n) ids.
+        """
+        ids, rows = self._ids()
+        key = song_id.encode("utf-8")
+        if not len(ids) or len(key) > ids.dtype.itemsize:
+            return None
+        pos = int(np.searchsorted(ids, key))
+        if pos < len(ids) and ids[pos] == key:
+            return int(rows[pos])
+        return None
+
+    def song(self, row: int) -> Dict[str, Any]:
+        """
+        Decode the metadata record of one row.
+
+        Args:
+            row: Row index
+
+        Returns:
+            Song dict with id, title, artist, genre and duration
+        """
+        record = {
+            name: bytes(data[offsets[row]:offsets[row + 1]]).decode("utf-8")
+            for name, (offsets, data) in self._columns.items()
+        }
+        record["genre"] = self.genres[int(self._genre_codes[row])]
+        return record
+
+
+def _encode_strings(values: List[str]) -> Tuple[np.ndarray, np.ndarray]:
+    """Encode strings as (int64 offsets, uint8 utf-8 buffer)."""
+    encoded = [value.encode("utf-8") for value in values]
+    offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+    offsets[1:] = np.cumsum([len(value) for value in encoded])
+    data = np.frombuffer(b"".join(encoded), dtype=np.uint8)
+    return offsets, data
+
+
+def _take_strings(offsets: np.ndarray, data: np.ndarray, rows: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Gather the strings at ``rows`` from an (offsets, buffer) column."""
+    starts = np.asarray(offsets[rows], dtype=np.int64)
+    lengths = np.asarray(offsets[rows + 1], dtype=np.int64) - starts
+    new_offsets = np.zeros(len(rows) + 1, dtype=np.int64)
+    new_offsets[1:] = np.cumsum(lengths)
+    # Source byte index for every output byte
+    source = np.repeat(starts - new_offsets[:-1], lengths) + np.arange(new_offsets[-1])
+    return new_offsets, np.asarray(data)[source]
+
+
+def _sort_strings(offsets: np.ndarray, data: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Sort an (offsets, buffer) column into (fixed-width bytes array, original rows)."""
+    offsets = np.asarray(offsets, dtype=np.int64)
+    lengths = np.diff(offsets)
+    width = max(int(lengths.max()) if len(lengths) else 0, 1)
+    # Scatter every string into its own zero-padded row of ``width`` bytes
+    padded = np.zeros((len(lengths), width), dtype=np.uint8)
+    row_of_byte = np.repeat(np.arange(len(lengths)), lengths)
+    padded[row_of_byte, np.arange(offsets[-1]) - offsets[row_of_byte]] = np.asarray(data)[:offsets[-1]]
+    strings = padded.view(f"S{width}").ravel()
+    order = np.argsort(strings, kind="stable")
+    return strings[order], order.astype(np.int64)
+
+
+def _concat_strings(offsets_list, data_list) -> Tuple[np.ndarray, np.ndarray]:
+    """Concatenate several (offsets, buffer) columns."""
+    if not offsets_list:
+        return np.zeros(1, dtype=np.int64), np.zeros(0, dtype=np.uint8)
+    shifts = np.cumsum([0] + [offsets[-1] for offsets in offsets_list[:-1]])
+    offsets = np.concatenate(
+        [[0]] + [offsets[1:] + shift for offsets, shift in zip(offsets_list, shifts)]
+    ).astype(np.int64)
+    return offsets, np.concatenate(data_list).astype(np.uint8)
+
+
+def _code_dtype(n_genres: int):
+    return np.uint8 if n_genres <= np.iinfo(np.uint8).max else np.int32
+
+
+def _content_version(features, columns, genre_codes, genres, scales=None, space="raw") -> str:
+    """Short content hash used to tell catalog snapshots apart."""
+    digest = hashlib.sha256()
+    digest.update(np.ascontiguousarray(features).tobytes())
+    if scales is not None:
+        digest.update(np.ascontiguousarray(scales).tobytes())
+    if space != "raw":
+        digest.update(space.encode())
+    for name in sorted(columns):
+        offsets, data = columns[name]
+        digest.update(name.encode())
+        digest.update(np.ascontiguousarray(offsets).tobytes())
+        digest.update(np.ascontiguousarray(data).tobytes())
+    digest.update(np.ascontiguousarray(genre_codes).tobytes())
+    digest.update("|".join(genres).encode())
+    return digest.hexdigest()[:16]
+
+
+def _atomic_save(path: str, array: np.ndarray):
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "wb") as f:
+        np.save(f, array, allow_pickle=False)
+    os.replace(tmp_path, path)
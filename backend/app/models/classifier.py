@@ -2,16 +2,35 @@
 Genre Classification Model
 Predicts music genre from extracted audio features.
 """
+import hashlib
+import threading
+import zlib
 import numpy as np
-from typing import Dict, Any
+from typing import Callable, Dict, Any, Iterable, Iterator, List, Optional, Tuple
 import os
 
-try:
-    import joblib
-    from sklearn.preprocessing import StandardScaler
-    from sklearn.neural_network import MLPClassifier
-except ImportError:
-    joblib = None
+from .compiled import CompiledMLP
+
+# joblib/sklearn are imported on first use (see _load_sklearn); compiled
+# .npz models never need them
+joblib = None
+StandardScaler = None
+MLPClassifier = None
+_sklearn_missing = False
+
+
+def _load_sklearn():
+    """Import joblib and sklearn on first use; returns joblib or None."""
+    global joblib, StandardScaler, MLPClassifier, _sklearn_missing
+    if joblib is None and not _sklearn_missing:
+        try:
+            import joblib as joblib_module
+            from sklearn.preprocessing import StandardScaler
+            from sklearn.neural_network import MLPClassifier
+            joblib = joblib_module
+        except ImportError:
+            _sklearn_missing = True
+    return joblib
 
 
 class GenreClassifier:
@@ -25,36 +44,121 @@ class GenreClassifier:
         'electronic', 'blues', 'country', 'metal', 'reggae'
     ]
     
-    def __init__(self, model_path: str = None):
+    def __init__(self, model_path: str = None, lazy: bool = False):
         """
         Initialize the classifier.
         
         Args:
-            model_path: Path to trained model file (optional)
+            model_path: Path to trained model file (optional); a ``.joblib``
+                sklearn bundle, a ``.npz`` compiled kernel or a compiled
+                kernel directory (memory-mapped)
+            lazy: Defer loading the model (and importing sklearn) until the
+                first prediction or an explicit ``load()``
         """
         self.model = None
         self.scaler = None
+        self.model_path = model_path
+        # Identifies the loaded weights; changes only once a new model has loaded
+        self.version = "demo"
+        self._file_stamp: Optional[Tuple[int, int]] = None
+        # Stamp of a file that failed to load, so it is not retried until replaced
+        self._failed_stamp: Optional[Tuple[int, int]] = None
+        self._loaded = False
+        self._load_lock = threading.Lock()
+        # Predictions served by the mock fallback instead of the model
+        self.mock_fallbacks = 0
         
-        if model_path and os.path.exists(model_path):
-            self._load_model(model_path)
-        else:
-            # Initialize with a simple model for demo
-            self._init_demo_model()
+        if not lazy:
+            self.load()
     
-    def _load_model(self, model_path: str):
-        """Load trained model and scaler from disk."""
-        if joblib is None:
-            return
+    @property
+    def loaded(self) -> bool:
+        """Whether the model has been loaded."""
+        return self._loaded
+    
+    def load(self):
+        """Load the model now; does nothing if it is already loaded."""
+        with self._load_lock:
+            if self._loaded:
+                return
+            if self.model_path and os.path.exists(self.model_path):
+                self._load_model(self.model_path)
+            else:
+                # Initialize with a simple model for demo
+                self._init_demo_model()
+            self._loaded = True
+    
+    def reload_if_changed(self, before_swap: Optional[Callable[[], None]] = None) -> bool:
+        """
+        Reload the model if its file was modified since it was loaded.
+        
+        An unchanged file costs one ``stat``; a changed one is loaded and
+        hashed, so call this off the event loop (e.g. from a periodic
+        background task).
+        
+        Args:
+            before_swap: Called once the new model has loaded, just before
+                it and its version replace the current ones (e.g. to recycle
+                worker processes holding their own copy)
+            
+        Returns:
+            True if a new model was loaded
+        """
+        if not self.model_path:
+            return False
+        try:
+            stamp = _file_stamp(self.model_path)
+        except OSError:
+            return False
+        if stamp in (self._file_stamp, self._failed_stamp):
+            return False
+        with self._load_lock:
+            if stamp == self._file_stamp:
+                return False
+            loaded = self._load_model(self.model_path, before_swap)
+            self._loaded = True
+        return loaded
+    
+    def _load_model(self, model_path: str, before_swap: Optional[Callable[[], None]] = None) -> bool:
+        """
+        Load trained model and scaler from disk.
+        
+        The version only changes after a successful load; on failure the
+        previous model (or the mock fallback) keeps its own version.
+        
+        Returns:
+            True if the model was loaded
+        """
+        try:
+            stamp, version = _file_version(model_path)
+        except OSError as e:
+            print(f"Could not load model: {e}")
+            return False
         try:
-            data = joblib.load(model_path)
-            self.model = data['model']
-            self.scaler = data['scaler']
+            if model_path.endswith('.npz') or os.path.isdir(model_path):
+                # Compiled NumPy kernel; the scaler is folded into its first layer.
+                # Directories are memory-mapped so worker processes share them.
+                model, scaler = CompiledMLP.load(model_path, mmap=True), None
+            elif _load_sklearn() is None:
+                raise ImportError("scikit-learn is not installed")
+            else:
+                data = joblib.load(model_path)
+                model, scaler = data['model'], data['scaler']
         except Exception as e:
             print(f"Could not load model: {e}")
+            self._failed_stamp = stamp
+            return False
+        
+        if before_swap is not None:
+            before_swap()
+        # Swap model, scaler and version together so concurrent predictions never mix them
+        self.model, self.scaler = model, scaler
+        self._file_stamp, self.version = stamp, version
+        return True
     
     def _init_demo_model(self):
         """Initialize a demo model for when no trained model exists."""
-        if joblib is None:
+        if _load_sklearn() is None:
             return
         # Create a simple pre-configured model
         self.scaler = StandardScaler()
@@ -75,32 +179,75 @@ class GenreClassifier:
         Returns:
             Dictionary with genre, confidence, and probabilities
         """
+        return self.predict_batch(features.reshape(1, -1))[0]
+    
+    def predict_batch(self, features_matrix: np.ndarray) -> List[Dict[str, Any]]:
+        """
+        Predict genres for many feature vectors in one forward pass.
+        
+        Args:
+            features_matrix: Feature vectors, one per row (n x 58)
+            
+        Returns:
+            One prediction dictionary per row
+        """
+        if not self._loaded:
+            self.load()
+        features_matrix = np.atleast_2d(features_matrix)
         if self.model is None or not hasattr(self.model, 'predict_proba'):
-            return self._get_mock_prediction(features)
+            return [self._get_mock_prediction(row) for row in features_matrix]
         
         try:
-            # Scale features
-            features_scaled = self.scaler.transform(features.reshape(1, -1))
+            # Scale features (compiled models have the scaler folded in)
+            if self.scaler is not None:
+                features_scaled = self.scaler.transform(features_matrix)
+            else:
+                features_scaled = features_matrix
             
             # Get probabilities
-            probabilities = self.model.predict_proba(features_scaled)[0]
+            probabilities = self.model.predict_proba(features_scaled)
             
-            # Find top prediction
-            top_idx = np.argmax(probabilities)
-            predicted_genre = self.GENRES[top_idx]
-            confidence = float(probabilities[top_idx])
-            
-            return {
-                "genre": predicted_genre,
-                "confidence": confidence,
-                "probabilities": {
-                    genre: float(prob) 
-                    for genre, prob in zip(self.GENRES, probabilities)
-                }
-            }
+            return [self._format_prediction(row) for row in probabilities]
         except Exception as e:
             print(f"Prediction error: {e}")
-            return self._get_mock_prediction(features)
+            return [self._get_mock_prediction(row) for row in features_matrix]
+    
+    def predict_timeline(
+        self,
+        segments: Iterable[Tuple[float, float, np.ndarray, np.ndarray]]
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Per-segment genre predictions for a streamed track.
+        
+        Args:
+            segments: Output of ``AudioFeatureExtractor.iter_stream``
+            
+        Yields:
+            Dictionaries with segment ``start``/``end`` (seconds), the
+            segment's genre prediction, and ``overall``: the prediction
+            for the whole track up to the end of this segment
+        """
+        for start, end, window_features, running_features in segments:
+            segment, overall = self.predict_batch(
+                np.vstack([window_features, running_features])
+            )
+            yield {"start": start, "end": end, **segment, "overall": overall}
+    
+    def _format_prediction(self, probabilities: np.ndarray) -> Dict[str, Any]:
+        """Build the response dictionary from one row of class probabilities."""
+        # Find top prediction
+        top_idx = np.argmax(probabilities)
+        predicted_genre = self.GENRES[top_idx]
+        confidence = float(probabilities[top_idx])
+        
+        return {
+            "genre": predicted_genre,
+            "confidence": confidence,
+            "probabilities": {
+                genre: float(prob) 
+                for genre, prob in zip(self.GENRES, probabilities)
+            }
+        }
     
     def predict_for_genre(self, genre: str) -> Dict[str, Any]:
         """
@@ -112,16 +259,18 @@ class GenreClassifier:
         Returns:
             Dictionary with genre, confidence, and probabilities
         """
-        np.random.seed(hash(genre) % 2**32)
+        # A local generator keeps concurrent calls from sharing RNG state, and
+        # crc32 (unlike hash()) gives the same result in every process
+        rng = np.random.default_rng(zlib.crc32(genre.encode("utf-8")))
         
         # Generate realistic probability distribution
-        probabilities = np.random.dirichlet(np.ones(10) * 0.5)
+        probabilities = rng.dirichlet(np.ones(10) * 0.5)
         
         # Set the known genre as highest probability
         genre_idx = self.GENRES.index(genre) if genre in self.GENRES else 0
         
         # Boost the correct genre's probability
-        probabilities[genre_idx] = 0.65 + np.random.random() * 0.25
+        probabilities[genre_idx] = 0.65 + rng.random() * 0.25
         
         # Renormalize other probabilities
         remaining = 1 - probabilities[genre_idx]
@@ -141,12 +290,38 @@ class GenreClassifier:
     
     def _get_mock_prediction(self, features: np.ndarray) -> Dict[str, Any]:
         """Generate a mock prediction based on feature hash."""
+        self.mock_fallbacks += 1
         # Use features to generate deterministic but varied predictions
         seed = int(abs(np.sum(features) * 1000)) % 2**32
-        np.random.seed(seed)
+        rng = np.random.default_rng(seed)
         
         # Pick a random genre with realistic distribution
-        genre_idx = np.random.randint(0, len(self.GENRES))
+        genre_idx = int(rng.integers(0, len(self.GENRES)))
         predicted_genre = self.GENRES[genre_idx]
         
         return self.predict_for_genre(predicted_genre)
+
+
+def _file_stamp(path: str) -> Tuple[int, int]:
+    """(mtime_ns, size) of a file, used to detect replacement."""
+    if os.path.isdir(path):
+        # Model directories are committed by rewriting their manifest last
+        path = os.path.join(path, 'manifest.json')
+    stat = os.stat(path)
+    return stat.st_mtime_ns, stat.st_size
+
+
+def _file_version(path: str) -> Tuple[Tuple[int, int], str]:
+    """File stamp and short content hash of a model file."""
+    stamp = _file_stamp(path)
+    digest = hashlib.sha256()
+    files = [path]
+    if os.path.isdir(path):
+        files = [
+            os.path.join(path, name) for name in sorted(os.listdir(path))
+            if name.endswith(('.npy', '.json'))
+        ]
+    for name in files:
+        with open(name, 'rb') as f:
+            digest.update(f.read())
+    return stamp, digest.hexdigest()[:16]
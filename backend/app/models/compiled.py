@@ -0,0 +1,205 @@
+"""
+Compiled MLP Inference
+NumPy-only forward pass for a trained scikit-learn MLPClassifier.
+"""
+import json
+import os
+import numpy as np
+from typing import List, Optional
+
+
+class CompiledMLP:
+    """
+    Flat float32 inference kernel for an ``MLPClassifier``.
+
+    The ``StandardScaler`` is folded into the first layer
+    (``W' = W / scale``, ``b' = b - (mean / scale) @ W``), so inference is
+    just ``len(layers)`` matmuls with ReLU in between and a softmax (or
+    logistic) output. No sklearn validation or dispatch runs per call and
+    nothing but NumPy is imported.
+
+    Weights can be stored int8-quantized (symmetric, per output unit);
+    they are dequantized to float32 once at load time, so quantization
+    shrinks the exported file while the runtime cost stays the same.
+
+    ``save_dir`` writes float32 ``.npy`` files instead, which ``load`` can
+    memory-map read-only so several server processes share one copy of
+    the weights.
+    """
+
+    def __init__(
+        self,
+        weights: List[np.ndarray],
+        biases: List[np.ndarray],
+        out_activation: str = "softmax",
+        classes: Optional[np.ndarray] = None
+    ):
+        """
+        Wrap already-folded layer parameters (use from_sklearn or load).
+
+        Args:
+            weights: Per-layer weight matrices (n_in x n_out)
+            biases: Per-layer bias vectors
+            out_activation: "softmax" or "logistic"
+            classes: Class labels in output column order
+        """
+        self.weights = [np.ascontiguousarray(w, dtype=np.float32) for w in weights]
+        self.biases = [np.ascontiguousarray(b, dtype=np.float32) for b in biases]
+        self.out_activation = out_activation
+        self.classes_ = classes
+
+    @classmethod
+    def from_sklearn(cls, model, scaler=None) -> "CompiledMLP":
+        """
+        Compile a fitted MLPClassifier (ReLU hidden layers) and its scaler.
+
+        Args:
+            model: Fitted ``MLPClassifier``
+            scaler: Fitted ``StandardScaler`` applied before the model, or None
+
+        Returns:
+            Equivalent compiled model
+        """
+        if model.activation != "relu":
+            raise ValueError(f"Only ReLU hidden layers are supported, got '{model.activation}'")
+
+        weights = [np.asarray(w, dtype=np.float64) for w in model.coefs_]
+        biases = [np.asarray(b, dtype=np.float64) for b in model.intercepts_]
+
+        if scaler is not None:
+            mean = getattr(scaler, "mean_", None)
+            scale = getattr(scaler, "scale_", None)
+            mean = np.zeros(weights[0].shape[0]) if mean is None else mean
+            scale = np.ones(weights[0].shape[0]) if scale is None else scale
+            biases[0] = biases[0] - (mean / scale) @ weights[0]
+            weights[0] = weights[0] / scale[:, None]
+
+        return cls(weights, biases, model.out_activation_, getattr(model, "classes_", None))
+
+    def predict_proba(self, X: np.ndarray) -> np.ndarray:
+        """
+        Class probabilities for raw (unscaled) feature rows.
+
+        Args:
+            X: Feature matrix (n x n_features)
+
+        Returns:
+            Probability matrix (n x n_classes)
+        """
+        h = np.asarray(X, dtype=np.float32)
+        last = len(self.weights) - 1
+        for i, (w, b) in enumerate(zip(self.weights, self.biases)):
+            h = h @ w
+            h += b
+            if i < last:
+                np.maximum(h, 0, out=h)
+
+        if self.out_activation == "softmax":
+            h -= h.max(axis=1, keepdims=True)
+            np.exp(h, out=h)
+            h /= h.sum(axis=1, keepdims=True)
+            return h
+        p = 1.0 / (1.0 + np.exp(-h))
+        return np.hstack([1 - p, p])
+
+    def save(self, path: str, quantize: bool = False):
+        """
+        Write the kernel to an ``.npz`` file.
+
+        Args:
+            path: Output file
+            quantize: Store weights as int8 with per-column float32 scales
+        """
+        arrays = {
+            "n_layers": np.array(len(self.weights)),
+            "out_activation": np.array(self.out_activation),
+            "quantized": np.array(quantize),
+        }
+        if self.classes_ is not None:
+            arrays["classes"] = np.asarray(self.classes_)
+        for i, (w, b) in enumerate(zip(self.weights, self.biases)):
+            arrays[f"b{i}"] = b
+            if quantize:
+                scale = np.abs(w).max(axis=0) / 127.0
+                scale[scale == 0] = 1.0
+                arrays[f"W{i}"] = np.round(w / scale).astype(np.int8)
+                arrays[f"s{i}"] = scale.astype(np.float32)
+            else:
+                arrays[f"W{i}"] = w
+        np.savez(path, **arrays)
+
+    def save_dir(self, path: str):
+        """
+        Write the kernel as a directory of float32 ``.npy`` files.
+
+        Files are written under temporary names and renamed into place, with
+        the manifest last, so readers never map a half-written model.
+
+        Args:
+            path: Target directory (created if missing)
+        """
+        os.makedirs(path, exist_ok=True)
+        arrays = {}
+        for i, (w, b) in enumerate(zip(self.weights, self.biases)):
+            arrays[f"W{i}"] = w
+            arrays[f"b{i}"] = b
+        if self.classes_ is not None:
+            arrays["classes"] = np.asarray(self.classes_)
+        for name, array in arrays.items():
+            tmp_path = os.path.join(path, f"{name}.npy.tmp")
+            with open(tmp_path, "wb") as f:
+                np.save(f, np.ascontiguousarray(array), allow_pickle=False)
+            os.replace(tmp_path, os.path.join(path, f"{name}.npy"))
+
+        manifest = {
+            "n_layers": len(self.weights),
+            "out_activation": self.out_activation,
+            "has_classes": self.classes_ is not None,
+        }
+        tmp_path = os.path.join(path, "manifest.json.tmp")
+        with open(tmp_path, "w") as f:
+            json.dump(manifest, f, indent=2)
+        os.replace(tmp_path, os.path.join(path, "manifest.json"))
+
+    @classmethod
+    def load(cls, path: str, mmap: bool = False) -> "CompiledMLP":
+        """
+        Load a kernel written by ``save`` or ``save_dir``.
+
+        Args:
+            path: ``.npz`` file or ``save_dir`` directory
+            mmap: Map a directory's arrays read-only instead of reading
+                them into memory (ignored for ``.npz`` files)
+
+        Returns:
+            The compiled model
+        """
+        if os.path.isdir(path):
+            with open(os.path.join(path, "manifest.json")) as f:
+                manifest = json.load(f)
+            mode = "r" if mmap else None
+
+            def load(name):
+                return np.load(os.path.join(path, f"{name}.npy"), mmap_mode=mode, allow_pickle=False)
+
+            n_layers = manifest["n_layers"]
+            classes = load("classes") if manifest["has_classes"] else None
+            return cls(
+                [load(f"W{i}") for i in range(n_layers)],
+                [load(f"b{i}") for i in range(n_layers)],
+                manifest["out_activation"],
+                classes
+            )
+
+        with np.load(path, allow_pickle=False) as data:
+            n_layers = int(data["n_layers"])
+            quantized = bool(data["quantized"])
+            weights, biases = [], []
+            for i in range(n_layers):
+                w = data[f"W{i}"]
+                if quantized:
+                    w = w.astype(np.float32) * data[f"s{i}"]
+                weights.append(w)
+                biases.append(data[f"b{i}"])
+            classes = data["classes"] if "classes" in data else None
+            return cls(weights, biases, str(data["out_activation"]), classes)
@@ -0,0 +1,145 @@
+"""
+Feature Embeddings
+Compact retrieval spaces for song similarity, learned at training time.
+"""
+import hashlib
+import numpy as np
+from typing import List
+
+from .compiled import CompiledMLP
+
+
+class FeatureEmbedding:
+    """
+    Projection of raw feature vectors into a compact retrieval space.
+
+    Raw features mix units (tempo around 120 BPM, spectral centroid in the
+    thousands of Hz), so cosine similarity on them is decided by a couple of
+    columns. An embedding standardizes them (the training scaler is folded
+    into the first layer, as in ``CompiledMLP``) and maps them either to the
+    classifier's last hidden layer (``from_mlp``) or to a PCA projection
+    (``from_pca``).
+    """
+
+    KINDS = ("mlp", "pca")
+
+    def __init__(self, weights: List[np.ndarray], biases: List[np.ndarray], kind: str):
+        """
+        Wrap already-folded layer parameters (use from_mlp, from_pca or load).
+
+        Args:
+            weights: Per-layer weight matrices (n_in x n_out)
+            biases: Per-layer bias vectors
+            kind: "mlp" (ReLU after every layer) or "pca" (linear)
+        """
+        if kind not in self.KINDS:
+            raise ValueError(f"Unknown embedding kind '{kind}', expected one of {self.KINDS}")
+        self.weights = [np.ascontiguousarray(w, dtype=np.float32) for w in weights]
+        self.biases = [np.ascontiguousarray(b, dtype=np.float32) for b in biases]
+        self.kind = kind
+
+        digest = hashlib.sha256(kind.encode())
+        for w, b in zip(self.weights, self.biases):
+            digest.update(w.tobytes())
+            digest.update(b.tobytes())
+        self.version = digest.hexdigest()[:12]
+
+    @classmethod
+    def from_mlp(cls, compiled: CompiledMLP) -> "FeatureEmbedding":
+        """
+        Penultimate-layer activations of a compiled classifier.
+
+        Args:
+            compiled: Compiled MLP with at least one hidden layer
+
+        Returns:
+            Embedding into the last hidden layer
+        """
+        if len(compiled.weights) < 2:
+            raise ValueError("The model has no hidden layer to embed into")
+        return cls(compiled.weights[:-1], compiled.biases[:-1], "mlp")
+
+    @classmethod
+    def from_pca(cls, pca, scaler=None) -> "FeatureEmbedding":
+        """
+        Fold a fitted PCA and the scaler applied before it into one projection.
+
+        Args:
+            pca: Fitted ``sklearn.decomposition.PCA``
+            scaler: Fitted ``StandardScaler`` applied before the PCA, or None
+
+        Returns:
+            Linear embedding into the principal components
+        """
+        components = np.asarray(pca.components_, dtype=np.float64)
+        if getattr(pca, "whiten", False):
+            components = components / np.sqrt(pca.explained_variance_)[:, None]
+        n_features = components.shape[1]
+        mean = getattr(scaler, "mean_", None)
+        scale = getattr(scaler, "scale_", None)
+        mean = np.zeros(n_features) if mean is None else mean
+        scale = np.ones(n_features) if scale is None else scale
+
+        # ((x - mean) / scale - pca.mean_) @ components.T
+        weight = (components / scale).T
+        bias = -(mean / scale + pca.mean_) @ components.T
+        return cls([weight], [bias], "pca")
+
+    @property
+    def dim(self) -> int:
+        return self.weights[-1].shape[1]
+
+    @property
+    def space(self) -> str:
+        """Identifier of the retrieval space, e.g. ``pca16-3f2a...``."""
+        return f"{self.kind}{self.dim}-{self.version}"
+
+    def transform(self, X: np.ndarray) -> np.ndarray:
+        """
+        Embed raw (unscaled) feature rows.
+
+        Args:
+            X: Feature matrix (n x n_features) or a single vector
+
+        Returns:
+            Float32 embedding matrix (n x dim), or a vector for vector input
+        """
+        h = np.asarray(X, dtype=np.float32)
+        for w, b in zip(self.weights, self.biases):
+            h = h @ w
+            h += b
+            if self.kind == "mlp":
+                np.maximum(h, 0, out=h)
+        return h
+
+    def save(self, path: str):
+        """
+        Write the embedding to an ``.npz`` file.
+
+        Args:
+            path: Output file
+        """
+        arrays = {"kind": np.array(self.kind), "n_layers": np.array(len(self.weights))}
+        for i, (w, b) in enumerate(zip(self.weights, self.biases)):
+            arrays[f"W{i}"] = w
+            arrays[f"b{i}"] = b
+        np.savez(path, **arrays)
+
+    @classmethod
+    def load(cls, path: str) -> "FeatureEmbedding":
+        """
+        Load an embedding written by ``save``.
+
+        Args:
+            path: ``.npz`` file
+
+        Returns:
+            The embedding
+        """
+        with np.load(path, allow_pickle=False) as data:
+            n_layers = int(data["n_layers"])
+            return cls(
+                [data[f"W{i}"] for i in range(n_layers)],
+                [data[f"b{i}"] for i in range(n_layers)],
+                str(data["kind"])
+            )
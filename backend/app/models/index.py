@@ -0,0 +1,522 @@
+"""
+Similarity Index
+Top-k cosine similarity search over catalog feature vectors.
+"""
+import numpy as np
+from typing import Any, Dict, Optional, Tuple
+
+
+def normalize_rows(vectors: np.ndarray) -> np.ndarray:
+    """
+    L2-normalize rows into a contiguous float32 matrix.
+
+    Zero rows stay zero so they score 0 against every query.
+    """
+    vectors = np.ascontiguousarray(vectors, dtype=np.float32)
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return vectors / norms
+
+
+# Storage types for normalized catalog vectors
+VECTOR_DTYPES = ("float32", "float16", "int8")
+
+# Rows converted to float32 at a time when scoring compact vectors
+SCORE_CHUNK = 8192
+
+
+def quantize_rows(matrix: np.ndarray, dtype: str = "float32") -> Tuple[np.ndarray, Optional[np.ndarray]]:
+    """
+    Store unit-length float32 rows compactly.
+
+    int8 rows use a symmetric per-row scale (``row ~= scale * codes``), so
+    each row keeps its full 8-bit range whatever its largest component.
+
+    Args:
+        matrix: Normalized float32 rows
+        dtype: One of VECTOR_DTYPES
+
+    Returns:
+        Tuple of (stored matrix, per-row float32 scales for int8 or None)
+    """
+    if dtype not in VECTOR_DTYPES:
+        raise ValueError(f"Unknown vector dtype '{dtype}', expected one of {VECTOR_DTYPES}")
+    if dtype == "float32":
+        return np.ascontiguousarray(matrix, dtype=np.float32), None
+    if dtype == "float16":
+        return np.ascontiguousarray(matrix, dtype=np.float16), None
+    scales = np.abs(matrix).max(axis=1) / 127.0 if len(matrix) else np.zeros(0)
+    scales[scales == 0] = 1.0
+    codes = np.round(matrix / scales[:, None]).astype(np.int8)
+    return codes, scales.astype(np.float32)
+
+
+def dequantize_rows(stored: np.ndarray, scales: Optional[np.ndarray] = None) -> np.ndarray:
+    """Float32 rows back from ``quantize_rows`` output."""
+    matrix = np.asarray(stored, dtype=np.float32)
+    if scales is not None:
+        matrix = matrix * np.asarray(scales)[:, None]
+    return matrix
+
+
+def top_k(scores: np.ndarray, k: int) -> np.ndarray:
+    """Indices of the ``k`` largest scores, best first."""
+    k = min(k, len(scores))
+    if k <= 0:
+        return np.empty(0, dtype=np.int64)
+    if k < len(scores):
+        candidates = np.argpartition(-scores, k - 1)[:k]
+    else:
+        candidates = np.arange(len(scores))
+    return candidates[np.argsort(-scores[candidates], kind="stable")]
+
+
+class ExactIndex:
+    """
+    Brute-force cosine similarity index.
+
+    Vectors are normalized once at build time and kept as a single
+    contiguous float32 matrix, so a query is one matrix-vector product over
+    the requested row range followed by ``argpartition``.
+
+    Compact float16/int8 rows (see ``quantize_rows``) are scored in chunks
+    converted to float32, so the matrix stays small in memory and BLAS
+    still does the products.
+    """
+
+    def __init__(
+        self,
+        vectors: np.ndarray,
+        normalized: bool = False,
+        scales: Optional[np.ndarray] = None
+    ):
+        """
+        Build the index.
+
+        Args:
+            vectors: Catalog feature matrix (n_songs x n_features)
+            normalized: Rows are already unit-length (float32, or float16/int8
+                from ``quantize_rows``); use them as-is without copying
+                (e.g. a memory-mapped catalog)
+            scales: Per-row scales of int8 rows
+        """
+        self.matrix = vectors if normalized else normalize_rows(vectors)
+        self.scales = scales if normalized else None
+
+    def __len__(self) -> int:
+        return self.matrix.shape[0]
+
+    def memory_bytes(self) -> int:
+        """Bytes used by the stored matrix."""
+        return self.matrix.nbytes + (self.scales.nbytes if self.scales is not None else 0)
+
+    def _scores(self, query: np.ndarray, start: int, stop: int) -> np.ndarray:
+        if self.matrix.dtype == np.float32:
+            return self.matrix[start:stop] @ query
+        scores = np.empty(stop - start, dtype=np.float32)
+        for offset in range(start, stop, SCORE_CHUNK):
+            end = min(offset + SCORE_CHUNK, stop)
+            scores[offset - start:end - start] = self.matrix[offset:end].astype(np.float32) @ query
+        if self.scales is not None:
+            scores *= self.scales[start:stop]
+        return scores
+
+    def search(
+        self,
+        query: np.ndarray,
+        k: int,
+        start: int = 0,
+        stop: Optional[int] = None
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Find the rows most similar to ``query``.
+
+        Args:
+            query: Feature vector
+            k: Number of results
+            start: First row of the range to search
+            stop: End of the row range (defaults to all rows)
+
+        Returns:
+            Tuple of (row indices, cosine similarities), best first
+        """
+        stop = len(self) if stop is None else stop
+        query = np.asarray(query, dtype=np.float32)
+        norm = np.linalg.norm(query)
+        if norm > 0:
+            query = query / norm
+
+        scores = self._scores(query, start, stop)
+        best = top_k(scores, k)
+        return best + start, scores[best]
+
+
+# Rows sampled to train each PQ codebook (256 centroids per subspace)
+PQ_TRAIN_SIZE = 256 * 64
+
+
+def _assign(
+    vectors: np.ndarray,
+    centroids: np.ndarray,
+    chunk: int = 65536,
+    scales: Optional[np.ndarray] = None
+) -> np.ndarray:
+    """Nearest centroid (squared L2) for every row, computed in chunks."""
+    centroid_sq = np.einsum("ij,ij->i", centroids, centroids)
+    labels = np.empty(len(vectors), dtype=np.int64)
+    for start in range(0, len(vectors), chunk):
+        block = vectors[start:start + chunk]
+        if block.dtype != np.float32:
+            # Compact rows (see quantize_rows) are upcast one chunk at a time
+            block = dequantize_rows(block, None if scales is None else scales[start:start + chunk])
+        # ||x - c||^2 = ||x||^2 - 2 x.c + ||c||^2; ||x||^2 is constant per row
+        labels[start:start + chunk] = np.argmin(centroid_sq - 2 * block @ centroids.T, axis=1)
+    return labels
+
+
+def kmeans(
+    vectors: np.ndarray,
+    k: int,
+    n_iter: int = 20,
+    seed: int = 0,
+    max_train: int = 100_000,
+    scales: Optional[np.ndarray] = None
+) -> np.ndarray:
+    """
+    Lloyd's k-means on a random training sample.
+
+    Args:
+        vectors: Data matrix (n x d), float32 or compact rows from ``quantize_rows``
+        k: Number of centroids (capped at the sample size)
+        n_iter: Lloyd iterations
+        seed: Random seed
+        max_train: Maximum rows used for training
+        scales: Per-row scales of int8 rows
+
+    Returns:
+        Centroid matrix (k x d), float32
+    """
+    rng = np.random.default_rng(seed)
+    if len(vectors) > max_train:
+        sample = rng.choice(len(vectors), max_train, replace=False)
+        vectors = vectors[sample]
+        scales = None if scales is None else scales[sample]
+    vectors = np.ascontiguousarray(dequantize_rows(vectors, scales))
+    k = min(k, len(vectors))
+    centroids = vectors[rng.choice(len(vectors), k, replace=False)].copy()
+
+    for _ in range(n_iter):
+        labels = _assign(vectors, centroids)
+        counts = np.bincount(labels, minlength=k)
+        filled = counts > 0
+        # Per-cluster sums via one sort + reduceat (much faster than np.add.at)
+        order = np.argsort(labels, kind="stable")
+        bounds = np.concatenate(([0], np.cumsum(counts)[:-1]))[filled]
+        sums = np.add.reduceat(vectors[order], bounds, axis=0)
+        centroids[filled] = sums / counts[filled, None]
+        # Re-seed empty clusters from random points
+        empty = np.flatnonzero(~filled)
+        if len(empty):
+            centroids[empty] = vectors[rng.choice(len(vectors), len(empty), replace=False)]
+    return centroids
+
+
+class IVFIndex:
+    """
+    Inverted-file approximate index with optional product quantization.
+
+    Normalized vectors are partitioned into ``n_lists`` k-means cells; a
+    query scores the centroids and only scans the ``nprobe`` closest cells.
+    Each cell is a list of row ids; the rows themselves are scored in place
+    in the catalog matrix, so the index adds only centroids and row ids on
+    top of it. Compact float16/int8 catalog rows (see ``quantize_rows``)
+    stay in their storage type; only the rows of the probed cells are
+    upcast at query time.
+
+    ``state`` returns the trained arrays so they can be saved next to the
+    catalog (see ``SongCatalog.save``); ``restore`` wraps them again, e.g.
+    memory-mapped, without retraining or copying anything.
+
+    With ``pq_subspaces > 0`` the residual of each vector from its cell
+    centroid is product-quantized into ``pq_subspaces`` one-byte codes
+    (256 centroids per subspace) and the full vectors are discarded. Scores
+    are then computed with per-query lookup tables (asymmetric distance):
+    ``q.x ~= q.c + sum_m table[m, code_m]``.
+
+    Recall/latency knobs:
+    - ``nprobe``: more cells scanned -> higher recall, slower queries
+    - ``pq_subspaces``: more bytes per vector -> higher recall, more memory
+    """
+
+    def __init__(
+        self,
+        vectors: np.ndarray,
+        n_lists: Optional[int] = None,
+        nprobe: int = 8,
+        pq_subspaces: int = 0,
+        n_iter: int = 20,
+        seed: int = 0,
+        normalized: bool = False,
+        scales: Optional[np.ndarray] = None
+    ):
+        """
+        Build the index.
+
+        Args:
+            vectors: Catalog feature matrix (n_songs x n_features)
+            n_lists: Number of IVF cells (defaults to ~sqrt(n_songs))
+            nprobe: Default number of cells scanned per query
+            pq_subspaces: PQ code size in bytes per vector (0 keeps full vectors)
+            n_iter: k-means iterations for cells and PQ codebooks
+            seed: Random seed for training
+            normalized: Rows are already unit-length (float32, or float16/int8
+                from ``quantize_rows``)
+            scales: Per-row scales of int8 rows
+        """
+        if normalized:
+            matrix = vectors if vectors.dtype in (np.float16, np.int8) else np.asarray(vectors, dtype=np.float32)
+        else:
+            matrix, scales = normalize_rows(vectors), None
+        n, dim = matrix.shape
+        self.nprobe = nprobe
+        self.params = _ivf_params(n, n_lists, pq_subspaces, n_iter, seed)
+        n_lists = self.params["n_lists"]
+
+        if n:
+            centroids = kmeans(matrix, n_lists, n_iter=n_iter, seed=seed, scales=scales)
+            labels = _assign(matrix, centroids, scales=scales)
+        else:
+            centroids = np.zeros((0, dim), dtype=np.float32)
+            labels = np.zeros(0, dtype=np.int64)
+
+        # CSR layout: rows of cell i are list_rows[list_offsets[i]:list_offsets[i + 1]]
+        order = np.argsort(labels, kind="stable")
+        list_offsets = np.concatenate(([0], np.cumsum(np.bincount(labels, minlength=len(centroids)))))
+
+        codes, codebooks = None, []
+        if pq_subspaces:
+            # Codes are read per probed cell, so they are built in list order
+            residuals = (dequantize_rows(matrix, scales) - centroids[labels])[order]
+            codes = np.empty((n, pq_subspaces), dtype=np.uint8)
+            for m, dims in enumerate(np.array_split(np.arange(dim), pq_subspaces)):
+                sub = np.ascontiguousarray(residuals[:, dims])
+                codebook = kmeans(
+                    sub, 256, n_iter=n_iter, seed=seed + m + 1, max_train=PQ_TRAIN_SIZE
+                )
+                codebooks.append(codebook)
+                codes[:, m] = _assign(sub, codebook)
+            matrix = scales = None
+
+        self._wrap(matrix, scales, centroids, order, list_offsets, codes, codebooks)
+
+    def _wrap(self, vectors, scales, centroids, list_rows, list_offsets, codes, codebooks):
+        self.vectors = vectors
+        self.scales = scales
+        self.centroids = centroids
+        self.list_rows = list_rows
+        self.list_offsets = list_offsets
+        self.codes = codes
+        self.codebooks = list(codebooks)
+        self.dim = centroids.shape[1]
+        self.pq_subspaces = self.params["pq_subspaces"]
+        self._size = len(list_rows)
+        if codes is not None:
+            self._splits = np.array_split(np.arange(self.dim), self.pq_subspaces)
+            # Offsets of each subspace's block in the concatenated lookup table
+            sizes = [len(codebook) for codebook in self.codebooks]
+            self._code_offsets = np.concatenate(([0], np.cumsum(sizes)[:-1])).astype(np.int32)
+
+    def state(self) -> Dict[str, Any]:
+        """
+        Trained arrays and parameters, for saving next to the catalog.
+
+        Returns:
+            Dict with ``kind``, ``params`` (training parameters) and
+            ``arrays`` (name -> array); the catalog rows are not included
+        """
+        arrays = {
+            "centroids": self.centroids,
+            "list_rows": self.list_rows,
+            "list_offsets": self.list_offsets,
+        }
+        if self.codes is not None:
+            arrays["codes"] = self.codes
+            for m, codebook in enumerate(self.codebooks):
+                arrays[f"codebook{m}"] = codebook
+        return {"kind": "ivf", "params": dict(self.params), "arrays": arrays}
+
+    @classmethod
+    def restore(
+        cls,
+        vectors: np.ndarray,
+        state: Dict[str, Any],
+        n_lists: Optional[int] = None,
+        nprobe: int = 8,
+        pq_subspaces: int = 0,
+        n_iter: int = 20,
+        seed: int = 0,
+        normalized: bool = False,
+        scales: Optional[np.ndarray] = None
+    ) -> Optional["IVFIndex"]:
+        """
+        Rebuild an index from ``state`` without training.
+
+        Args:
+            vectors: The catalog feature matrix the state was trained on
+            state: Output of ``state`` (arrays may be memory-mapped)
+            n_lists, nprobe, pq_subspaces, n_iter, seed, normalized, scales:
+                As for the constructor
+
+        Returns:
+            The index, or None if ``state`` was trained with other parameters
+            (the caller then builds a new one)
+        """
+        params = _ivf_params(len(vectors), n_lists, pq_subspaces, n_iter, seed)
+        if state.get("kind") != "ivf" or state.get("params") != params:
+            return None
+        arrays = state["arrays"]
+        if len(arrays["list_rows"]) != len(vectors):
+            return None
+
+        index = cls.__new__(cls)
+        index.nprobe = nprobe
+        index.params = params
+        if pq_subspaces:
+            vectors = scales = None
+            codebooks = [arrays[f"codebook{m}"] for m in range(pq_subspaces)]
+        elif normalized:
+            vectors = vectors if vectors.dtype in (np.float16, np.int8) else np.asarray(vectors, dtype=np.float32)
+            codebooks = []
+        else:
+            vectors, scales = normalize_rows(vectors), None
+            codebooks = []
+        index._wrap(
+            vectors, scales, arrays["centroids"], arrays["list_rows"], arrays["list_offsets"],
+            arrays.get("codes"), codebooks
+        )
+        return index
+
+    def __len__(self) -> int:
+        return self._size
+
+    def memory_bytes(self) -> int:
+        """Bytes used by stored vectors/codes, centroids and row ids."""
+        total = self.centroids.nbytes + self.list_rows.nbytes + self.list_offsets.nbytes
+        if self.vectors is not None:
+            total += self.vectors.nbytes
+            if self.scales is not None:
+                total += self.scales.nbytes
+        else:
+            total += self.codes.nbytes + sum(c.nbytes for c in self.codebooks)
+        return total
+
+    def search(
+        self,
+        query: np.ndarray,
+        k: int,
+        start: int = 0,
+        stop: Optional[int] = None,
+        nprobe: Optional[int] = None
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Approximate top-k by cosine similarity.
+
+        Cells are probed in order of centroid similarity. If the first
+        ``nprobe`` cells hold fewer than ``k`` rows inside [start, stop),
+        further cells are probed until ``k`` are found or all are scanned.
+
+        Args:
+            query: Feature vector
+            k: Number of results
+            start: First row of the range to search
+            stop: End of the row range (defaults to all rows)
+            nprobe: Cells to scan (defaults to the index setting)
+
+        Returns:
+            Tuple of (row indices, approximate cosine similarities), best first
+        """
+        stop = len(self) if stop is None else stop
+        nprobe = nprobe or self.nprobe
+        query = np.asarray(query, dtype=np.float32)
+        norm = np.linalg.norm(query)
+        if norm > 0:
+            query = query / norm
+
+        centroid_scores = self.centroids @ query
+        probe_order = np.argsort(-centroid_scores)
+
+        # Collect the list positions of in-range rows from the probed cells
+        positions, cells = [], []
+        found = 0
+        for probed, cell in enumerate(probe_order):
+            if probed >= nprobe and found >= k:
+                break
+            lo, hi = self.list_offsets[cell], self.list_offsets[cell + 1]
+            cell_positions = np.arange(lo, hi)
+            cell_rows = self.list_rows[lo:hi]
+            cell_positions = cell_positions[(cell_rows >= start) & (cell_rows < stop)]
+            if len(cell_positions):
+                positions.append(cell_positions)
+                cells.append(np.full(len(cell_positions), cell))
+                found += len(cell_positions)
+
+        if not positions:
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float32)
+        positions = np.concatenate(positions)
+        rows = self.list_rows[positions]
+
+        if self.vectors is not None:
+            scores = self.vectors[rows].astype(np.float32, copy=False) @ query
+            if self.scales is not None:
+                scores *= self.scales[rows]
+        else:
+            # Asymmetric distance: q.x ~= q.centroid + sum of per-subspace table lookups
+            table = np.concatenate([
+                codebook @ query[dims] for codebook, dims in zip(self.codebooks, self._splits)
+            ])
+            codes = self.codes[positions].astype(np.int32) + self._code_offsets
+            scores = table[codes].sum(axis=1) + centroid_scores[np.concatenate(cells)]
+
+        best = top_k(scores, k)
+        return rows[best], scores[best]
+
+
+def _ivf_params(n: int, n_lists: Optional[int], pq_subspaces: int, n_iter: int, seed: int) -> Dict[str, int]:
+    """Training parameters of an IVF index over ``n`` rows, with defaults resolved."""
+    return {
+        "n_lists": n_lists or max(1, int(np.sqrt(n))),
+        "pq_subspaces": pq_subspaces,
+        "n_iter": n_iter,
+        "seed": seed,
+    }
+
+
+# Index implementations selectable by name
+INDEX_TYPES = {
+    "exact": ExactIndex,
+    "ivf": IVFIndex,
+}
+
+
+def build_index(kind: str, vectors: np.ndarray, saved: Optional[Dict[str, Any]] = None, **params):
+    """
+    Construct a similarity index by name.
+
+    Args:
+        kind: Key of ``INDEX_TYPES`` ("exact" or "ivf")
+        vectors: Catalog feature matrix
+        saved: ``state()`` of an index previously built over ``vectors``;
+            reused instead of training when its kind and parameters match
+        **params: Index-specific parameters (e.g. nprobe, pq_subspaces)
+
+    Returns:
+        Index exposing ``search(query, k, start, stop)``
+    """
+    if kind not in INDEX_TYPES:
+        raise ValueError(f"Unknown index type '{kind}', expected one of {sorted(INDEX_TYPES)}")
+    index_type = INDEX_TYPES[kind]
+    if saved is not None and hasattr(index_type, "restore"):
+        index = index_type.restore(vectors, saved, **params)
+        if index is not None:
+            return index
+    return index_type(vectors, **params)
@@ -2,14 +2,75 @@
 Song Recommendation Engine
 Finds similar songs using audio feature similarity.
 """
+import threading
+import zlib
 import numpy as np
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Iterable, Optional, Tuple
+
+from .catalog import SongCatalog
+from .embedding import FeatureEmbedding
+from .index import build_index
+
+
+def _stable_seed(song_id: str) -> int:
+    """Seed derived from the song ID that is identical in every process."""
+    # hash() of a str is randomized per process, which would give each
+    # worker different mock vectors for the same catalog
+    return zlib.crc32(song_id.encode("utf-8"))
+
+
+# Segments added incrementally use exact search up to this many rows
+EXACT_SEGMENT_MAX = 50_000
+
+# Incremental segments are merged into one once there are more than this many
+MAX_DELTA_SEGMENTS = 4
+
+
+class _Segment:
+    """An immutable catalog slice with its similarity index and deletion mask."""
+    
+    def __init__(self, catalog: SongCatalog, index, live: Optional[np.ndarray] = None):
+        self.catalog = catalog
+        self.index = index
+        # None means every row is live; otherwise False marks a deleted row
+        self.live = live
+        self.n_live = len(catalog) if live is None else int(live.sum())
+        self._deleted = {}
+        if live is not None:
+            for genre, (start, stop) in catalog.genre_offsets.items():
+                self._deleted[genre] = int((stop - start) - live[start:stop].sum())
+    
+    def row_range(self, genre: Optional[str]) -> Tuple[int, int]:
+        if genre:
+            return self.catalog.genre_offsets.get(genre, (0, 0))
+        return 0, len(self.catalog)
+    
+    def deleted_in(self, genre: Optional[str]) -> int:
+        if self.live is None:
+            return 0
+        if genre:
+            return self._deleted.get(genre, 0)
+        return len(self.catalog) - self.n_live
+    
+    def is_live(self, row: int) -> bool:
+        return self.live is None or bool(self.live[row])
 
 
 class SongRecommender:
     """
     Recommends similar songs based on audio feature similarity.
-    Uses KNN with cosine similarity for matching.
+    Uses top-k cosine similarity over a pre-normalized feature matrix, either
+    exact or through an approximate IVF/PQ index for large catalogs.
+    
+    With a ``FeatureEmbedding``, songs and queries are compared in its
+    compact learned space instead of on raw, unscaled features, and rows
+    can be stored as float16 or int8 to shrink the catalog further.
+    
+    Songs can be added or deleted while serving. The catalog is a tuple of
+    immutable segments (the base catalog plus small incremental ones, each
+    with its own index and deletion mask); writers build a new tuple and
+    swap the reference in one assignment, so a query always runs against
+    one complete snapshot and never takes a lock.
     """
     
     # Sample song database
@@ -65,20 +126,226 @@ class SongRecommender:
         {"id": "reggae-3", "title": "Sunshine", "artist": "Caribbean Breeze", "genre": "reggae", "duration": "4:45"},
     ]
     
-    def __init__(self):
-        """Initialize the recommender."""
-        # Pre-compute mock feature vectors for songs (in a real system, these would be extracted)
-        self._song_features = self._generate_song_features()
+    def __init__(
+        self,
+        songs: Optional[List[Dict[str, Any]]] = None,
+        index: str = "exact",
+        index_params: Optional[Dict[str, Any]] = None,
+        catalog_path: Optional[str] = None,
+        embedding: Optional[FeatureEmbedding] = None,
+        vector_dtype: str = "float32"
+    ):
+        """
+        Initialize the recommender.
+        
+        Args:
+            songs: Song metadata records (defaults to SONG_DATABASE)
+            index: Similarity index type, "exact" or "ivf" (approximate)
+            index_params: Extra index options (e.g. nprobe, n_lists, pq_subspaces)
+            catalog_path: Directory of a saved SongCatalog to memory-map
+                instead of building one from ``songs``
+            embedding: ``FeatureEmbedding`` to compare songs in, or None for
+                raw features; a saved catalog must have been built with it
+            vector_dtype: Storage type of catalog rows, "float32", "float16"
+                or "int8" (a saved catalog keeps its own)
+        """
+        self._index_kind = index
+        self._index_params = dict(index_params or {})
+        self._write_lock = threading.Lock()
+        self.embedding = embedding
+        self.vector_dtype = vector_dtype
+        
+        if catalog_path:
+            catalog = SongCatalog.open(catalog_path)
+            space = embedding.space if embedding is not None else "raw"
+            if catalog.space != space:
+                raise ValueError(
+                    f"Catalog at {catalog_path} is in space '{catalog.space}', not '{space}'; "
+                    "rebuild it with the same embedding"
+                )
+            # New segments must match the saved rows to be merged with them
+            self.vector_dtype = catalog.dtype
+        else:
+            songs = self.SONG_DATABASE if songs is None else songs
+            # Pre-compute mock feature vectors for songs (in a real system, these would be extracted)
+            catalog = SongCatalog.from_records(
+                songs, self._generate_song_features(songs), embedding, vector_dtype
+            )
+        
+        self._segments: Tuple[_Segment, ...] = (self._make_segment(catalog, base=True),)
     
-    def _generate_song_features(self) -> Dict[str, np.ndarray]:
+    @staticmethod
+    def _generate_song_features(songs: List[Dict[str, Any]]) -> np.ndarray:
         """Generate mock feature vectors for the song database."""
-        features = {}
-        for song in self.SONG_DATABASE:
+        features = np.empty((len(songs), 58), dtype=np.float32)
+        for row, song in enumerate(songs):
             # Generate deterministic features based on song ID
-            np.random.seed(hash(song["id"]) % 2**32)
-            features[song["id"]] = np.random.randn(58)
+            rng = np.random.default_rng(_stable_seed(song["id"]))
+            features[row] = rng.standard_normal(58)
         return features
     
+    def _make_segment(
+        self,
+        catalog: SongCatalog,
+        base: bool = False,
+        live: Optional[np.ndarray] = None
+    ) -> _Segment:
+        """Index a catalog; small incremental segments always use exact search."""
+        if base or len(catalog) > EXACT_SEGMENT_MAX:
+            kind, params = self._index_kind, self._index_params
+        else:
+            kind, params = "exact", {}
+        # Catalog rows are already normalized, so indexes use them as-is; an
+        # index saved with the catalog is mapped instead of retrained
+        index = build_index(
+            kind, catalog.features, saved=catalog.saved_index,
+            normalized=True, scales=catalog.scales, **params
+        )
+        return _Segment(catalog, index, live)
+    
+    def __len__(self) -> int:
+        return sum(segment.n_live for segment in self._segments)
+    
+    @property
+    def catalog(self) -> SongCatalog:
+        """The current catalog as one SongCatalog (merged if it has segments)."""
+        segments = self._segments
+        if len(segments) == 1 and segments[0].live is None:
+            return segments[0].catalog
+        return SongCatalog.merge([(segment.catalog, segment.live) for segment in segments])
+    
+    @property
+    def catalog_version(self) -> str:
+        """Identifier that changes whenever songs are added or deleted."""
+        return "+".join(
+            f"{segment.catalog.version}-{len(segment.catalog) - segment.n_live}"
+            for segment in self._segments
+        )
+    
+    def add_songs(self, songs: List[Dict[str, Any]], features: np.ndarray) -> int:
+        """
+        Add songs with precomputed feature vectors.
+        
+        The songs become a new segment; an existing song with the same ID
+        is replaced. Once there are more than MAX_DELTA_SEGMENTS incremental
+        segments they are merged together (the base catalog is untouched).
+        
+        Args:
+            songs: Song metadata records (id, title, artist, genre, duration)
+            features: Feature vectors aligned with ``songs``
+            
+        Returns:
+            Number of songs added
+        """
+        if not songs:
+            return 0
+        delta = SongCatalog.from_records(songs, features, self.embedding, self.vector_dtype)
+        
+        with self._write_lock:
+            segments, _ = self._without_ids(self._segments, {song["id"] for song in songs})
+            segments.append(self._make_segment(delta))
+            
+            if len(segments) - 1 > MAX_DELTA_SEGMENTS:
+                merged = SongCatalog.merge(
+                    [(segment.catalog, segment.live) for segment in segments[1:]]
+                )
+                segments = segments[:1] + [self._make_segment(merged)]
+            
+            # Publish the new snapshot in a single reference assignment
+            self._segments = tuple(segments)
+        return len(songs)
+    
+    def delete_songs(self, song_ids: Iterable[str]) -> int:
+        """
+        Remove songs by ID.
+        
+        Rows are masked out rather than physically removed; ``compact``
+        reclaims the space.
+        
+        Args:
+            song_ids: IDs of the songs to remove
+            
+        Returns:
+            Number of songs that were found and removed
+        """
+        with self._write_lock:
+            segments, removed = self._without_ids(self._segments, set(song_ids))
+            if removed:
+                self._segments = tuple(segments)
+        return removed
+    
+    def ingest(
+        self,
+        songs: List[Dict[str, Any]],
+        extractor,
+        workers: Optional[int] = None
+    ) -> Dict[str, Any]:
+        """
+        Extract features for new tracks and add them.
+        
+        Args:
+            songs: Song records, each with a ``path`` to its audio file
+            extractor: AudioFeatureExtractor used for feature extraction
+            workers: Extraction worker processes (see ``extract_batch``)
+            
+        Returns:
+            Dict with ``added`` count and ``errors`` (path -> message)
+        """
+        by_path = {song["path"]: song for song in songs}
+        added, vectors, stats = [], [], {}
+        for path, features in extractor.extract_batch(list(by_path), workers=workers, stats=stats):
+            if features is not None:
+                added.append({k: v for k, v in by_path[path].items() if k != "path"})
+                vectors.append(features)
+        
+        if added:
+            self.add_songs(added, np.vstack(vectors))
+        return {"added": len(added), "errors": stats.get("errors", {})}
+    
+    def compact(self):
+        """
+        Merge all segments into a new base catalog, dropping deleted rows.
+        
+        This rebuilds the configured index over the whole catalog, so it is
+        meant to run off the request path (e.g. in a background thread);
+        queries keep using the previous snapshot until it completes.
+        """
+        with self._write_lock:
+            segments = self._segments
+            merged = SongCatalog.merge([(segment.catalog, segment.live) for segment in segments])
+            self._segments = (self._make_segment(merged, base=True),)
+    
+    def save(self, path: str):
+        """
+        Persist the current catalog (all segments merged) for ``catalog_path``.
+        
+        The configured index is saved with it, so opening the catalog does
+        not train it again.
+        
+        Args:
+            path: Catalog directory to write
+        """
+        segments = self._segments
+        if len(segments) == 1 and segments[0].live is None:
+            segment = segments[0]
+        else:
+            segment = self._make_segment(self.catalog, base=True)
+        segment.catalog.save(path, segment.index)
+    
+    def _without_ids(self, segments, song_ids) -> Tuple[List[_Segment], int]:
+        """Copy of ``segments`` with the given IDs masked out."""
+        result, removed = [], 0
+        for segment in segments:
+            rows = [segment.catalog.row_of(song_id) for song_id in song_ids]
+            rows = [row for row in rows if row is not None and segment.is_live(row)]
+            if rows:
+                live = np.ones(len(segment.catalog), dtype=bool) if segment.live is None else segment.live.copy()
+                live[rows] = False
+                segment = _Segment(segment.catalog, segment.index, live)
+                removed += len(rows)
+            result.append(segment)
+        return result, removed
+    
     def get_recommendations(
         self,
         features: Optional[np.ndarray] = None,
@@ -96,43 +363,55 @@ class SongRecommender:
         Returns:
             List of recommended songs with similarity scores
         """
-        # Filter songs by genre if specified
-        if genre:
-            candidate_songs = [s for s in self.SONG_DATABASE if s["genre"] == genre]
-        else:
-            candidate_songs = self.SONG_DATABASE
-        
-        if not candidate_songs:
-            return []
+        # Read the snapshot once so concurrent writes cannot affect this query
+        segments = self._segments
         
         recommendations = []
-        for song in candidate_songs[:top_k]:
-            # Calculate similarity (mock for demo)
-            if features is not None:
-                song_features = self._song_features.get(song["id"], np.random.randn(58))
-                similarity = self._cosine_similarity(features, song_features)
+        if features is not None:
+            if self.embedding is not None:
+                features = self.embedding.transform(features)
+            # Rank candidates in every segment, over-fetching to skip deleted rows
+            candidates = []
+            for segment in segments:
+                start, stop = segment.row_range(genre)
+                if stop <= start:
+                    continue
+                k = top_k + segment.deleted_in(genre)
+                rows, similarities = segment.index.search(features, k, start, stop)
+                candidates.extend(
+                    (float(similarity), segment.catalog, row)
+                    for row, similarity in zip(rows, similarities)
+                    if segment.is_live(row)
+                )
+            candidates.sort(key=lambda candidate: candidate[0], reverse=True)
+            
+            for similarity, catalog, row in candidates[:top_k]:
                 # Normalize to reasonable range
                 similarity = (similarity + 1) / 2  # Map from [-1, 1] to [0, 1]
                 similarity = 0.7 + similarity * 0.25  # Map to [0.7, 0.95]
-            else:
+                recommendations.append({
+                    **catalog.song(row),
+                    "similarity": round(similarity, 3)
+                })
+            return recommendations
+        
+        for segment in segments:
+            start, stop = segment.row_range(genre)
+            for row in range(start, stop):
+                if len(recommendations) >= top_k:
+                    break
+                if not segment.is_live(row):
+                    continue
+                song = segment.catalog.song(row)
                 # Generate random similarity for demo
-                np.random.seed(hash(song["id"]) % 2**32)
-                similarity = 0.7 + np.random.random() * 0.25
-            
-            recommendations.append({
-                **song,
-                "similarity": round(similarity, 3)
-            })
+                rng = np.random.default_rng(_stable_seed(song["id"]))
+                similarity = 0.7 + rng.random() * 0.25
+                recommendations.append({
+                    **song,
+                    "similarity": round(similarity, 3)
+                })
         
         # Sort by similarity
         recommendations.sort(key=lambda x: x["similarity"], reverse=True)
         
         return recommendations
-    
-    def _cosine_similarity(self, a: np.ndarray, b: np.ndarray) -> float:
-        """Calculate cosine similarity between two vectors."""
-        norm_a = np.linalg.norm(a)
-        norm_b = np.linalg.norm(b)
-        if norm_a == 0 or norm_b == 0:
-            return 0.0
-        return float(np.dot(a, b) / (norm_a * norm_b))
@@ -0,0 +1,167 @@
+"""
+Request Profiling
+Opt-in cProfile + tracemalloc capture of single requests, kept in a bounded
+on-disk ring buffer.
+"""
+import cProfile
+import json
+import marshal
+import os
+import re
+import secrets
+import threading
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+_ID_PATTERN = re.compile(r"^[0-9]{8}T[0-9]{6}-[0-9a-f]{6}$")
+
+# cProfile can only run once per thread and tracemalloc is process-wide
+_capture_lock = threading.Lock()
+
+
+def _top_functions(stats: Dict[tuple, tuple], limit: int) -> List[Dict[str, Any]]:
+    # stats maps (file, line, function) -> (primitive calls, calls, tottime, cumtime, callers)
+    rows = sorted(stats.items(), key=lambda item: item[1][3], reverse=True)[:limit]
+    return [
+        {
+            "function": f"{filename}:{line}({name})",
+            "calls": calls,
+            "tottime_ms": round(tottime * 1000, 3),
+            "cumtime_ms": round(cumtime * 1000, 3),
+        }
+        for (filename, line, name), (_, calls, tottime, cumtime, _) in rows
+    ]
+
+
+def _top_allocations(snapshot: tracemalloc.Snapshot, limit: int) -> List[Dict[str, Any]]:
+    return [
+        {
+            "location": f"{stat.traceback[0].filename}:{stat.traceback[0].lineno}",
+            "size_bytes": stat.size,
+            "count": stat.count,
+        }
+        for stat in snapshot.statistics("lineno")[:limit]
+    ]
+
+
+def profile_call(fn: Callable[..., Any], *args: Any, limit: int = 30) -> Tuple[Any, bytes, Dict[str, Any]]:
+    """
+    Run ``fn(*args)`` under cProfile and tracemalloc.
+
+    Only one capture runs at a time per process; tracemalloc sees every
+    thread, so allocations made concurrently by other requests show up too.
+
+    Args:
+        fn: Callable to profile
+        *args: Positional arguments for ``fn``
+        limit: Rows kept in the function and allocation tables
+
+    Returns:
+        Tuple of (return value of ``fn``, pstats data loadable with
+        ``pstats.Stats(path)`` once written to a file, summary dictionary)
+    """
+    with _capture_lock:
+        already_tracing = tracemalloc.is_tracing()
+        if not already_tracing:
+            tracemalloc.start()
+        tracemalloc.reset_peak()
+        profiler = cProfile.Profile()
+        start = time.perf_counter()
+        try:
+            profiler.enable()
+            try:
+                result = fn(*args)
+            finally:
+                profiler.disable()
+            wall = time.perf_counter() - start
+            current, peak = tracemalloc.get_traced_memory()
+            snapshot = tracemalloc.take_snapshot()
+        finally:
+            if not already_tracing:
+                tracemalloc.stop()
+
+    profiler.create_stats()
+    summary = {
+        "wall_ms": round(wall * 1000, 3),
+        "top_functions": _top_functions(profiler.stats, limit),
+        "memory": {
+            "peak_bytes": peak,
+            "retained_bytes": current,
+            # Allocations still alive when the call returned (leaks, caches)
+            "top_retained": _top_allocations(snapshot, limit),
+        },
+    }
+    return result, marshal.dumps(profiler.stats), summary
+
+
+class ProfileStore:
+    """
+    Ring buffer of captured profiles on disk.
+
+    Each profile is ``<id>.prof`` (pstats data, e.g. for snakeviz) plus
+    ``<id>.json`` (summary); once more than ``max_profiles`` are stored
+    the oldest are deleted.
+    """
+
+    def __init__(self, directory: str, max_profiles: int = 20):
+        self.directory = directory
+        self.max_profiles = max_profiles
+        self._lock = threading.Lock()
+
+    def save(self, pstats_data: bytes, summary: Dict[str, Any]) -> str:
+        """
+        Store a profile and evict the oldest beyond the limit.
+
+        Args:
+            pstats_data: Marshalled profiler stats from ``profile_call``
+            summary: JSON-serializable summary
+
+        Returns:
+            The new profile ID
+        """
+        profile_id = f"{time.strftime('%Y%m%dT%H%M%S')}-{secrets.token_hex(3)}"
+        summary = {"id": profile_id, "created": time.time(), **summary}
+        with self._lock:
+            os.makedirs(self.directory, exist_ok=True)
+            # Write the summary last: its presence marks the profile complete
+            self._write(f"{profile_id}.prof", pstats_data)
+            self._write(f"{profile_id}.json", json.dumps(summary).encode())
+            ids = self.list_ids()
+            for stale in ids[:max(0, len(ids) - self.max_profiles)]:
+                for suffix in (".json", ".prof"):
+                    try:
+                        os.remove(os.path.join(self.directory, stale + suffix))
+                    except OSError:
+                        pass
+        return profile_id
+
+    def _write(self, name: str, data: bytes):
+        path = os.path.join(self.directory, name)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+
+    def list_ids(self) -> List[str]:
+        """Stored profile IDs, oldest first."""
+        try:
+            names = os.listdir(self.directory)
+        except FileNotFoundError:
+            return []
+        return sorted(name[:-5] for name in names if name.endswith(".json") and _ID_PATTERN.match(name[:-5]))
+
+    def summary(self, profile_id: str) -> Optional[Dict[str, Any]]:
+        """The stored summary, or None if unknown."""
+        path = self.path(profile_id, ".json")
+        if path is None:
+            return None
+        with open(path) as f:
+            return json.load(f)
+
+    def path(self, profile_id: str, suffix: str = ".prof") -> Optional[str]:
+        """File path of a stored profile, or None if the ID is invalid or gone."""
+        if not _ID_PATTERN.match(profile_id):
+            return None
+        path = os.path.join(self.directory, profile_id + suffix)
+        return path if os.path.exists(path) else None
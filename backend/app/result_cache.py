@@ -0,0 +1,119 @@
+"""
+Prediction Result Cache
+TTL + LRU cache of complete prediction responses.
+"""
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+import numpy as np
+
+
+class ResultCache:
+    """
+    In-memory cache of finished ``/api/predict`` responses.
+
+    Callers build keys with ``make_key`` from everything the response
+    depends on: the input (a feature-vector digest), the
+    classifier version, the catalog version and ``top_k``. Loading a new
+    model or changing the catalog therefore changes every key, so stale
+    entries are never served; they simply stop being hit and age out
+    through the TTL or LRU eviction.
+    """
+
+    def __init__(self, max_entries: int = 4096, ttl_seconds: float = 3600.0):
+        """
+        Initialize the cache.
+
+        Args:
+            max_entries: Capacity before least-recently-used entries are evicted
+            ttl_seconds: Lifetime of an entry (0 disables expiry)
+        """
+        self.max_entries = max_entries
+        self.ttl = ttl_seconds
+
+        self._entries: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._counters = {"hits": 0, "misses": 0, "expired": 0, "evicted": 0}
+
+    @staticmethod
+    def make_key(subject: Any, **params: Any) -> str:
+        """
+        Build a cache key.
+
+        Args:
+            subject: Feature vector (hashed by value) or an identifier string
+            **params: Everything else the result depends on (model and
+                catalog versions, top_k, ...)
+
+        Returns:
+            Hex digest identifying (subject, params)
+        """
+        if isinstance(subject, np.ndarray):
+            digest = hashlib.sha256(np.ascontiguousarray(subject, dtype=np.float32).tobytes())
+        else:
+            digest = hashlib.sha256(f"id:{subject}".encode())
+        for name in sorted(params):
+            digest.update(f"|{name}={params[name]!r}".encode())
+        return digest.hexdigest()
+
+    def get(self, key: str) -> Optional[Any]:
+        """
+        Look up a cached result.
+
+        Args:
+            key: Key from ``make_key``
+
+        Returns:
+            The stored result, or None on a miss or expired entry
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self._counters["misses"] += 1
+                return None
+            stored_at, result = entry
+            if self.ttl and time.monotonic() - stored_at > self.ttl:
+                del self._entries[key]
+                self._counters["expired"] += 1
+                self._counters["misses"] += 1
+                return None
+            self._entries.move_to_end(key)
+            self._counters["hits"] += 1
+            return result
+
+    def put(self, key: str, result: Any):
+        """
+        Store a result. It must not be mutated afterwards.
+
+        Args:
+            key: Key from ``make_key``
+            result: Response payload
+        """
+        if self.max_entries <= 0:
+            return
+        with self._lock:
+            self._entries[key] = (time.monotonic(), result)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self._counters["evicted"] += 1
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss/eviction counters and current size."""
+        with self._lock:
+            counters = dict(self._counters)
+            entries = len(self._entries)
+        lookups = counters["hits"] + counters["misses"]
+        return {
+            **counters,
+            "hit_rate": counters["hits"] / lookups if lookups else 0.0,
+            "entries": entries,
+        }
+
+    def clear(self):
+        """Drop all entries (counters are kept)."""
+        with self._lock:
+            self._entries.clear()
@@ -0,0 +1,84 @@
+"""
+Shared Model Store
+Publishes the model and catalog once so server worker processes can map them.
+"""
+import os
+from typing import Any, Dict, Optional
+
+from app.models.classifier import GenreClassifier
+from app.models.compiled import CompiledMLP
+from app.models.embedding import FeatureEmbedding
+from app.models.recommender import SongRecommender
+
+# tmpfs backed by shared memory on Linux; falls back to the model directory
+DEFAULT_SHARED_DIR = "/dev/shm/genre-api" if os.path.isdir("/dev/shm") else "models/shared"
+
+
+def publish_shared(
+    out_dir: str = DEFAULT_SHARED_DIR,
+    model_path: Optional[str] = None,
+    catalog_path: Optional[str] = None,
+    embedding_path: Optional[str] = None,
+    vector_dtype: str = "float32",
+    index: str = "exact",
+    index_params: Optional[Dict[str, Any]] = None
+) -> Dict[str, str]:
+    """
+    Write the classifier and catalog as memory-mappable ``.npy`` directories.
+
+    Run this once in the parent before starting workers. Every worker then
+    opens the published directories with ``mmap_mode='r'``, so the weights
+    and catalog matrices are held once in the page cache (shared memory
+    when ``out_dir`` is on ``/dev/shm``) instead of once per process.
+    sklearn models are compiled to the NumPy kernel first, so workers never
+    import sklearn. A model that cannot be loaded or compiled is not
+    published; workers then load MODEL_PATH themselves (falling back to
+    mock predictions as usual). An approximate index is trained here once
+    and published with the catalog, so workers map it instead of each
+    training their own.
+
+    Args:
+        out_dir: Directory to publish into
+        model_path: ``.joblib`` or ``.npz`` model (None leaves the demo model)
+        catalog_path: Saved catalog to republish (None publishes the default one)
+        embedding_path: Embedding the workers compare songs in (RECOMMENDER_EMBEDDING)
+        vector_dtype: Row storage type of the default catalog (RECOMMENDER_VECTOR_DTYPE)
+        index: Similarity index the workers use (RECOMMENDER_INDEX)
+        index_params: Its parameters (RECOMMENDER_INDEX_PARAMS)
+
+    Returns:
+        Environment overrides (MODEL_PATH, CATALOG_PATH) pointing workers at
+        the published copies
+    """
+    env = {}
+    os.makedirs(out_dir, exist_ok=True)
+
+    compiled = _compile(model_path) if model_path and os.path.exists(model_path) else None
+    if compiled is not None:
+        shared_model = os.path.join(out_dir, "model")
+        compiled.save_dir(shared_model)
+        env["MODEL_PATH"] = shared_model
+
+    shared_catalog = os.path.join(out_dir, "catalog")
+    embedding = FeatureEmbedding.load(embedding_path) if embedding_path else None
+    SongRecommender(
+        index=index, index_params=index_params, catalog_path=catalog_path,
+        embedding=embedding, vector_dtype=vector_dtype
+    ).save(shared_catalog)
+    env["CATALOG_PATH"] = shared_catalog
+    return env
+
+
+def _compile(model_path: str) -> Optional[CompiledMLP]:
+    """The model as a NumPy kernel, or None if it cannot be loaded or compiled."""
+    try:
+        if model_path.endswith('.npz') or os.path.isdir(model_path):
+            return CompiledMLP.load(model_path)
+        classifier = GenreClassifier(model_path)
+        if classifier.model is None:
+            # GenreClassifier already reported why the load failed
+            return None
+        return CompiledMLP.from_sklearn(classifier.model, classifier.scaler)
+    except Exception as e:
+        print(f"Could not compile model for sharing: {e}")
+        return None
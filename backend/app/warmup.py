@@ -0,0 +1,51 @@
+"""
+Model Warm-Up
+Loads heavy dependencies and runs one dummy inference before traffic arrives.
+"""
+import time
+from typing import Dict
+
+import numpy as np
+
+from app.features.extractor import load_librosa
+
+
+def warm_up(extractor, classifier, recommender=None) -> Dict[str, float]:
+    """
+    Pay every first-use cost up front.
+
+    Imports librosa, loads the classifier, and pushes one second of noise
+    through extraction, prediction and recommendation so lazily imported
+    submodules and librosa's JIT-compiled kernels are ready before the
+    first real request.
+
+    Args:
+        extractor: AudioFeatureExtractor to warm
+        classifier: GenreClassifier to load
+        recommender: Optional SongRecommender to query once
+
+    Returns:
+        Stage name -> seconds
+    """
+    timings: Dict[str, float] = {}
+
+    def timed(stage, fn, *args, **kwargs):
+        start = time.perf_counter()
+        result = fn(*args, **kwargs)
+        timings[stage] = time.perf_counter() - start
+        return result
+
+    librosa = timed("import_librosa", load_librosa)
+    timed("load_model", classifier.load)
+
+    if librosa is not None:
+        noise = np.random.default_rng(0).standard_normal(extractor.sr).astype(np.float32) * 0.1
+        features = timed("first_extract", extractor.extract_from_signal, noise, extractor.sr)
+    else:
+        features = extractor._get_mock_features()
+    prediction = timed("first_predict", classifier.predict, features)
+    if recommender is not None:
+        timed("first_recommend", recommender.get_recommendations, features, prediction["genre"], 1)
+
+    timings["total"] = sum(timings.values())
+    return timings
@@ -0,0 +1,107 @@
+"""
+Classifier Batching Benchmark
+Reports GenreClassifier latency and throughput as a function of batch
+size, both for direct predict_batch calls and through the MicroBatcher
+with concurrent callers.
+
+Usage:
+    python scripts/benchmark_classifier.py [--model path/to/genre_classifier.joblib]
+"""
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+import numpy as np
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.batching import MicroBatcher
+from app.models.classifier import GenreClassifier
+
+DEFAULT_MODEL = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'models', 'genre_classifier.joblib'
+)
+
+
+def load_classifier(model_path: str) -> GenreClassifier:
+    """Load the trained model, or fit a small one on synthetic data."""
+    if os.path.exists(model_path):
+        return GenreClassifier(model_path)
+
+    from sklearn.neural_network import MLPClassifier
+    from sklearn.preprocessing import StandardScaler
+    from train_model import generate_synthetic_data
+
+    print(f"No model at {model_path}; fitting a quick one on synthetic data")
+    X, y = generate_synthetic_data(50)
+    classifier = GenreClassifier()
+    classifier.scaler = StandardScaler().fit(X)
+    classifier.model = MLPClassifier(hidden_layer_sizes=(256, 128, 64), max_iter=50, random_state=42)
+    classifier.model.fit(classifier.scaler.transform(X), [GenreClassifier.GENRES.index(g) for g in y])
+    return classifier
+
+
+def bench_direct(classifier, samples, sizes, repeat):
+    print("\nDirect predict_batch")
+    print(f"{'batch':>6} {'ms/call':>10} {'us/sample':>10} {'samples/s':>11}")
+    for size in sizes:
+        batch = samples[:size]
+        timings = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            classifier.predict_batch(batch)
+            timings.append(time.perf_counter() - start)
+        per_call = np.median(timings)
+        print(f"{size:>6} {per_call * 1000:>10.3f} {per_call / size * 1e6:>10.1f} {size / per_call:>11.0f}")
+
+
+async def bench_batcher(classifier, samples, concurrency, wait_ms):
+    loop = asyncio.get_running_loop()
+
+    async def batch_fn(rows):
+        return await loop.run_in_executor(None, classifier.predict_batch, np.vstack(rows))
+
+    batcher = MicroBatcher(batch_fn, max_batch_size=64, max_wait_ms=wait_ms)
+    latencies = []
+
+    async def client(row):
+        start = time.perf_counter()
+        await batcher.submit(row)
+        latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(client(row) for row in samples[:concurrency]))
+    elapsed = time.perf_counter() - start
+    stats = batcher.stats()
+    print(f"{concurrency:>6} {wait_ms:>8.1f} {stats['mean_batch_size']:>8.1f} "
+          f"{np.percentile(latencies, 50) * 1000:>8.2f} {np.percentile(latencies, 99) * 1000:>8.2f} "
+          f"{concurrency / elapsed:>11.0f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark batched classification")
+    parser.add_argument("--model", default=DEFAULT_MODEL, help="Trained model file")
+    parser.add_argument("--repeat", type=int, default=50, help="Timed calls per batch size")
+    args = parser.parse_args()
+
+    classifier = load_classifier(args.model)
+    samples = np.random.default_rng(0).standard_normal((512, 58))
+    sizes = [1, 2, 4, 8, 16, 32, 64, 128, 256]
+
+    print("=" * 50)
+    print("Classifier Batching Benchmark")
+    print("=" * 50)
+    bench_direct(classifier, samples, sizes, args.repeat)
+
+    print("\nMicroBatcher with concurrent callers")
+    print(f"{'conc':>6} {'wait_ms':>8} {'batch':>8} {'p50_ms':>8} {'p99_ms':>8} {'samples/s':>11}")
+    for concurrency in (1, 16, 64, 256):
+        for wait_ms in (0.5, 2.0, 5.0):
+            asyncio.run(bench_batcher(classifier, samples, concurrency, wait_ms))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,134 @@
+"""
+Recommender Embedding Benchmark
+Compares retrieval spaces (raw features, PCA, MLP hidden layer) and row
+storage types (float32, float16, int8) on catalog memory, query latency and
+retrieval quality.
+
+Quality is reported two ways: genre precision@k (share of neighbours in the
+query's genre, i.e. whether the space groups similar songs at all) and
+recall@k against float32 rows in the same space (what quantization loses).
+Catalog and queries are synthetic songs with known genres; the embeddings
+are the ones ``train_model.py`` writes.
+
+Usage:
+    python scripts/benchmark_embedding.py [--songs N] [--queries Q] [--k K]
+                                          [--pca models/embedding_pca.npz]
+                                          [--mlp models/embedding_mlp.npz] [--json out.json]
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+import numpy as np
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.models.catalog import SongCatalog
+from app.models.embedding import FeatureEmbedding
+from app.models.index import VECTOR_DTYPES, ExactIndex
+from synthetic_data import GENRES, synthetic_samples
+
+MODEL_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'models')
+
+
+def row_genres(catalog: SongCatalog) -> np.ndarray:
+    """Genre name per catalog row (rows are grouped by genre)."""
+    labels = np.empty(len(catalog), dtype=object)
+    for genre, (start, stop) in catalog.genre_offsets.items():
+        labels[start:stop] = genre
+    return labels
+
+
+def run_queries(catalog: SongCatalog, embedding, queries: np.ndarray, k: int):
+    """Top-k rows per query and per-query latencies (embedding + search) in ms."""
+    index = ExactIndex(catalog.features, normalized=True, scales=catalog.scales)
+    results, latencies = [], []
+    for query in queries:
+        start = time.perf_counter()
+        if embedding is not None:
+            query = embedding.transform(query)
+        rows, _ = index.search(query, k)
+        latencies.append(1000 * (time.perf_counter() - start))
+        results.append(rows)
+    return np.array(results), np.array(latencies), index.memory_bytes()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark recommender embeddings and storage types")
+    parser.add_argument("--songs", type=int, default=100_000, help="Catalog size")
+    parser.add_argument("--queries", type=int, default=200, help="Number of queries")
+    parser.add_argument("--k", type=int, default=10, help="Neighbours per query")
+    parser.add_argument("--pca", default=os.path.join(MODEL_DIR, 'embedding_pca.npz'))
+    parser.add_argument("--mlp", default=os.path.join(MODEL_DIR, 'embedding_mlp.npz'))
+    parser.add_argument("--json", default=None, help="Write results to this JSON file")
+    args = parser.parse_args()
+
+    print("=" * 50)
+    print("Recommender Embedding Benchmark")
+    print("=" * 50)
+
+    spaces = {"raw": None}
+    for kind, path in (("pca", args.pca), ("mlp", args.mlp)):
+        if os.path.exists(path):
+            spaces[kind] = FeatureEmbedding.load(path)
+        else:
+            print(f"No {kind} embedding at {path} (run scripts/train_model.py); skipping")
+
+    # Seeds other than the training set's, so neither side was seen in training
+    X, codes = synthetic_samples(args.songs, seed=1)
+    songs = [
+        {"id": f"syn-{row}", "title": "", "artist": "", "genre": GENRES[code], "duration": ""}
+        for row, code in enumerate(codes)
+    ]
+    queries, query_codes = synthetic_samples(args.queries, seed=2)
+    query_genres = np.array(GENRES, dtype=object)[query_codes]
+    print(f"{args.songs:,} songs, {args.queries} queries, k={args.k}")
+
+    report = {"songs": args.songs, "queries": args.queries, "k": args.k, "results": []}
+    baseline_bytes = None
+    print(f"\n{'space':<7} {'dtype':<8} {'dim':>4} {'B/song':>7} {'MiB':>7} {'memory':>7} "
+          f"{'p50_ms':>7} {'genre_p@k':>10} {'recall@k':>9}")
+    for name, embedding in spaces.items():
+        reference = None
+        for dtype in VECTOR_DTYPES:
+            catalog = SongCatalog.from_records(songs, X, embedding, dtype)
+            # One untimed query so first-call overhead is not measured
+            run_queries(catalog, embedding, queries[:1], args.k)
+            neighbours, latencies, memory = run_queries(catalog, embedding, queries, args.k)
+            if reference is None:
+                reference = neighbours
+            if baseline_bytes is None:
+                baseline_bytes = memory
+            genres = row_genres(catalog)
+            row = {
+                "space": name,
+                "dtype": dtype,
+                "dim": catalog.dim,
+                "bytes_per_song": memory / len(catalog),
+                "memory_bytes": memory,
+                "memory_vs_raw_float32": memory / baseline_bytes,
+                "p50_ms": float(np.median(latencies)),
+                "p95_ms": float(np.percentile(latencies, 95)),
+                "genre_precision": float(np.mean(genres[neighbours] == query_genres[:, None])),
+                "recall_vs_float32": float(np.mean([
+                    len(np.intersect1d(a, b)) / args.k for a, b in zip(neighbours, reference)
+                ])),
+            }
+            report["results"].append(row)
+            print(f"{name:<7} {dtype:<8} {row['dim']:>4} {row['bytes_per_song']:>7.0f} "
+                  f"{memory / 2**20:>7.1f} {row['memory_vs_raw_float32']:>7.1%} {row['p50_ms']:>7.2f} "
+                  f"{row['genre_precision']:>10.3f} {row['recall_vs_float32']:>9.3f}")
+    print(f"\nmemory: vs raw float32; genre_p@k: neighbours in the query's genre "
+          f"(chance {1 / len(GENRES):.2f}); recall@k: vs float32 in the same space")
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"\nWrote {args.json}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+"""
+Feature Extraction Benchmark
+Compares the shared-STFT extractor against the original per-feature
+librosa calls and prints a per-stage timing breakdown.
+
+Usage:
+    python scripts/benchmark_extractor.py [audio_file ...] [--repeat N]
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+try:
+    import librosa
+except ImportError:
+    print("Please install librosa: pip install librosa")
+    sys.exit(1)
+
+from app.features.extractor import AudioFeatureExtractor
+
+# Maximum allowed relative deviation from the reference feature vector
+RTOL = 1e-4
+ATOL = 1e-6
+
+
+def extract_reference(y: np.ndarray, sr: int) -> np.ndarray:
+    """Original pipeline: every librosa call recomputes its own spectrogram."""
+    features = []
+    mfccs = librosa.feature.mfcc(y=y, sr=sr, n_mfcc=20)
+    features.extend(np.mean(mfccs, axis=1))
+    features.extend(np.mean(librosa.feature.chroma_stft(y=y, sr=sr), axis=1))
+    features.append(np.mean(librosa.feature.spectral_centroid(y=y, sr=sr)))
+    features.append(np.mean(librosa.feature.spectral_bandwidth(y=y, sr=sr)))
+    features.append(np.mean(librosa.feature.spectral_rolloff(y=y, sr=sr)))
+    features.append(np.mean(librosa.feature.zero_crossing_rate(y)))
+    features.append(np.mean(librosa.feature.rms(y=y)))
+    tempo, _ = librosa.beat.beat_track(y=y, sr=sr)
+    features.append(float(tempo))
+    features.extend(np.std(mfccs, axis=1))
+    return np.array(features)
+
+
+def synthetic_clip(sr: int, duration: float, seed: int = 0) -> np.ndarray:
+    """A 120 BPM click track over a chord and noise, for runs without audio."""
+    rng = np.random.default_rng(seed)
+    t = np.arange(int(sr * duration)) / sr
+    y = 0.2 * sum(np.sin(2 * np.pi * f * t) for f in (220.0, 277.2, 329.6))
+    clicks = np.zeros_like(t)
+    clicks[(np.arange(0, duration, 0.5) * sr).astype(int)] = 1.0
+    y += np.convolve(clicks, np.hanning(256), mode="same")
+    y += 0.05 * rng.standard_normal(len(t))
+    return y.astype(np.float32)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("audio", nargs="*", help="Audio files (defaults to a synthetic clip)")
+    parser.add_argument("--repeat", type=int, default=3, help="Timed runs per clip")
+    args = parser.parse_args()
+
+    extractor = AudioFeatureExtractor()
+    if args.audio:
+        clips = [
+            (path, librosa.load(path, sr=extractor.sr, duration=extractor.duration)[0])
+            for path in args.audio
+        ]
+    else:
+        clips = [("<synthetic>", synthetic_clip(extractor.sr, extractor.duration))]
+
+    print("=" * 50)
+    print("Feature Extraction Benchmark")
+    print("=" * 50)
+
+    for name, y in clips:
+        ref_times, shared_times, stages = [], [], {}
+        for _ in range(args.repeat):
+            start = time.perf_counter()
+            reference = extract_reference(y, extractor.sr)
+            ref_times.append(time.perf_counter() - start)
+
+            timings = {}
+            start = time.perf_counter()
+            shared = extractor.extract_from_signal(y, extractor.sr, timings=timings)
+            shared_times.append(time.perf_counter() - start)
+            for stage, seconds in timings.items():
+                stages.setdefault(stage, []).append(seconds)
+
+        max_dev = np.max(np.abs(shared - reference) / (np.abs(reference) + ATOL))
+        ok = np.allclose(shared, reference, rtol=RTOL, atol=ATOL)
+
+        print(f"\n{name} ({len(y) / extractor.sr:.1f}s)")
+        print(f"  reference: {np.median(ref_times) * 1000:8.1f} ms")
+        print(f"  shared:    {np.median(shared_times) * 1000:8.1f} ms "
+              f"({np.median(ref_times) / np.median(shared_times):.2f}x)")
+        for stage, seconds in stages.items():
+            print(f"    {stage:<12} {np.median(seconds) * 1000:8.1f} ms")
+        print(f"  max relative deviation: {max_dev:.2e} "
+              f"({'OK' if ok else 'FAIL'}, rtol={RTOL})")
+
+        if not ok:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""
+Similarity Index Benchmark
+Measures recall@k and query latency of the approximate IVF/PQ index
+against exact search on a synthetic clustered catalog.
+
+Usage:
+    python scripts/benchmark_index.py [--songs N] [--queries Q] [--k K]
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.models.index import ExactIndex, IVFIndex
+
+N_FEATURES = 58
+
+
+def synthetic_catalog(n_songs: int, n_clusters: int = 200, seed: int = 0) -> np.ndarray:
+    """Gaussian clusters, roughly how songs group by style in feature space."""
+    rng = np.random.default_rng(seed)
+    centers = rng.standard_normal((n_clusters, N_FEATURES)).astype(np.float32) * 3
+    labels = rng.integers(0, n_clusters, n_songs)
+    return centers[labels] + rng.standard_normal((n_songs, N_FEATURES), dtype=np.float32)
+
+
+def evaluate(index, queries, truth, k, **search_kwargs):
+    """Return (recall@k, median ms/query, p95 ms/query)."""
+    hits, latencies = 0, []
+    for query, expected in zip(queries, truth):
+        start = time.perf_counter()
+        rows, _ = index.search(query, k, **search_kwargs)
+        latencies.append((time.perf_counter() - start) * 1000)
+        hits += len(np.intersect1d(rows, expected))
+    return hits / truth.size, np.median(latencies), np.percentile(latencies, 95)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark similarity indexes")
+    parser.add_argument("--songs", type=int, default=200_000, help="Catalog size")
+    parser.add_argument("--queries", type=int, default=200, help="Number of queries")
+    parser.add_argument("--k", type=int, default=10, help="Neighbours per query")
+    parser.add_argument("--nprobe", type=int, nargs="+", default=[1, 4, 16, 64])
+    parser.add_argument("--pq", type=int, nargs="+", default=[0, 29, 58],
+                        help="PQ bytes per vector (0 = IVF without PQ)")
+    args = parser.parse_args()
+
+    print("=" * 50)
+    print("Similarity Index Benchmark")
+    print("=" * 50)
+
+    catalog = synthetic_catalog(args.songs)
+    rng = np.random.default_rng(1)
+    queries = catalog[rng.choice(args.songs, args.queries, replace=False)]
+    queries = queries + 0.5 * rng.standard_normal(queries.shape, dtype=np.float32)
+
+    exact = ExactIndex(catalog)
+    truth = np.array([exact.search(q, args.k)[0] for q in queries])
+    _, exact_p50, exact_p95 = evaluate(exact, queries, truth, args.k)
+    print(f"\nCatalog: {args.songs} songs, k={args.k}")
+    print(f"exact            recall=1.000  p50={exact_p50:7.2f} ms  p95={exact_p95:7.2f} ms  "
+          f"mem={exact.memory_bytes() / 2**20:7.1f} MiB")
+
+    for pq in args.pq:
+        start = time.perf_counter()
+        index = IVFIndex(catalog, pq_subspaces=pq)
+        build = time.perf_counter() - start
+        label = f"ivf-pq{pq}" if pq else "ivf-flat"
+        print(f"\n{label}: {len(index.centroids)} lists, built in {build:.1f}s, "
+              f"mem={index.memory_bytes() / 2**20:.1f} MiB")
+        for nprobe in args.nprobe:
+            recall, p50, p95 = evaluate(index, queries, truth, args.k, nprobe=nprobe)
+            print(f"  nprobe={nprobe:<4} recall={recall:.3f}  p50={p50:7.2f} ms  p95={p95:7.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+"""
+Startup Benchmark
+Measures cold-start cost of the API in fresh interpreters: time to import
+app.main (when the server can accept connections), warm-up time (when it is
+ready), and the latency of the first request with and without warm-up.
+
+Usage:
+    python scripts/benchmark_startup.py [--model path/to/model] [--runs 3] [--json out.json]
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+import numpy as np
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Runs in a fresh interpreter so nothing is already imported or compiled
+CHILD = """
+import json, sys, time
+start = time.perf_counter()
+import app.main as main
+imported = time.perf_counter() - start
+result = {"import_s": imported, "ready_at_import": main.startup_state["ready"]}
+if sys.argv[1] == "warm":
+    start = time.perf_counter()
+    main._warm_up()
+    result["warmup_s"] = time.perf_counter() - start
+    result["warmup_stages"] = main.startup_state["warmup"]
+import numpy as np
+signal = np.random.default_rng(1).standard_normal(main.feature_extractor.sr * 5).astype(np.float32) * 0.1
+start = time.perf_counter()
+features = main.feature_extractor.extract_from_signal(signal, main.feature_extractor.sr)
+main.genre_classifier.predict(features)
+result["first_request_s"] = time.perf_counter() - start
+print(json.dumps(result))
+"""
+
+
+def run_child(lazy: bool, warm: bool, model_path: str) -> dict:
+    env = dict(os.environ, LAZY_LOAD="1" if lazy else "0", PYTHONPATH=BACKEND_DIR)
+    if model_path:
+        env["MODEL_PATH"] = model_path
+    output = subprocess.run(
+        [sys.executable, "-c", CHILD, "warm" if warm else "cold"],
+        cwd=BACKEND_DIR, env=env, capture_output=True, text=True, check=True
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark API cold start")
+    parser.add_argument("--model", default=None, help="MODEL_PATH for the child processes")
+    parser.add_argument("--runs", type=int, default=3, help="Fresh processes per mode")
+    parser.add_argument("--json", default=None, help="Write results to this JSON file")
+    args = parser.parse_args()
+
+    print("=" * 50)
+    print("Startup Benchmark")
+    print("=" * 50)
+
+    modes = {
+        "eager": (False, False),
+        "lazy, no warm-up": (True, False),
+        "lazy + warm-up": (True, True),
+    }
+    report = {}
+    print(f"\n{'mode':<18} {'import_s':>9} {'warmup_s':>9} {'first_req_s':>12}")
+    for name, (lazy, warm) in modes.items():
+        runs = [run_child(lazy, warm, args.model) for _ in range(args.runs)]
+        summary = {
+            key: float(np.median([run.get(key, 0.0) for run in runs]))
+            for key in ("import_s", "warmup_s", "first_request_s")
+        }
+        summary["runs"] = runs
+        report[name] = summary
+        print(f"{name:<18} {summary['import_s']:>9.2f} {summary['warmup_s']:>9.2f} "
+              f"{summary['first_request_s']:>12.3f}")
+
+    print("\nimport_s: until the server can accept connections (liveness)")
+    print("import_s + warmup_s: until /health/ready returns 200")
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"\nWrote {args.json}")
+
+
+if __name__ == "__main__":
+    main()
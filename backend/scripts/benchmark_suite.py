@@ -0,0 +1,328 @@
+"""
+End-to-End Benchmark Suite
+Measures every inference stage separately and end to end, plus HTTP load
+against an in-process server, and writes the results as JSON so runs can be
+compared across commits.
+
+Sections:
+- stages: audio decode, each feature stage of AudioFeatureExtractor,
+  GenreClassifier.predict / predict_batch, and extract+predict+recommend
+- recommend: SongRecommender.get_recommendations per catalog size
+  (synthetic catalogs, memory-mapped as in production)
+- http: concurrent POST /api/predict (upload and sample) through uvicorn
+
+Every entry reports n, mean/p50/p95/p99 ms, throughput per second and the
+process peak RSS so far. Feature and result caches are disabled unless
+--with-caches is given, so repeated inputs measure real work.
+
+Usage:
+    python scripts/benchmark_suite.py -o bench.json [--audio clip.wav] [--model model.npz]
+        [--catalog-sizes 30 1000 100000 1000000 10000000] [--compare old.json]
+"""
+import argparse
+import http.client
+import io
+import json
+import os
+import platform
+import resource
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Add parent directory to path
+sys.path.insert(0, BACKEND_DIR)
+
+from benchmark_extractor import synthetic_clip
+from synthetic_data import GENRES, synthetic_catalog
+
+DEFAULT_MODEL = os.path.join(BACKEND_DIR, 'models', 'genre_classifier.npz')
+
+
+def peak_rss_mb() -> float:
+    """Peak resident set size of this process so far."""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return peak / 1024 / (1024 if sys.platform == "darwin" else 1)
+
+
+def summarize(latencies, elapsed: float = None) -> dict:
+    """Latency percentiles (ms) and throughput for a list of seconds."""
+    latencies = np.asarray(latencies, dtype=np.float64)
+    elapsed = elapsed if elapsed is not None else latencies.sum()
+    return {
+        "n": int(len(latencies)),
+        "mean_ms": float(latencies.mean() * 1000),
+        "p50_ms": float(np.percentile(latencies, 50) * 1000),
+        "p95_ms": float(np.percentile(latencies, 95) * 1000),
+        "p99_ms": float(np.percentile(latencies, 99) * 1000),
+        "throughput_per_s": float(len(latencies) / elapsed) if elapsed > 0 else 0.0,
+        "peak_rss_mb": peak_rss_mb(),
+    }
+
+
+def timed_runs(fn, repeat: int, warmup: int = 1) -> dict:
+    """Call ``fn`` ``warmup + repeat`` times and summarize the timed calls."""
+    for _ in range(warmup):
+        fn()
+    latencies = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        latencies.append(time.perf_counter() - start)
+    return summarize(latencies)
+
+
+def wav_bytes(y: np.ndarray, sr: int) -> bytes:
+    import soundfile as sf
+
+    buffer = io.BytesIO()
+    sf.write(buffer, y, sr, format="WAV")
+    return buffer.getvalue()
+
+
+def bench_stages(api, audio: bytes, repeat: int) -> dict:
+    """Per-stage and in-process end-to-end latencies."""
+    from app.features.extractor import AudioFeatureExtractor
+
+    extractor = AudioFeatureExtractor()
+    results = {"decode": timed_runs(lambda: extractor.load_audio(audio), repeat)}
+
+    # Per-feature stages, all from the same extract calls
+    stage_times, totals = {}, []
+    extractor.extract_with_timings(audio)
+    for _ in range(repeat):
+        start = time.perf_counter()
+        features, timings = extractor.extract_with_timings(audio)
+        totals.append(time.perf_counter() - start)
+        for name, seconds in timings.items():
+            stage_times.setdefault(name, []).append(seconds)
+    for name, seconds in stage_times.items():
+        results[f"extract.{name}"] = summarize(seconds)
+    results["extract.total"] = summarize(totals)
+
+    batch = np.random.default_rng(0).standard_normal((32, len(features)))
+    results["predict"] = timed_runs(lambda: api.genre_classifier.predict(features), repeat * 10)
+    results["predict_batch32"] = timed_runs(lambda: api.genre_classifier.predict_batch(batch), repeat * 10)
+    batch_stats = results["predict_batch32"]
+    batch_stats["samples_per_s"] = batch_stats["throughput_per_s"] * len(batch)
+
+    def end_to_end():
+        vector = extractor.extract(audio)
+        prediction = api.genre_classifier.predict(vector)
+        api.song_recommender.get_recommendations(vector, prediction["genre"], 3)
+
+    results["end_to_end"] = timed_runs(end_to_end, repeat)
+    return results
+
+
+def bench_recommend(sizes, repeat: int) -> dict:
+    """Recommendation latency per catalog size."""
+    from app.models.recommender import SongRecommender
+
+    results = {}
+    rng = np.random.default_rng(0)
+    queries = rng.standard_normal((repeat, 58)).astype(np.float32)
+    genres = rng.choice(GENRES, repeat)
+    for size in sizes:
+        with tempfile.TemporaryDirectory() as catalog_dir:
+            start = time.perf_counter()
+            synthetic_catalog(size, path=catalog_dir)
+            build_s = time.perf_counter() - start
+            recommender = SongRecommender(catalog_path=catalog_dir)
+
+            latencies = []
+            for query, genre in zip(queries, genres):
+                start = time.perf_counter()
+                recommender.get_recommendations(query, genre, 3)
+                latencies.append(time.perf_counter() - start)
+            results[str(size)] = {**summarize(latencies), "build_s": build_s}
+            del recommender
+        print(f"  {size:>10,} songs: p50 {results[str(size)]['p50_ms']:.3f} ms")
+    return results
+
+
+def multipart(fields: dict, files: dict):
+    """Encode a multipart/form-data body; returns (body, content type)."""
+    boundary = "----benchmark-boundary"
+    parts = []
+    for name, value in fields.items():
+        parts.append(
+            f'--{boundary}\r\nContent-Disposition: form-data; name="{name}"\r\n\r\n{value}\r\n'.encode()
+        )
+    for name, (filename, content, content_type) in files.items():
+        parts.append(
+            f'--{boundary}\r\nContent-Disposition: form-data; name="{name}"; filename="{filename}"\r\n'
+            f'Content-Type: {content_type}\r\n\r\n'.encode() + content + b"\r\n"
+        )
+    parts.append(f"--{boundary}--\r\n".encode())
+    return b"".join(parts), f"multipart/form-data; boundary={boundary}"
+
+
+def bench_http(api, audio: bytes, concurrency_levels, requests_per_level: int) -> dict:
+    """Concurrent /api/predict load against a uvicorn server in this process."""
+    import uvicorn
+
+    config = uvicorn.Config(api.app, host="127.0.0.1", port=0, log_level="warning")
+    server = uvicorn.Server(config)
+    thread = threading.Thread(target=server.run, daemon=True)
+    thread.start()
+    while not server.started:
+        time.sleep(0.05)
+    port = server.servers[0].sockets[0].getsockname()[1]
+
+    payloads = {
+        "upload": multipart({}, {"audio_file": ("clip.wav", audio, "audio/wav")}),
+        "sample": multipart({"sample_id": "sample-2"}, {}),
+    }
+    local = threading.local()
+
+    def request(body, content_type):
+        if not hasattr(local, "conn"):
+            local.conn = http.client.HTTPConnection("127.0.0.1", port, timeout=120)
+        start = time.perf_counter()
+        local.conn.request("POST", "/api/predict", body=body, headers={"Content-Type": content_type})
+        response = local.conn.getresponse()
+        response.read()
+        return time.perf_counter() - start, response.status
+
+    results = {}
+    try:
+        for name, (body, content_type) in payloads.items():
+            for concurrency in concurrency_levels:
+                with ThreadPoolExecutor(max_workers=concurrency) as pool:
+                    start = time.perf_counter()
+                    outcomes = list(pool.map(
+                        lambda _: request(body, content_type), range(requests_per_level)
+                    ))
+                    elapsed = time.perf_counter() - start
+                key = f"{name}.c{concurrency}"
+                ok = [latency for latency, status in outcomes if status == 200]
+                results[key] = {
+                    **summarize(ok or [0.0], elapsed),
+                    "errors": len(outcomes) - len(ok),
+                }
+                print(f"  {key:<12} p50 {results[key]['p50_ms']:8.1f} ms  "
+                      f"{results[key]['throughput_per_s']:7.1f} req/s  errors {results[key]['errors']}")
+    finally:
+        server.should_exit = True
+        thread.join(timeout=10)
+    return results
+
+
+def metadata() -> dict:
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=BACKEND_DIR,
+            capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        "commit": commit,
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+    }
+
+
+def flatten(report: dict, prefix: str = "") -> dict:
+    """{'section.entry': stats} for every entry that has a p50."""
+    flat = {}
+    for key, value in report.items():
+        if isinstance(value, dict) and "p50_ms" in value:
+            flat[prefix + key] = value
+        elif isinstance(value, dict):
+            flat.update(flatten(value, f"{prefix}{key}."))
+    return flat
+
+
+def compare(baseline_path: str, report: dict):
+    """Print p50/p99 ratios against a previous report."""
+    with open(baseline_path) as f:
+        baseline = json.load(f)
+    old, new = flatten(baseline), flatten(report)
+    print(f"\nCompared with {baseline_path} (commit {baseline.get('meta', {}).get('commit')})")
+    print(f"{'entry':<36} {'p50 old':>9} {'p50 new':>9} {'ratio':>7} {'p99 ratio':>10}")
+    for key in sorted(set(old) & set(new)):
+        ratio = new[key]["p50_ms"] / old[key]["p50_ms"] if old[key]["p50_ms"] else float("nan")
+        ratio99 = new[key]["p99_ms"] / old[key]["p99_ms"] if old[key]["p99_ms"] else float("nan")
+        flag = "  <-- slower" if ratio > 1.1 else ""
+        print(f"{key:<36} {old[key]['p50_ms']:>9.3f} {new[key]['p50_ms']:>9.3f} "
+              f"{ratio:>7.2f} {ratio99:>10.2f}{flag}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the inference stack")
+    parser.add_argument("-o", "--output", default="benchmark.json", help="JSON report path")
+    parser.add_argument("--audio", default=None, help="Audio file (default: 30s synthetic clip)")
+    parser.add_argument("--model", default=os.getenv("MODEL_PATH") or DEFAULT_MODEL,
+                        help="Model served during the run")
+    parser.add_argument("--repeat", type=int, default=20, help="Timed runs per stage")
+    parser.add_argument("--catalog-sizes", type=int, nargs="+", default=[30, 1000, 100_000, 1_000_000])
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 4, 16])
+    parser.add_argument("--requests", type=int, default=64, help="HTTP requests per concurrency level")
+    parser.add_argument("--sections", nargs="+", default=["stages", "recommend", "http"],
+                        choices=["stages", "recommend", "http"])
+    parser.add_argument("--with-caches", action="store_true",
+                        help="Keep the feature/result caches enabled")
+    parser.add_argument("--compare", default=None, help="Previous report to compare against")
+    args = parser.parse_args()
+
+    if not args.with_caches:
+        os.environ["FEATURE_CACHE_SIZE"] = "0"
+        os.environ["RESULT_CACHE_SIZE"] = "0"
+        os.environ.pop("FEATURE_CACHE_DIR", None)
+    if args.model and os.path.exists(args.model):
+        os.environ["MODEL_PATH"] = args.model
+    else:
+        print(f"No model at {args.model}; using the demo model")
+    os.chdir(BACKEND_DIR)
+    import app.main as api
+
+    print("=" * 50)
+    print("Inference Benchmark Suite")
+    print("=" * 50)
+
+    if args.audio:
+        with open(args.audio, "rb") as f:
+            audio = f.read()
+    else:
+        audio = wav_bytes(synthetic_clip(22050, 30.0), 22050)
+    api._warm_up()
+
+    report = {"meta": metadata()}
+    report["meta"]["settings"] = vars(args)
+    if "stages" in args.sections:
+        print("\n[stages]")
+        report["stages"] = bench_stages(api, audio, args.repeat)
+        for name, stats in report["stages"].items():
+            print(f"  {name:<22} p50 {stats['p50_ms']:9.3f} ms  p99 {stats['p99_ms']:9.3f} ms")
+    if "recommend" in args.sections:
+        print("\n[recommend]")
+        report["recommend"] = bench_recommend(args.catalog_sizes, args.repeat * 10)
+    if "http" in args.sections:
+        print("\n[http]")
+        report["http"] = bench_http(api, audio, args.concurrency, args.requests)
+    report["meta"]["peak_rss_mb"] = peak_rss_mb()
+
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"\nPeak RSS: {report['meta']['peak_rss_mb']:.0f} MB")
+    print(f"Wrote {args.output}")
+
+    if args.compare:
+        compare(args.compare, report)
+
+
+if __name__ == "__main__":
+    main()
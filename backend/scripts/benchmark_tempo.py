@@ -0,0 +1,145 @@
+"""
+Tempo Estimator Benchmark
+Times each tempo_method on the shared onset envelope and over a whole
+extraction, and reports how closely it agrees with beat_track, the
+original tempo feature.
+
+Without audio files, click tracks at known tempos are synthesized, so the
+report also shows accuracy against the true BPM.
+
+Usage:
+    python scripts/benchmark_tempo.py [audio_file_or_dir ...] [--repeat N] [--json out.json]
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+import numpy as np
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+try:
+    import librosa
+except ImportError:
+    print("Please install librosa: pip install librosa")
+    sys.exit(1)
+
+from app.features.extractor import HOP_LENGTH, N_FFT, TEMPO_METHODS, AudioFeatureExtractor, estimate_tempo
+from extract_features import iter_audio_files
+
+# Relative tempo difference still counted as agreeing (the usual MIREX tolerance)
+TOLERANCE = 0.04
+
+SYNTHETIC_BPMS = (60, 72, 85, 96, 110, 120, 128, 140, 155, 174)
+
+
+def click_track(sr: int, duration: float, bpm: float, seed: int = 0) -> np.ndarray:
+    """Accented clicks at ``bpm`` over a low drone and noise."""
+    rng = np.random.default_rng(seed)
+    t = np.arange(int(sr * duration)) / sr
+    y = 0.1 * np.sin(2 * np.pi * 110.0 * t)
+    beats = (np.arange(0, duration, 60.0 / bpm) * sr).astype(int)
+    clicks = np.zeros_like(t)
+    clicks[beats] = 1.0
+    clicks[beats[::4]] = 1.5
+    y += np.convolve(clicks, np.hanning(256), mode="same")
+    y += 0.05 * rng.standard_normal(len(t))
+    return y.astype(np.float32)
+
+
+def onset_envelope(y: np.ndarray, sr: int) -> np.ndarray:
+    """The envelope the extractor computes from its shared log-mel spectrogram."""
+    power = np.abs(librosa.stft(y, n_fft=N_FFT, hop_length=HOP_LENGTH)) ** 2
+    log_mel = librosa.power_to_db(librosa.feature.melspectrogram(S=power, sr=sr))
+    return librosa.onset.onset_strength(S=log_mel, sr=sr, aggregate=np.median)
+
+
+def agrees(estimate: float, reference: float) -> bool:
+    return abs(estimate - reference) <= TOLERANCE * reference
+
+
+def octave_error(estimate: float, reference: float) -> bool:
+    return any(agrees(estimate, reference * factor) for factor in (0.5, 2.0, 1 / 3, 3.0))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark tempo estimators")
+    parser.add_argument("audio", nargs="*", help="Audio files or directories (defaults to click tracks)")
+    parser.add_argument("--repeat", type=int, default=5, help="Timed runs per clip and method")
+    parser.add_argument("--json", default=None, help="Write results to this JSON file")
+    args = parser.parse_args()
+
+    sr, duration = 22050, 30.0
+    if args.audio:
+        clips = [
+            (path, librosa.load(path, sr=sr, duration=duration)[0], None)
+            for path in iter_audio_files(args.audio)
+        ]
+    else:
+        clips = [(f"<click {bpm} bpm>", click_track(sr, duration, bpm, seed=bpm), float(bpm))
+                 for bpm in SYNTHETIC_BPMS]
+
+    print("=" * 50)
+    print("Tempo Estimator Benchmark")
+    print("=" * 50)
+    print(f"{len(clips)} clips, {args.repeat} runs each")
+
+    extractors = {method: AudioFeatureExtractor(sr=sr, duration=duration, tempo_method=method)
+                  for method in TEMPO_METHODS}
+    results = {method: {"tempo_ms": [], "extract_ms": [], "tempos": []} for method in TEMPO_METHODS}
+    truths = []
+    for name, y, true_bpm in clips:
+        envelope = onset_envelope(y, sr)
+        truths.append(true_bpm)
+        for method in TEMPO_METHODS:
+            # One untimed call so JIT compilation and imports are not measured
+            tempo = estimate_tempo(envelope, sr, method)
+            times = []
+            for _ in range(args.repeat):
+                start = time.perf_counter()
+                estimate_tempo(envelope, sr, method)
+                times.append(time.perf_counter() - start)
+            start = time.perf_counter()
+            extractors[method].extract_from_signal(y, sr)
+            results[method]["extract_ms"].append(1000 * (time.perf_counter() - start))
+            results[method]["tempo_ms"].append(1000 * float(np.median(times)))
+            results[method]["tempos"].append(tempo)
+
+    reference = results["beat_track"]["tempos"]
+    report = {"clips": len(clips), "tolerance": TOLERANCE, "methods": {}}
+    print(f"\n{'method':<11} {'tempo_ms':>9} {'speedup':>8} {'extract_ms':>11} "
+          f"{'identical':>10} {'agree':>7} {'octave':>7} {'vs_true':>8}")
+    for method in TEMPO_METHODS:
+        tempos = results[method]["tempos"]
+        tempo_ms = float(np.mean(results[method]["tempo_ms"]))
+        row = {
+            "tempo_ms": tempo_ms,
+            "speedup": float(np.mean(results["beat_track"]["tempo_ms"])) / tempo_ms,
+            "extract_ms": float(np.mean(results[method]["extract_ms"])),
+            "identical": float(np.mean([abs(a - b) < 1e-6 for a, b in zip(tempos, reference)])),
+            "agree": float(np.mean([agrees(a, b) for a, b in zip(tempos, reference)])),
+            "octave_errors": float(np.mean([
+                not agrees(a, b) and octave_error(a, b) for a, b in zip(tempos, reference)
+            ])),
+            "mean_abs_diff_bpm": float(np.mean(np.abs(np.subtract(tempos, reference)))),
+            "accuracy_vs_true": None,
+        }
+        if all(truth is not None for truth in truths):
+            row["accuracy_vs_true"] = float(np.mean([agrees(a, b) for a, b in zip(tempos, truths)]))
+        report["methods"][method] = row
+        vs_true = f"{row['accuracy_vs_true']:.0%}" if row["accuracy_vs_true"] is not None else "-"
+        print(f"{method:<11} {row['tempo_ms']:>9.2f} {row['speedup']:>7.1f}x {row['extract_ms']:>11.1f} "
+              f"{row['identical']:>10.0%} {row['agree']:>7.0%} {row['octave_errors']:>7.0%} {vs_true:>8}")
+    print(f"\nagree: within {TOLERANCE:.0%} of beat_track; octave: off by a factor of 2 or 3 instead")
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"\nWrote {args.json}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,167 @@
+"""
+Worker Memory Benchmark
+Starts scripts/serve.py with several workers in each sharing mode (neither,
+--shared, --preload, both) and reports per-worker memory (RSS, PSS, private)
+and time until /health/ready.
+
+PSS (proportional set size) splits shared pages between the processes that
+map them, so its sum is the real memory cost of the worker pool; RSS counts
+shared pages in full for every worker. Linux only (reads /proc).
+
+Usage:
+    python scripts/benchmark_workers.py [--workers 4] [--model models/genre_classifier.joblib]
+                                        [--catalog path/to/catalog] [--json out.json]
+"""
+import argparse
+import json
+import os
+import signal
+import subprocess
+import sys
+import time
+import urllib.error
+import urllib.request
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def children_of(pid: int):
+    """All descendant PIDs of ``pid`` found by scanning /proc."""
+    parents = {}
+    for entry in os.listdir("/proc"):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f"/proc/{entry}/stat") as f:
+                # Field 4 is the parent PID; the command name may contain spaces
+                parents[int(entry)] = int(f.read().rsplit(")", 1)[1].split()[1])
+        except (OSError, IndexError, ValueError):
+            continue
+    found, frontier = [], [pid]
+    while frontier:
+        parent = frontier.pop()
+        kids = [child for child, ppid in parents.items() if ppid == parent]
+        found.extend(kids)
+        frontier.extend(kids)
+    return found
+
+
+def memory_kb(pid: int) -> dict:
+    """Rss, Pss and private (USS) kilobytes from /proc/<pid>/smaps_rollup."""
+    values = {}
+    with open(f"/proc/{pid}/smaps_rollup") as f:
+        for line in f:
+            parts = line.split()
+            if len(parts) >= 2 and parts[0].endswith(":") and parts[1].isdigit():
+                values[parts[0][:-1]] = int(parts[1])
+    private = values.get("Private_Clean", 0) + values.get("Private_Dirty", 0)
+    return {"rss": values.get("Rss", 0), "pss": values.get("Pss", 0), "private": private}
+
+
+def is_worker(pid: int, preload: bool) -> bool:
+    try:
+        with open(f"/proc/{pid}/cmdline", "rb") as f:
+            cmdline = f.read().replace(b"\0", b" ")
+    except OSError:
+        return False
+    if b"resource_tracker" in cmdline:
+        return False
+    # Forked workers keep the parent's command line; spawned ones do not
+    return b"serve.py" in cmdline if preload else b"multiprocessing" in cmdline
+
+
+def wait_ready(port: int, checks: int, timeout: float) -> float:
+    """Seconds until /health/ready has answered 200 ``checks`` times in a row."""
+    start = time.perf_counter()
+    streak = 0
+    while streak < checks:
+        if time.perf_counter() - start > timeout:
+            raise TimeoutError("Server did not become ready")
+        try:
+            with urllib.request.urlopen(f"http://127.0.0.1:{port}/health/ready", timeout=2) as response:
+                streak = streak + 1 if response.status == 200 else 0
+        except (urllib.error.URLError, ConnectionError, OSError):
+            streak = 0
+            time.sleep(0.1)
+    return time.perf_counter() - start
+
+
+def run_mode(shared: bool, preload: bool, args) -> dict:
+    command = [sys.executable, os.path.join(BACKEND_DIR, "scripts", "serve.py"),
+               "--workers", str(args.workers), "--port", str(args.port), "--host", "127.0.0.1"]
+    if args.model:
+        command += ["--model", args.model]
+    if args.catalog:
+        command += ["--catalog", args.catalog]
+    if shared:
+        command.append("--shared")
+    if preload:
+        command.append("--preload")
+
+    server = subprocess.Popen(command, cwd=BACKEND_DIR, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        ready_s = wait_ready(args.port, checks=args.workers * 4, timeout=args.timeout)
+        # Give every worker's background warm-up time to finish
+        time.sleep(args.settle)
+        workers = [pid for pid in children_of(server.pid) if is_worker(pid, preload)]
+        per_worker = [memory_kb(pid) for pid in workers]
+    finally:
+        server.send_signal(signal.SIGINT)
+        try:
+            server.wait(timeout=30)
+        except subprocess.TimeoutExpired:
+            server.kill()
+
+    n = max(len(per_worker), 1)
+    return {
+        "ready_s": ready_s,
+        "workers": len(per_worker),
+        "rss_mb_per_worker": sum(m["rss"] for m in per_worker) / n / 1024,
+        "pss_mb_per_worker": sum(m["pss"] for m in per_worker) / n / 1024,
+        "private_mb_per_worker": sum(m["private"] for m in per_worker) / n / 1024,
+        "pss_mb_total": sum(m["pss"] for m in per_worker) / 1024,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark per-worker memory")
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--model", default=os.path.join(BACKEND_DIR, "models", "genre_classifier.joblib"))
+    parser.add_argument("--catalog", default=None, help="Saved catalog directory")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--timeout", type=float, default=120.0, help="Seconds to wait for readiness")
+    parser.add_argument("--settle", type=float, default=5.0, help="Seconds to wait after ready")
+    parser.add_argument("--json", default=None, help="Write results to this JSON file")
+    args = parser.parse_args()
+    if args.model and not os.path.exists(args.model):
+        print(f"No model at {args.model}; using the demo model")
+        args.model = None
+
+    print("=" * 50)
+    print("Worker Memory Benchmark")
+    print("=" * 50)
+
+    report = {}
+    print(f"\n{'mode':<10} {'workers':>7} {'ready_s':>8} {'rss_mb':>8} {'pss_mb':>8} {'priv_mb':>8} {'pss_total':>10}")
+    modes = (
+        ("private", False, False),
+        ("shared", True, False),
+        ("preload", False, True),
+        ("both", True, True),
+    )
+    for name, shared, preload in modes:
+        result = run_mode(shared, preload, args)
+        report[name] = result
+        print(f"{name:<10} {result['workers']:>7} {result['ready_s']:>8.2f} "
+              f"{result['rss_mb_per_worker']:>8.1f} {result['pss_mb_per_worker']:>8.1f} "
+              f"{result['private_mb_per_worker']:>8.1f} {result['pss_mb_total']:>10.1f}")
+    print("\nper-worker columns are means; pss_total is the pool's real footprint")
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"\nWrote {args.json}")
+
+
+if __name__ == "__main__":
+    main()
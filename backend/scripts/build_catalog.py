@@ -0,0 +1,87 @@
+"""
+Catalog Build Script
+Writes a memory-mappable song catalog for the recommender.
+
+Usage:
+    python scripts/build_catalog.py <output_dir>
+    python scripts/build_catalog.py <output_dir> --songs songs.json --features features.npz
+    python scripts/build_catalog.py <output_dir> --embedding models/embedding_pca.npz --dtype int8
+    python scripts/build_catalog.py <output_dir> --index ivf --index-params '{"nprobe": 16}'
+
+``songs.json`` is a list of {id, title, artist, genre, duration, path}
+records; ``features.npz`` is the output of ``extract_features.py`` and is
+joined to the songs on ``path``. Without these, the demo SONG_DATABASE is
+written with its mock feature vectors.
+
+With ``--embedding`` the rows are stored in that retrieval space (serve the
+catalog with the same RECOMMENDER_EMBEDDING), and ``--dtype`` stores them
+as float16 or int8. With ``--index ivf`` the IVF index is trained here and
+saved with the catalog; serve it with the same RECOMMENDER_INDEX and
+RECOMMENDER_INDEX_PARAMS and the server maps it instead of retraining.
+"""
+import argparse
+import json
+import os
+import sys
+
+import numpy as np
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.models.catalog import SongCatalog
+from app.models.embedding import FeatureEmbedding
+from app.models.index import INDEX_TYPES, VECTOR_DTYPES, build_index
+from app.models.recommender import SongRecommender
+
+
+def load_songs(songs_path: str, features_path: str):
+    """Join song metadata with extracted feature vectors on file path."""
+    with open(songs_path) as f:
+        songs = json.load(f)
+    data = np.load(features_path)
+    by_path = {str(path): row for row, path in enumerate(data["paths"])}
+
+    matched, rows = [], []
+    for song in songs:
+        row = by_path.get(song.get("path"))
+        if row is None:
+            print(f"Skipping {song.get('id')}: no features for {song.get('path')}")
+            continue
+        matched.append(song)
+        rows.append(row)
+    return matched, data["features"][rows]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build a song catalog")
+    parser.add_argument("output", help="Catalog directory to write")
+    parser.add_argument("--songs", help="JSON list of song records")
+    parser.add_argument("--features", help=".npz from extract_features.py")
+    parser.add_argument("--embedding", help="Embedding .npz from train_model.py to store rows in")
+    parser.add_argument("--dtype", choices=VECTOR_DTYPES, default="float32", help="Row storage type")
+    parser.add_argument("--index", choices=sorted(INDEX_TYPES), default="exact",
+                        help="Similarity index to train and save with the catalog")
+    parser.add_argument("--index-params", default="{}", help="Index parameters as JSON")
+    args = parser.parse_args()
+
+    embedding = FeatureEmbedding.load(args.embedding) if args.embedding else None
+    if args.songs and args.features:
+        songs, features = load_songs(args.songs, args.features)
+        catalog = SongCatalog.from_records(songs, features, embedding, args.dtype)
+    elif args.songs or args.features:
+        parser.error("--songs and --features must be given together")
+    else:
+        catalog = SongRecommender(embedding=embedding, vector_dtype=args.dtype).catalog
+
+    index = build_index(
+        args.index, catalog.features, normalized=True, scales=catalog.scales,
+        **json.loads(args.index_params)
+    )
+    catalog.save(args.output, index)
+    print(f"Wrote {len(catalog)} songs ({len(catalog.genres)} genres, {catalog.space} {catalog.dtype}, "
+          f"version {catalog.version}) to: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
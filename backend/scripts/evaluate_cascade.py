@@ -0,0 +1,134 @@
+"""
+Extraction Cascade Evaluation
+Measures how often the early-exit cascade (CASCADE_THRESHOLD) skips the full
+extraction on a labeled audio set, and what that costs in accuracy.
+
+Every file is extracted once from the short excerpt and once in full; each
+threshold is then simulated on the two prediction sets, so a sweep costs
+no more than a single pass. The per-file cost assumes an early exit pays
+only for the excerpt and every other file pays for both extractions.
+
+Usage:
+    python scripts/evaluate_cascade.py --data-dir path/to/genres [--early-seconds 5]
+                                       [--thresholds 0.5,0.6,0.7,0.8,0.9]
+                                       [--model models/genre_classifier.npz] [--json out.json]
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+import numpy as np
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.features.extractor import AudioFeatureExtractor
+from app.models.classifier import GenreClassifier
+from train_model import find_labeled_audio
+
+MODEL_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'models')
+
+
+def extract_all(extractor: AudioFeatureExtractor, paths, workers: int):
+    """Feature vectors for every path (None on failure) and mean seconds per file."""
+    stats = {}
+    start = time.perf_counter()
+    features = dict(extractor.extract_batch(paths, workers=workers, stats=stats))
+    elapsed = time.perf_counter() - start
+    # Wall time per file on this pool, i.e. the throughput cost of one extraction
+    return [features.get(path) for path in paths], elapsed / max(len(paths), 1)
+
+
+def simulate(threshold, early, full, labels, early_cost, full_cost) -> dict:
+    """Cascade outcome for one threshold from precomputed early/full predictions."""
+    exits = early["confidence"] >= threshold
+    predicted = np.where(exits, early["genre"], full["genre"])
+    exited = int(exits.sum())
+    return {
+        "threshold": threshold,
+        "early_exit_rate": exited / len(labels),
+        "accuracy": float(np.mean(predicted == labels)),
+        "early_exit_accuracy": float(np.mean(early["genre"][exits] == labels[exits])) if exited else None,
+        "ms_per_file": 1000 * (early_cost + (1 - exits.mean()) * full_cost),
+    }
+
+
+def predictions(classifier: GenreClassifier, matrix: np.ndarray) -> dict:
+    results = classifier.predict_batch(matrix)
+    return {
+        "genre": np.array([r["genre"] for r in results]),
+        "confidence": np.array([r["confidence"] for r in results]),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Evaluate the early-exit extraction cascade")
+    parser.add_argument("--data-dir", required=True, help="Corpus root with one subdirectory per genre")
+    parser.add_argument("--model", default=os.path.join(MODEL_DIR, 'genre_classifier.npz'))
+    parser.add_argument("--early-seconds", type=float, default=5.0, help="Excerpt length of the first stage")
+    parser.add_argument("--thresholds", default="0.5,0.6,0.7,0.8,0.9,0.95",
+                        help="Comma-separated confidence thresholds")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="Extraction processes (1 runs in-process and gives the steadiest per-file costs)")
+    parser.add_argument("--json", default=None, help="Write results to this JSON file")
+    args = parser.parse_args()
+
+    print("=" * 50)
+    print("Extraction Cascade Evaluation")
+    print("=" * 50)
+
+    items = find_labeled_audio(args.data_dir)
+    if not items:
+        print(f"No labeled audio found under {args.data_dir}")
+        sys.exit(1)
+    paths = [path for path, _ in items]
+    classifier = GenreClassifier(args.model if os.path.exists(args.model) else None)
+    if classifier.version == "demo":
+        print(f"No model at {args.model}; using the demo model")
+
+    early_extractor = AudioFeatureExtractor(duration=args.early_seconds)
+    full_extractor = AudioFeatureExtractor()
+    # First calls pay for imports and JIT compilation; keep that out of the costs
+    early_extractor.extract(paths[0])
+    full_extractor.extract(paths[0])
+    print(f"Extracting {len(paths)} files ({args.early_seconds:g}s excerpt, then {full_extractor.duration:g}s)...")
+    early_features, early_cost = extract_all(early_extractor, paths, args.workers)
+    full_features, full_cost = extract_all(full_extractor, paths, args.workers)
+
+    # Files where either pass failed are left out
+    keep = [i for i in range(len(paths)) if early_features[i] is not None and full_features[i] is not None]
+    if len(keep) < len(paths):
+        print(f"Skipping {len(paths) - len(keep)} files that failed to decode")
+    labels = np.array([items[i][1] for i in keep])
+    early = predictions(classifier, np.vstack([early_features[i] for i in keep]))
+    full = predictions(classifier, np.vstack([full_features[i] for i in keep]))
+
+    report = {
+        "files": len(keep),
+        "early_seconds": args.early_seconds,
+        "full": {"accuracy": float(np.mean(full["genre"] == labels)), "ms_per_file": 1000 * full_cost},
+        "early_only": {"accuracy": float(np.mean(early["genre"] == labels)), "ms_per_file": 1000 * early_cost},
+        "cascade": [
+            simulate(float(t), early, full, labels, early_cost, full_cost)
+            for t in args.thresholds.split(",")
+        ],
+    }
+
+    print(f"\n{'mode':<16} {'exit_rate':>9} {'accuracy':>9} {'exit_acc':>9} {'ms/file':>9}")
+    for name in ("full", "early_only"):
+        print(f"{name:<16} {'':>9} {report[name]['accuracy']:>9.3f} {'':>9} {report[name]['ms_per_file']:>9.1f}")
+    for row in report["cascade"]:
+        exit_acc = f"{row['early_exit_accuracy']:.3f}" if row["early_exit_accuracy"] is not None else "-"
+        print(f"{'cascade@' + format(row['threshold'], 'g'):<16} {row['early_exit_rate']:>9.1%} "
+              f"{row['accuracy']:>9.3f} {exit_acc:>9} {row['ms_per_file']:>9.1f}")
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"\nWrote {args.json}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""
+Model Export Script
+Compiles the trained sklearn model into a NumPy-only inference kernel and
+measures import cost, per-call latency and accuracy drift against sklearn.
+
+Usage:
+    python scripts/export_model.py [--model models/genre_classifier.joblib] [--int8]
+"""
+import argparse
+import os
+import subprocess
+import sys
+import time
+
+import numpy as np
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+try:
+    import joblib
+except ImportError:
+    print("Please install joblib: pip install joblib")
+    sys.exit(1)
+
+from app.models.compiled import CompiledMLP
+from train_model import generate_synthetic_data
+
+MODEL_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'models')
+
+
+def import_cost(statement: str, repeat: int = 3) -> float:
+    """Median wall-clock seconds to run ``statement`` in a fresh interpreter."""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, "-c", statement], check=True)
+        timings.append(time.perf_counter() - start)
+    return float(np.median(timings))
+
+
+def latency_us(fn, X, repeat: int = 200) -> float:
+    """Median microseconds per call."""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn(X)
+        timings.append(time.perf_counter() - start)
+    return float(np.median(timings) * 1e6)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Export a NumPy inference kernel")
+    parser.add_argument("--model", default=os.path.join(MODEL_DIR, 'genre_classifier.joblib'))
+    parser.add_argument("--output", default=None, help="Output .npz (default next to the model)")
+    parser.add_argument("--int8", action="store_true", help="Store int8-quantized weights")
+    args = parser.parse_args()
+
+    data = joblib.load(args.model)
+    model, scaler = data['model'], data['scaler']
+    output = args.output or os.path.splitext(args.model)[0] + ('.int8.npz' if args.int8 else '.npz')
+
+    CompiledMLP.from_sklearn(model, scaler).save(output, quantize=args.int8)
+    compiled = CompiledMLP.load(output)
+
+    print("=" * 50)
+    print("Model Export")
+    print("=" * 50)
+    print(f"Saved: {output} ({os.path.getsize(output) / 1024:.0f} KiB, "
+          f"joblib {os.path.getsize(args.model) / 1024:.0f} KiB)")
+
+    # Accuracy drift on held-out style synthetic data
+    X, _ = generate_synthetic_data(200)
+    reference = model.predict_proba(scaler.transform(X))
+    approx = compiled.predict_proba(X)
+    agreement = np.mean(reference.argmax(axis=1) == approx.argmax(axis=1))
+    print(f"\nMax |p_sklearn - p_compiled|: {np.abs(reference - approx).max():.2e}")
+    print(f"Top-1 agreement: {agreement * 100:.2f}% on {len(X)} samples")
+
+    print("\nPer-call latency (median)")
+    for size in (1, 64):
+        batch = X[:size]
+        sk = latency_us(lambda b: model.predict_proba(scaler.transform(b)), batch)
+        np_us = latency_us(compiled.predict_proba, batch)
+        print(f"  batch {size:>3}: sklearn {sk:8.1f} us   compiled {np_us:8.1f} us   ({sk / np_us:.1f}x)")
+
+    print("\nImport cost (fresh interpreter, median)")
+    base = import_cost("import numpy")
+    sk = import_cost("import numpy, joblib, sklearn.neural_network, sklearn.preprocessing")
+    print(f"  numpy only:          {base * 1000:7.0f} ms")
+    print(f"  numpy+sklearn+joblib: {sk * 1000:7.0f} ms (+{(sk - base) * 1000:.0f} ms)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+"""
+Multi-Worker Server Launcher
+Starts uvicorn with several worker processes, optionally sharing one copy of
+the model and catalog between them.
+
+With --shared the parent compiles the model to a NumPy kernel and writes it
+and the catalog as .npy directories on /dev/shm (see app/shared.py) before
+starting workers; every worker memory-maps them read-only, so weights and
+catalog matrices are held once in shared memory instead of once per worker
+and workers never import sklearn. With RECOMMENDER_INDEX=ivf the index is
+trained once here and published with the catalog.
+
+With --preload (Linux/macOS) the parent imports the app and runs the
+warm-up once, then forks the workers, which serve from one shared listening
+socket. Imported libraries (librosa, scipy, numba-compiled kernels) and
+loaded models are then shared copy-on-write instead of being rebuilt in
+every worker, and workers are ready as soon as they fork.
+
+Use scripts/benchmark_workers.py to compare per-worker memory and startup
+time across modes.
+
+Usage:
+    python scripts/serve.py [--workers 4] [--shared] [--preload]
+                            [--model models/genre_classifier.joblib]
+                            [--catalog path/to/catalog] [--shared-dir /dev/shm/genre-api]
+"""
+import argparse
+import gc
+import json
+import os
+import signal
+import socket
+import sys
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Add parent directory to path
+sys.path.insert(0, BACKEND_DIR)
+
+try:
+    import uvicorn
+except ImportError:
+    print("Please install uvicorn: pip install uvicorn")
+    sys.exit(1)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the API with several workers")
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--model", default=os.getenv("MODEL_PATH"), help="Model file")
+    parser.add_argument("--catalog", default=os.getenv("CATALOG_PATH"), help="Saved catalog directory")
+    parser.add_argument("--shared", action="store_true",
+                        help="Publish model and catalog once and memory-map them in every worker")
+    parser.add_argument("--shared-dir", default=None, help="Where to publish (default /dev/shm/genre-api)")
+    parser.add_argument("--preload", action="store_true",
+                        help="Load and warm up once in the parent, then fork workers")
+    args = parser.parse_args()
+
+    os.chdir(BACKEND_DIR)
+    if args.model:
+        os.environ["MODEL_PATH"] = args.model
+    if args.catalog:
+        os.environ["CATALOG_PATH"] = args.catalog
+
+    if args.shared:
+        from app.shared import DEFAULT_SHARED_DIR, publish_shared
+
+        env = publish_shared(
+            args.shared_dir or DEFAULT_SHARED_DIR, args.model, args.catalog,
+            os.getenv("RECOMMENDER_EMBEDDING") or None, os.getenv("RECOMMENDER_VECTOR_DTYPE", "float32"),
+            os.getenv("RECOMMENDER_INDEX", "exact"), json.loads(os.getenv("RECOMMENDER_INDEX_PARAMS", "{}"))
+        )
+        os.environ.update(env)
+        for name, value in env.items():
+            print(f"Shared {name}={value}")
+
+    if args.preload:
+        serve_preforked(args.host, args.port, args.workers)
+    else:
+        uvicorn.run("app.main:app", host=args.host, port=args.port, workers=args.workers)
+
+
+def serve_preforked(host: str, port: int, workers: int):
+    """Import and warm the app here, then fork ``workers`` servers on one socket."""
+    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind((host, port))
+    sock.listen(2048)
+    sock.set_inheritable(True)
+
+    import app.main as api
+    api._warm_up()
+    # Keep startup objects out of GC scans so collections do not touch
+    # (and un-share) their pages in the workers
+    gc.freeze()
+
+    children = []
+    for _ in range(workers):
+        pid = os.fork()
+        if pid == 0:
+            config = uvicorn.Config(api.app, lifespan="on")
+            uvicorn.Server(config).run(sockets=[sock])
+            os._exit(0)
+        children.append(pid)
+    print(f"Forked {workers} workers on http://{host}:{port}")
+
+    def stop(signum, _frame):
+        for child in children:
+            try:
+                os.kill(child, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+
+    signal.signal(signal.SIGINT, stop)
+    signal.signal(signal.SIGTERM, stop)
+    for child in children:
+        os.waitpid(child, 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,228 @@
+"""
+Synthetic Data Generator
+Vectorized labeled feature vectors and song catalogs for training demos and
+load/scale testing.
+
+Usage:
+    python scripts/synthetic_data.py samples 5000000 out/samples    # X.npy (float32), y.npy (uint8)
+    python scripts/synthetic_data.py catalog 2000000 out/catalog    # SongCatalog directory (CATALOG_PATH)
+    python scripts/synthetic_data.py catalog 2000000 out/catalog --embedding models/embedding_pca.npz --dtype int8
+
+Samples are generated in fixed-size chunks from ``np.random.Generator``
+streams seeded by (seed, 0, chunk index) and written straight into ``.npy``
+memmaps, so memory stays bounded and the output is identical for a given
+seed however it is consumed.
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.models.catalog import SongCatalog
+from app.models.embedding import FeatureEmbedding
+from app.models.index import VECTOR_DTYPES, normalize_rows, quantize_rows
+
+GENRES = [
+    'rock', 'pop', 'jazz', 'classical', 'hiphop',
+    'electronic', 'blues', 'country', 'metal', 'reggae'
+]
+
+N_FEATURES = 58
+
+# Per genre: (feature ranges shifted by an offset, tempo mean, tempo std)
+GENRE_PROFILES = {
+    'rock': ([(0, 5, 2.0)], 120, 20),           # Higher low-frequency MFCCs
+    'pop': ([(32, 35, 1.2)], 120, 15),          # Bright sound
+    'jazz': ([(20, 32, 1.0)], 100, 40),         # Rich chroma, variable tempo
+    'classical': ([(10, 15, 1.5)], 80, 30),     # More harmonic content
+    'hiphop': ([(0, 10, 1.5)], 90, 15),         # Strong bass
+    'electronic': ([(32, 35, 2.0)], 128, 10),   # Higher spectral features, steady tempo
+    'blues': ([(5, 15, 1.0)], 80, 20),          # Soulful MFCCs, slower tempo
+    'country': ([(20, 32, 0.8)], 110, 20),      # Guitar harmonics
+    'metal': ([(32, 35, 3.0), (35, 36, 2.0)], 140, 30),  # High centroid and ZCR, fast
+    'reggae': ([(0, 5, 1.5)], 80, 10),          # Bass-heavy, slower tempo
+}
+
+# Profiles as arrays indexed by genre code
+OFFSETS = np.zeros((len(GENRES), N_FEATURES), dtype=np.float32)
+TEMPO_MEAN = np.zeros(len(GENRES), dtype=np.float32)
+TEMPO_STD = np.zeros(len(GENRES), dtype=np.float32)
+for _code, _genre in enumerate(GENRES):
+    _ranges, TEMPO_MEAN[_code], TEMPO_STD[_code] = GENRE_PROFILES[_genre]
+    for _start, _stop, _shift in _ranges:
+        OFFSETS[_code, _start:_stop] += _shift
+
+CHUNK = 262_144
+
+
+def synthetic_features(codes: np.ndarray, seed: int = 0, out: np.ndarray = None) -> np.ndarray:
+    """
+    Feature vectors for the given genre codes.
+
+    Args:
+        codes: Genre index (into GENRES) per row
+        seed: Random seed
+        out: Optional preallocated (len(codes) x 58) float32 array or memmap
+
+    Returns:
+        Feature matrix (``out`` if given)
+    """
+    n = len(codes)
+    if out is None:
+        out = np.empty((n, N_FEATURES), dtype=np.float32)
+    for chunk, start in enumerate(range(0, n, CHUNK)):
+        rng = np.random.default_rng([seed, 0, chunk])
+        block_codes = codes[start:start + CHUNK]
+        block = rng.standard_normal((len(block_codes), N_FEATURES), dtype=np.float32)
+        block += OFFSETS[block_codes]
+        tempo_noise = rng.standard_normal(len(block_codes), dtype=np.float32)
+        block[:, -1] = TEMPO_MEAN[block_codes] + tempo_noise * TEMPO_STD[block_codes]
+        out[start:start + len(block_codes)] = block
+    return out
+
+
+def synthetic_samples(n_samples: int, seed: int = 0, out_dir: str = None):
+    """
+    Labeled samples with uniformly random genres.
+
+    Args:
+        n_samples: Number of rows
+        seed: Random seed
+        out_dir: Write ``X.npy`` and ``y.npy`` here and return memmaps
+
+    Returns:
+        Tuple of (feature matrix, uint8 genre codes)
+    """
+    labels_rng = np.random.default_rng([seed, 1])
+    codes = labels_rng.integers(0, len(GENRES), n_samples).astype(np.uint8)
+    if out_dir is None:
+        return synthetic_features(codes, seed), codes
+
+    os.makedirs(out_dir, exist_ok=True)
+    X = np.lib.format.open_memmap(
+        os.path.join(out_dir, 'X.npy'), mode='w+', dtype=np.float32, shape=(n_samples, N_FEATURES)
+    )
+    synthetic_features(codes, seed, out=X)
+    X.flush()
+    np.save(os.path.join(out_dir, 'y.npy'), codes)
+    return X, codes
+
+
+def _numbered_column(prefix: str, numbers: np.ndarray, digits: int):
+    """Fixed-width ``prefix + zero-padded number`` strings as (offsets, bytes)."""
+    width = len(prefix) + digits
+    chars = np.empty((len(numbers), width), dtype=np.uint8)
+    chars[:, :len(prefix)] = np.frombuffer(prefix.encode(), dtype=np.uint8)
+    powers = 10 ** np.arange(digits - 1, -1, -1, dtype=np.int64)
+    chars[:, len(prefix):] = (numbers[:, None] // powers) % 10 + ord('0')
+    offsets = np.arange(len(numbers) + 1, dtype=np.int64) * width
+    return offsets, chars.ravel()
+
+
+def synthetic_catalog(
+    n_songs: int,
+    seed: int = 0,
+    path: str = None,
+    embedding: FeatureEmbedding = None,
+    dtype: str = "float32"
+) -> SongCatalog:
+    """
+    Song catalog with genre-profiled feature vectors.
+
+    Rows are generated already grouped by genre, so no sort or Python
+    record is needed even for millions of songs.
+
+    Args:
+        n_songs: Catalog size
+        seed: Random seed
+        path: Save the catalog to this directory (for CATALOG_PATH)
+        embedding: Store rows in this embedding space (RECOMMENDER_EMBEDDING)
+        dtype: Row storage type (RECOMMENDER_VECTOR_DTYPE)
+
+    Returns:
+        The catalog (memory-mapped from ``path`` when given)
+    """
+    counts = np.full(len(GENRES), n_songs // len(GENRES))
+    counts[:n_songs % len(GENRES)] += 1
+    codes = np.repeat(np.arange(len(GENRES), dtype=np.uint8), counts)
+    rows = np.arange(n_songs, dtype=np.int64)
+
+    features = synthetic_features(codes, seed)
+    if embedding is None and dtype == "float32":
+        # Normalize in place rather than holding a second matrix
+        matrix, scales = features, None
+    else:
+        dim = embedding.dim if embedding is not None else N_FEATURES
+        matrix = np.empty((n_songs, dim), dtype=dtype)
+        scales = np.empty(n_songs, dtype=np.float32) if dtype == "int8" else None
+    for start in range(0, n_songs, CHUNK):
+        block = features[start:start + CHUNK]
+        if embedding is not None:
+            block = embedding.transform(block)
+        block, block_scales = quantize_rows(normalize_rows(block), dtype)
+        matrix[start:start + len(block)] = block
+        if scales is not None:
+            scales[start:start + len(block)] = block_scales
+
+    rng = np.random.default_rng([seed, 2])
+    seconds = rng.integers(120, 420, n_songs)
+    minutes = _numbered_column("", seconds // 60, 1)
+    secs = _numbered_column(":", seconds % 60, 2)
+    duration_offsets = np.arange(n_songs + 1, dtype=np.int64) * 4
+    duration_data = np.concatenate(
+        [minutes[1].reshape(n_songs, 1), secs[1].reshape(n_songs, 3)], axis=1
+    ).ravel()
+
+    columns = {
+        "id": _numbered_column("syn-", rows, 9),
+        "title": _numbered_column("Synthetic Track ", rows, 9),
+        "artist": _numbered_column("Artist ", rng.integers(0, 100_000, n_songs), 5),
+        "duration": (duration_offsets, duration_data),
+    }
+    # The content is a pure function of (seed, size, layout), which identifies it
+    space = embedding.space if embedding is not None else "raw"
+    version = f"synthetic-{seed}-{n_songs}"
+    if space != "raw" or dtype != "float32":
+        version += f"-{space}-{dtype}"
+    catalog = SongCatalog(matrix, columns, codes, GENRES, version, scales, space)
+    if path is None:
+        return catalog
+    catalog.save(path)
+    return SongCatalog.open(path)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate synthetic samples or catalogs")
+    parser.add_argument("kind", choices=["samples", "catalog"])
+    parser.add_argument("count", type=int, help="Rows to generate")
+    parser.add_argument("output", help="Output directory")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--embedding", default=None, help="Catalog only: embedding .npz to store rows in")
+    parser.add_argument("--dtype", choices=VECTOR_DTYPES, default="float32", help="Catalog only: row storage type")
+    args = parser.parse_args()
+
+    print("=" * 50)
+    print("Synthetic Data Generator")
+    print("=" * 50)
+
+    start = time.perf_counter()
+    if args.kind == "samples":
+        X, _ = synthetic_samples(args.count, args.seed, args.output)
+        size = X.nbytes
+    else:
+        embedding = FeatureEmbedding.load(args.embedding) if args.embedding else None
+        catalog = synthetic_catalog(args.count, args.seed, args.output, embedding, args.dtype)
+        size = catalog.features.nbytes
+    elapsed = time.perf_counter() - start
+    print(f"Wrote {args.count:,} {args.kind} to {args.output} "
+          f"({size / 1e6:.0f} MB features) in {elapsed:.2f}s "
+          f"({args.count / elapsed / 1e6:.2f}M rows/s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,17 +1,38 @@
 """
 Model Training Script
 Trains the genre classification model on audio features.
+
+Usage:
+    python scripts/train_model.py                              # synthetic demo data
+    python scripts/train_model.py --data-dir path/to/corpus    # <corpus>/<genre>/*.wav
+    python scripts/train_model.py --data-dir corpus --workers 8 --jobs -1 --report report.json
+    python scripts/train_model.py --pca-components 32             # wider PCA retrieval space
+
+Features are extracted in parallel and cached on disk (``--cache-dir``), so
+reruns only decode new or changed files. Hyperparameters are chosen by a
+cross-validated grid search spread across cores with joblib (``--jobs``);
+``--no-search`` trains the default configuration only.
+
+Besides the classifier, two recommender embeddings are written (see
+RECOMMENDER_EMBEDDING): the MLP's last hidden layer and a PCA projection of
+the scaled features. ``scripts/benchmark_embedding.py`` compares them.
 """
+import argparse
+import json
 import numpy as np
 import os
 import sys
+import time
+from contextlib import contextmanager
 
 # Add parent directory to path
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 try:
-    from sklearn.model_selection import train_test_split
-    from sklearn.preprocessing import StandardScaler, LabelEncoder
+    from sklearn.decomposition import PCA
+    from sklearn.model_selection import GridSearchCV, train_test_split
+    from sklearn.pipeline import Pipeline
+    from sklearn.preprocessing import StandardScaler
     from sklearn.neural_network import MLPClassifier
     from sklearn.metrics import classification_report, accuracy_score
     import joblib
@@ -19,87 +40,167 @@ except ImportError:
     print("Please install scikit-learn: pip install scikit-learn joblib")
     sys.exit(1)
 
+from app.features.cache import FeatureCache
+from app.features.extractor import AudioFeatureExtractor
+from app.models.compiled import CompiledMLP
+from app.models.embedding import FeatureEmbedding
+from synthetic_data import GENRES, N_FEATURES, synthetic_features
 
-GENRES = [
-    'rock', 'pop', 'jazz', 'classical', 'hiphop',
-    'electronic', 'blues', 'country', 'metal', 'reggae'
-]
 
-N_FEATURES = 58
 SAMPLES_PER_GENRE = 100
 
+# Dimensions of the PCA retrieval space for the recommender
+PCA_COMPONENTS = 16
+
+AUDIO_EXTENSIONS = ('.wav', '.mp3', '.flac', '.ogg', '.m4a', '.aiff', '.au')
+MODEL_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'models')
+
+# Grid searched with --search (the first entry of each list is the default)
+PARAM_GRID = {
+    'mlp__hidden_layer_sizes': [(256, 128, 64), (128, 64)],
+    'mlp__alpha': [0.001, 0.0001],
+    'mlp__learning_rate_init': [0.001, 0.003],
+}
 
-def generate_synthetic_data(n_samples_per_genre: int = 100):
+
+@contextmanager
+def stage(timings, name):
+    """Record the wall-clock seconds of a training stage."""
+    print(f"\n[{name}]")
+    start = time.perf_counter()
+    yield
+    timings[name] = time.perf_counter() - start
+    print(f"[{name}] {timings[name]:.2f}s")
+
+
+def generate_synthetic_data(n_samples_per_genre: int = 100, seed: int = 0):
     """
     Generate synthetic training data for demonstration.
     In production, this would load real extracted features.
+    
+    Returns:
+        Tuple of (feature matrix, genre names), grouped by genre
     """
     print("Generating synthetic training data...")
+    codes = np.repeat(np.arange(len(GENRES)), n_samples_per_genre)
+    return synthetic_features(codes, seed), np.array(GENRES)[codes]
+
+
+def find_labeled_audio(data_dir: str):
+    """
+    List (path, genre) pairs from a ``<data_dir>/<genre>/...`` tree.
     
-    X = []
-    y = []
+    Top-level directories that are not one of GENRES are skipped.
+    """
+    items = []
+    for genre in sorted(os.listdir(data_dir)):
+        genre_dir = os.path.join(data_dir, genre)
+        if not os.path.isdir(genre_dir):
+            continue
+        if genre not in GENRES:
+            print(f"Skipping '{genre}': not one of {GENRES}")
+            continue
+        for root, _, files in os.walk(genre_dir):
+            for name in sorted(files):
+                if name.lower().endswith(AUDIO_EXTENSIONS):
+                    items.append((os.path.join(root, name), genre))
+    return items
+
+
+def load_audio_dataset(data_dir: str, workers: int = None, cache_dir: str = None):
+    """
+    Extract features for a labeled audio tree in parallel.
     
-    for genre_idx, genre in enumerate(GENRES):
-        # Generate genre-specific feature distributions
-        np.random.seed(genre_idx * 42)
+    Args:
+        data_dir: Corpus root with one subdirectory per genre
+        workers: Extraction processes (default: CPU count)
+        cache_dir: On-disk feature cache (None disables caching)
         
-        for _ in range(n_samples_per_genre):
-            # Create base features with genre-specific characteristics
-            features = np.random.randn(N_FEATURES)
-            
-            # Add genre-specific patterns
-            if genre == 'rock':
-                features[0:5] += 2  # Higher low-frequency MFCCs
-                features[-1] = 120 + np.random.randn() * 20  # Higher tempo
-            elif genre == 'classical':
-                features[10:15] += 1.5  # More harmonic content
-                features[-1] = 80 + np.random.randn() * 30  # Variable tempo
-            elif genre == 'electronic':
-                features[32:35] += 2  # Higher spectral features
-                features[-1] = 128 + np.random.randn() * 10  # Steady tempo
-            elif genre == 'jazz':
-                features[20:32] += 1  # Rich chroma
-                features[-1] = 100 + np.random.randn() * 40  # Variable tempo
-            elif genre == 'hiphop':
-                features[0:10] += 1.5  # Strong bass
-                features[-1] = 90 + np.random.randn() * 15  # Hip hop tempo
-            elif genre == 'metal':
-                features[32:35] += 3  # High spectral centroid
-                features[35] += 2  # High zero crossing rate
-                features[-1] = 140 + np.random.randn() * 30  # Fast tempo
-            elif genre == 'blues':
-                features[5:15] += 1  # Soulful MFCCs
-                features[-1] = 80 + np.random.randn() * 20  # Slower tempo
-            elif genre == 'country':
-                features[20:32] += 0.8  # Guitar harmonics
-                features[-1] = 110 + np.random.randn() * 20
-            elif genre == 'pop':
-                features[32:35] += 1.2  # Bright sound
-                features[-1] = 120 + np.random.randn() * 15
-            elif genre == 'reggae':
-                features[0:5] += 1.5  # Bass-heavy
-                features[-1] = 80 + np.random.randn() * 10  # Slower tempo
-            
-            X.append(features)
-            y.append(genre)
+    Returns:
+        Tuple of (feature matrix, genre labels)
+    """
+    items = find_labeled_audio(data_dir)
+    if not items:
+        raise ValueError(f"No labeled audio found under {data_dir}")
+    labels = dict(items)
+    print(f"Found {len(items)} files in {len(set(labels.values()))} genres")
     
+    cache = None
+    if cache_dir:
+        # Unbounded disk tier: the training set should stay fully cached
+        cache = FeatureCache(max_entries=0, disk_dir=cache_dir, disk_max_bytes=2**62)
+    extractor = AudioFeatureExtractor(cache=cache)
+    
+    X, y, stats = [], [], {}
+    for path, features in extractor.extract_batch(list(labels), workers=workers, stats=stats):
+        done = stats["completed"] + stats["failed"]
+        if features is None:
+            print(f"[{done}] FAILED {path}: {stats['errors'][path]}")
+            continue
+        X.append(features)
+        y.append(labels[path])
+        if done % 100 == 0:
+            print(f"[{done}/{len(items)}] {stats['files_per_sec']:.1f} files/s")
+    
+    print(f"Extracted {stats['completed']} files ({stats['cached']} from cache, "
+          f"{stats['failed']} failed) at {stats.get('files_per_sec', 0):.1f} files/s")
     return np.array(X), np.array(y)
 
 
-def train_model():
+def build_pipeline(verbose: bool = False):
+    """Scaler + MLP with the default hyperparameters."""
+    return Pipeline([
+        ('scaler', StandardScaler()),
+        ('mlp', MLPClassifier(
+            hidden_layer_sizes=(256, 128, 64),
+            activation='relu',
+            solver='adam',
+            alpha=0.001,
+            batch_size='auto',
+            learning_rate='adaptive',
+            learning_rate_init=0.001,
+            max_iter=500,
+            shuffle=True,
+            random_state=42,
+            early_stopping=True,
+            validation_fraction=0.1,
+            n_iter_no_change=20,
+            verbose=verbose
+        )),
+    ])
+
+
+def train_model(
+    data_dir: str = None,
+    workers: int = None,
+    cache_dir: str = None,
+    search: bool = True,
+    jobs: int = -1,
+    report_path: str = None,
+    pca_components: int = PCA_COMPONENTS
+):
     """Train the genre classification model."""
     print("=" * 50)
     print("Music Genre Classification - Model Training")
     print("=" * 50)
+    timings = {}
     
     # Generate or load data
-    X, y = generate_synthetic_data(SAMPLES_PER_GENRE)
+    with stage(timings, "load_data"):
+        if data_dir:
+            X, y = load_audio_dataset(data_dir, workers, cache_dir)
+        else:
+            X, y = generate_synthetic_data(SAMPLES_PER_GENRE)
     print(f"\nDataset size: {len(X)} samples, {N_FEATURES} features")
     print(f"Classes: {len(GENRES)}")
     
-    # Encode labels
-    label_encoder = LabelEncoder()
-    y_encoded = label_encoder.fit_transform(y)
+    missing = sorted(set(GENRES) - set(y))
+    if missing:
+        # The served model maps output columns to GENRES by position
+        raise ValueError(f"Training data has no samples for: {missing}")
+    
+    # Encode labels in GENRES order, the column order GenreClassifier expects
+    y_encoded = np.array([GENRES.index(genre) for genre in y])
     
     # Split data
     X_train, X_test, y_train, y_test = train_test_split(
@@ -108,64 +209,122 @@ def train_model():
     print(f"Training samples: {len(X_train)}")
     print(f"Test samples: {len(X_test)}")
     
-    # Scale features
-    scaler = StandardScaler()
-    X_train_scaled = scaler.fit_transform(X_train)
-    X_test_scaled = scaler.transform(X_test)
-    
     # Train model
-    print("\nTraining neural network...")
-    model = MLPClassifier(
-        hidden_layer_sizes=(256, 128, 64),
-        activation='relu',
-        solver='adam',
-        alpha=0.001,
-        batch_size='auto',
-        learning_rate='adaptive',
-        learning_rate_init=0.001,
-        max_iter=500,
-        shuffle=True,
-        random_state=42,
-        early_stopping=True,
-        validation_fraction=0.1,
-        n_iter_no_change=20,
-        verbose=True
-    )
+    if search:
+        with stage(timings, "search"):
+            grid = GridSearchCV(
+                build_pipeline(), PARAM_GRID, cv=3, n_jobs=jobs, refit=True, verbose=1
+            )
+            grid.fit(X_train, y_train)
+        pipeline, params = grid.best_estimator_, grid.best_params_
+        print(f"Best CV accuracy: {grid.best_score_:.4f}")
+        print(f"Best parameters: {grid.best_params_}")
+    else:
+        with stage(timings, "train"):
+            pipeline = build_pipeline(verbose=True)
+            pipeline.fit(X_train, y_train)
+        params = {}
+    scaler, model = pipeline.named_steps['scaler'], pipeline.named_steps['mlp']
     
-    model.fit(X_train_scaled, y_train)
+    # Recommender retrieval space: principal components of the scaled features
+    pca = None
+    if pca_components:
+        with stage(timings, "pca"):
+            pca = PCA(n_components=min(pca_components, X_train.shape[1]), random_state=42)
+            pca.fit(scaler.transform(X_train))
+        print(f"PCA: {pca.n_components_} components explain "
+              f"{pca.explained_variance_ratio_.sum():.1%} of the variance")
     
     # Evaluate
     print("\n" + "=" * 50)
     print("Model Evaluation")
     print("=" * 50)
     
-    y_pred = model.predict(X_test_scaled)
+    with stage(timings, "evaluate"):
+        y_pred = pipeline.predict(X_test)
     accuracy = accuracy_score(y_test, y_pred)
     print(f"\nTest Accuracy: {accuracy:.4f}")
     
     print("\nClassification Report:")
     print(classification_report(
         y_test, y_pred, 
+        labels=list(range(len(GENRES))),
         target_names=GENRES
     ))
     
     # Save model
-    model_dir = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'models')
-    os.makedirs(model_dir, exist_ok=True)
-    model_path = os.path.join(model_dir, 'genre_classifier.joblib')
-    
-    joblib.dump({
-        'model': model,
-        'scaler': scaler,
-        'label_encoder': label_encoder,
-        'genres': GENRES
-    }, model_path)
-    
-    print(f"\nModel saved to: {model_path}")
+    with stage(timings, "save"):
+        os.makedirs(MODEL_DIR, exist_ok=True)
+        model_path = os.path.join(MODEL_DIR, 'genre_classifier.joblib')
+        
+        joblib.dump({
+            'model': model,
+            'scaler': scaler,
+            'genres': GENRES
+        }, model_path)
+        print(f"Model saved to: {model_path}")
+        
+        # NumPy-only inference kernel with the scaler folded into layer one
+        compiled_path = os.path.join(MODEL_DIR, 'genre_classifier.npz')
+        CompiledMLP.from_sklearn(model, scaler).save(compiled_path)
+        print(f"Compiled model saved to: {compiled_path}")
+        
+        # Recommender embeddings (RECOMMENDER_EMBEDDING)
+        embeddings = {'mlp': FeatureEmbedding.from_mlp(CompiledMLP.from_sklearn(model, scaler))}
+        if pca is not None:
+            embeddings['pca'] = FeatureEmbedding.from_pca(pca, scaler)
+        for kind, embedding in embeddings.items():
+            embedding_path = os.path.join(MODEL_DIR, f'embedding_{kind}.npz')
+            embedding.save(embedding_path)
+            print(f"{embedding.dim}-dim {kind} embedding saved to: {embedding_path}")
+    
+    print("\n" + "=" * 50)
+    print("Stage Timings")
     print("=" * 50)
+    for name, seconds in timings.items():
+        print(f"{name:<12} {seconds:>8.2f}s")
+    print(f"{'total':<12} {sum(timings.values()):>8.2f}s")
+    
+    if report_path:
+        with open(report_path, 'w') as f:
+            json.dump({
+                'samples': len(X),
+                'test_accuracy': accuracy,
+                'params': params,
+                'timings': timings,
+            }, f, indent=2, default=str)
+        print(f"Report written to: {report_path}")
     
     return model, scaler
 
 
+def main():
+    parser = argparse.ArgumentParser(description="Train the genre classifier")
+    parser.add_argument("--data-dir", default=None,
+                        help="Labeled audio tree (<dir>/<genre>/...); synthetic data if omitted")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="Feature extraction processes (default: CPU count)")
+    parser.add_argument("--cache-dir", default=os.path.join(MODEL_DIR, 'feature_cache'),
+                        help="On-disk feature cache ('' disables)")
+    parser.add_argument("--no-search", action="store_true",
+                        help="Train the default hyperparameters without a grid search")
+    parser.add_argument("--jobs", type=int, default=-1,
+                        help="Parallel grid search jobs (joblib n_jobs, -1 = all cores)")
+    parser.add_argument("--report", default=None, help="Write stage timings and results as JSON")
+    parser.add_argument("--pca-components", type=int, default=PCA_COMPONENTS,
+                        help="Dimensions of the PCA recommender embedding (0 skips it)")
+    args = parser.parse_args()
+    
+    train_model(
+        data_dir=args.data_dir,
+        workers=args.workers,
+        cache_dir=args.cache_dir or None,
+        search=not args.no_search,
+        jobs=args.jobs,
+        report_path=args.report,
+        pca_components=args.pca_components
+    )
+
+
 if __name__ == "__main__":
-    train_model()
+    main()